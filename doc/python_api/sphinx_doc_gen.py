@@ -35,6 +35,9 @@ API dump in RST files
   For quick builds:
     blender --background --factory-startup --python doc/python_api/sphinx_doc_gen.py -- --partial bmesh.*
 
+  To write the bpy.types & bpy.ops pages with 8 Blender processes:
+    blender --background --factory-startup --python doc/python_api/sphinx_doc_gen.py -- --jobs 8
+
 
 Sphinx: HTML generation
 -----------------------
@@ -68,7 +71,10 @@ import rna_info  # Blender module
 
 def rna_info_BuildRNAInfo_cache():
     if rna_info_BuildRNAInfo_cache.ret is None:
-        rna_info_BuildRNAInfo_cache.ret = rna_info.BuildRNAInfo()
+        if ARGS.rna_info_snapshot:
+            rna_info_BuildRNAInfo_cache.ret = rna_info.BuildRNAInfoCached(ARGS.rna_info_snapshot)
+        else:
+            rna_info_BuildRNAInfo_cache.ret = rna_info.BuildRNAInfo()
     return rna_info_BuildRNAInfo_cache.ret
 
 
@@ -182,6 +188,28 @@ def handle_args():
                              "* OUTPUT_DIR/.latex_make.log",
                         required=False)
 
+    parser.add_argument("-S", "--rna-info-snapshot",
+                        dest="rna_info_snapshot",
+                        metavar='FILE',
+                        default="",
+                        help="Load the RNA info from a snapshot FILE when it's up to date,\n"
+                             "otherwise write it, to share it between runs (default=\"\").",
+                        required=False)
+
+    parser.add_argument("-j", "--jobs",
+                        dest="jobs",
+                        type=int,
+                        default=1,
+                        help="Number of Blender processes writing the bpy.types & bpy.ops pages (default=1).",
+                        required=False)
+
+    # Internal, the part of the pages a process started for '--jobs' writes.
+    parser.add_argument("--worker-part",
+                        dest="worker_part",
+                        default="",
+                        help=argparse.SUPPRESS,
+                        required=False)
+
     # parse only the args passed after '--'
     argv = []
     if "--" in sys.argv:
@@ -192,6 +220,13 @@ def handle_args():
 
 ARGS = handle_args()
 
+# The part of the bpy.types & bpy.ops pages written by this process: '(index, total)',
+# each part writes every n'th page, see '--jobs'.
+if ARGS.worker_part:
+    PAGES_PART = tuple(int(value) for value in ARGS.worker_part.split("/"))
+else:
+    PAGES_PART = (0, max(1, ARGS.jobs))
+
 # ----------------------------------BPY-----------------------------------------
 
 BPY_LOGGER = logging.getLogger('bpy')
@@ -434,6 +469,8 @@ BLENDER_ZIP_FILENAME = "%s.zip" % REFERENCE_NAME
 
 SPHINX_IN = os.path.join(ARGS.output_dir, "sphinx-in")
 SPHINX_IN_TMP = SPHINX_IN + "-tmp"
+# Hashes of the files in SPHINX_IN, so unchanged files don't need to be compared.
+SPHINX_IN_MANIFEST = os.path.join(ARGS.output_dir, ".sphinx-in.manifest")
 SPHINX_OUT = os.path.join(ARGS.output_dir, "sphinx-out")
 
 # html build
@@ -1278,6 +1315,25 @@ def pyrna2sphinx(basepath):
     if FILTER_BPY_OPS is not None:
         ops = {k: v for k, v in ops.items() if v.module_name in FILTER_BPY_OPS}
 
+    op_modules = {}
+    for op in ops.values():
+        op_modules.setdefault(op.module_name, []).append(op)
+    del op
+
+    # Pages written by this process, see '--jobs'.
+    pages = []
+    if "bpy.types" not in EXCLUDE_MODULES:
+        pages.extend(
+            ("bpy.types", struct.identifier) for struct in structs.values()
+            # TODO, rna_info should filter these out!
+            if "_OT_" not in struct.identifier
+        )
+    if "bpy.ops" not in EXCLUDE_MODULES:
+        pages.extend(("bpy.ops", op_module_name) for op_module_name in op_modules)
+    pages.sort()
+    pages_part = set(pages[PAGES_PART[0]::PAGES_PART[1]])
+    del pages
+
     def write_param(ident, fw, prop, is_return=False):
         if is_return:
             id_name = "return"
@@ -1560,10 +1616,8 @@ def pyrna2sphinx(basepath):
 
     if "bpy.types" not in EXCLUDE_MODULES:
         for struct in structs.values():
-            # TODO, rna_info should filter these out!
-            if "_OT_" in struct.identifier:
-                continue
-            write_struct(struct)
+            if ("bpy.types", struct.identifier) in pages_part:
+                write_struct(struct)
 
         def fake_bpy_type(class_module_name, class_value, class_name, descr_str, use_subclasses=True):
             filepath = os.path.join(basepath, "%s.%s.rst" % (class_module_name, class_name))
@@ -1604,20 +1658,21 @@ def pyrna2sphinx(basepath):
                     py_descr2sphinx("   ", fw, descr, "bpy.types", class_name, key)
             file.close()
 
-        # write fake classes
-        if _BPY_STRUCT_FAKE:
-            class_value = bpy_struct
-            fake_bpy_type(
-                "bpy.types", class_value, _BPY_STRUCT_FAKE,
-                "built-in base class for all classes in bpy.types.", use_subclasses=True,
-            )
-
-        if _BPY_PROP_COLLECTION_FAKE:
-            class_value = bpy.data.objects.__class__
-            fake_bpy_type(
-                "bpy.types", class_value, _BPY_PROP_COLLECTION_FAKE,
-                "built-in class used for all collections.", use_subclasses=False,
-            )
+        # write fake classes (only once when pages are split into parts)
+        if PAGES_PART[0] == 0:
+            if _BPY_STRUCT_FAKE:
+                class_value = bpy_struct
+                fake_bpy_type(
+                    "bpy.types", class_value, _BPY_STRUCT_FAKE,
+                    "built-in base class for all classes in bpy.types.", use_subclasses=True,
+                )
+
+            if _BPY_PROP_COLLECTION_FAKE:
+                class_value = bpy.data.objects.__class__
+                fake_bpy_type(
+                    "bpy.types", class_value, _BPY_PROP_COLLECTION_FAKE,
+                    "built-in class used for all collections.", use_subclasses=False,
+                )
 
     # operators
     def write_ops():
@@ -1625,12 +1680,9 @@ def pyrna2sphinx(basepath):
         API_BASEURL_ADDON = "https://developer.blender.org/diffusion/BA"
         API_BASEURL_ADDON_CONTRIB = "https://developer.blender.org/diffusion/BAC"
 
-        op_modules = {}
-        for op in ops.values():
-            op_modules.setdefault(op.module_name, []).append(op)
-        del op
-
         for op_module_name, ops_mod in op_modules.items():
+            if ("bpy.ops", op_module_name) not in pages_part:
+                continue
             filepath = os.path.join(basepath, "bpy.ops.%s.rst" % op_module_name)
             file = open(filepath, "w", encoding="utf-8")
             fw = file.write
@@ -2125,11 +2177,16 @@ def rna2sphinx(basepath):
     copy_theme_assets(basepath)
 
 
-def align_sphinx_in_to_sphinx_in_tmp(dir_src, dir_dst):
+def align_sphinx_in_to_sphinx_in_tmp(dir_src, dir_dst, manifest_src, manifest_dst, manifest_prefix=""):
     '''
     Move changed files from SPHINX_IN_TMP to SPHINX_IN
+
+    manifest_src maps file paths to their hash, size & modification time
+    when they were last copied, so unchanged files don't need to be compared,
+    manifest_dst is filled in with the files of dir_dst.
     '''
     import filecmp
+    from hashlib import sha1
 
     # possible the dir doesn't exist when running recursively
     os.makedirs(dir_dst, exist_ok=True)
@@ -2153,16 +2210,125 @@ def align_sphinx_in_to_sphinx_in_tmp(dir_src, dir_dst):
         f_dst = os.path.join(dir_dst, f)
 
         if os.path.isdir(f_src):
-            align_sphinx_in_to_sphinx_in_tmp(f_src, f_dst)
+            align_sphinx_in_to_sphinx_in_tmp(
+                f_src, f_dst, manifest_src, manifest_dst, manifest_prefix + f + "/",
+            )
         else:
+            with open(f_src, "rb") as fh:
+                f_hash = sha1(fh.read()).hexdigest()
+
             do_copy = True
             if f in sphinx_dst_files:
-                if filecmp.cmp(f_src, f_dst):
+                f_stat = os.stat(f_dst)
+                f_entry = manifest_src.get(manifest_prefix + f)
+                if f_entry is not None and f_entry[1:] == [f_stat.st_size, f_stat.st_mtime_ns]:
+                    do_copy = (f_entry[0] != f_hash)
+                elif filecmp.cmp(f_src, f_dst):
                     do_copy = False
 
             if do_copy:
                 BPY_LOGGER.debug("\tupdating: %s" % f)
                 shutil.copy(f_src, f_dst)
+                f_stat = os.stat(f_dst)
+
+            manifest_dst[manifest_prefix + f] = [f_hash, f_stat.st_size, f_stat.st_mtime_ns]
+
+
+def sphinx_in_manifest_read():
+    import json
+    try:
+        with open(SPHINX_IN_MANIFEST, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except Exception as ex:
+        BPY_LOGGER.debug("Error reading manifest %r: %s" % (SPHINX_IN_MANIFEST, ex))
+        return {}
+
+
+def sphinx_in_manifest_write(manifest):
+    import json
+    filepath_tmp = SPHINX_IN_MANIFEST + "@"
+    with open(filepath_tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(filepath_tmp, SPHINX_IN_MANIFEST)
+
+
+def pages_workers_examples_filepath(part):
+    return os.path.join(ARGS.output_dir, ".examples_used_%d.json" % part)
+
+
+def pages_workers_start():
+    '''
+    Start Blender processes writing the other parts of the bpy.types & bpy.ops pages,
+    these read the RNA info from a snapshot instead of building it again.
+    '''
+    import subprocess
+
+    snapshot_filepath = ARGS.rna_info_snapshot
+    if snapshot_filepath:
+        # Writes the snapshot when it's outdated.
+        rna_info_BuildRNAInfo_cache()
+    else:
+        snapshot_filepath = os.path.join(ARGS.output_dir, ".rna_info_jobs.snapshot")
+        rna_info.snapshot_write(snapshot_filepath, rna_info_BuildRNAInfo_cache())
+
+    # Run with the same arguments as this process.
+    if "--" in sys.argv:
+        i = sys.argv.index("--")
+        args_blender, args_script = sys.argv[1:i], sys.argv[i + 1:]
+    else:
+        args_blender, args_script = sys.argv[1:], []
+
+    procs = []
+    for part in range(1, PAGES_PART[1]):
+        procs.append(subprocess.Popen([
+            bpy.app.binary_path,
+            "--python-exit-code", "1",
+            *args_blender,
+            "--",
+            *args_script,
+            "--rna-info-snapshot", snapshot_filepath,
+            "--worker-part", "%d/%d" % (part, PAGES_PART[1]),
+        ]))
+    return procs
+
+
+def pages_workers_finish(procs):
+    import json
+
+    parts_failed = []
+    for part, proc in enumerate(procs, 1):
+        if proc.wait() != 0:
+            parts_failed.append(part)
+            continue
+        filepath = pages_workers_examples_filepath(part)
+        with open(filepath, "r", encoding="utf-8") as fh:
+            EXAMPLE_SET_USED.update(json.load(fh))
+        os.remove(filepath)
+
+    if parts_failed:
+        raise Exception("Writing pages failed for parts: %r (see '--jobs')" % parts_failed)
+
+
+def main_worker():
+    '''
+    Write a part of the bpy.types & bpy.ops pages, see '--jobs'.
+    '''
+    import json
+
+    setup_monkey_patch()
+    setup_data = setup_blender()
+
+    pyrna2sphinx(SPHINX_IN_TMP)
+
+    # Reported by the main process.
+    with open(pages_workers_examples_filepath(PAGES_PART[0]), "w", encoding="utf-8") as fh:
+        json.dump(sorted(EXAMPLE_SET_USED), fh)
+
+    teardown_blender(setup_data)
+
+    sys.exit()
 
 
 def refactor_sphinx_log(sphinx_logfile):
@@ -2213,6 +2379,9 @@ def teardown_blender(setup_data):
 
 def main():
 
+    if ARGS.worker_part:
+        main_worker()
+
     # First monkey patch to load in fake members.
     setup_monkey_patch()
 
@@ -2251,21 +2420,34 @@ def main():
     if os.path.exists(SPHINX_IN_TMP):
         shutil.rmtree(SPHINX_IN_TMP, True)
 
+    if PAGES_PART[1] > 1:
+        os.mkdir(SPHINX_IN_TMP)
+        pages_workers = pages_workers_start()
+
     rna2sphinx(SPHINX_IN_TMP)
 
+    if PAGES_PART[1] > 1:
+        pages_workers_finish(pages_workers)
+        del pages_workers
+
     if ARGS.full_rebuild:
         # only for full updates
         shutil.rmtree(SPHINX_IN, True)
         shutil.copytree(SPHINX_IN_TMP,
                         SPHINX_IN,
                         copy_function=shutil.copy)
+        if os.path.exists(SPHINX_IN_MANIFEST):
+            os.remove(SPHINX_IN_MANIFEST)
         if ARGS.sphinx_build and os.path.exists(SPHINX_OUT):
             shutil.rmtree(SPHINX_OUT, True)
         if ARGS.sphinx_build_pdf and os.path.exists(SPHINX_OUT_PDF):
             shutil.rmtree(SPHINX_OUT_PDF, True)
     else:
-        # move changed files in SPHINX_IN
-        align_sphinx_in_to_sphinx_in_tmp(SPHINX_IN_TMP, SPHINX_IN)
+        # move changed files in SPHINX_IN,
+        # unchanged files aren't modified so sphinx doesn't rebuild them.
+        manifest = {}
+        align_sphinx_in_to_sphinx_in_tmp(SPHINX_IN_TMP, SPHINX_IN, sphinx_in_manifest_read(), manifest)
+        sphinx_in_manifest_write(manifest)
 
     # report which example files weren't used
     EXAMPLE_SET_UNUSED = EXAMPLE_SET - EXAMPLE_SET_USED
@@ -37,6 +37,10 @@ error_encoding = False
 error_duplicates = []
 addons_fake_modules = {}
 
+# Persistent 'bl_info' cache, see '_bl_info_cache_load'.
+_bl_info_cache = None
+_bl_info_cache_version = 1
+
 
 # called only once at startup, avoids calling 'reset_all', correct but slower.
 def _initialize():
@@ -58,8 +62,71 @@ def paths():
     return addon_paths
 
 
+def _bl_info_cache_filepath():
+    import os
+    path = _bpy.utils.user_resource('CONFIG')
+    if not path:
+        return None
+    return os.path.join(path, "addons_bl_info.cache")
+
+
+def _bl_info_cache_load():
+    # Map addon file paths to '(mtime, size, bl_info)',
+    # so unchanged addons don't need to be parsed on every refresh,
+    # 'bl_info' is None for files without one.
+    global _bl_info_cache
+    if _bl_info_cache is not None:
+        return _bl_info_cache
+
+    import sys
+    _bl_info_cache = {}
+    filepath = _bl_info_cache_filepath()
+    if filepath is None:
+        return _bl_info_cache
+    try:
+        import pickle
+        with open(filepath, "rb") as fh:
+            version, python_version, cache = pickle.load(fh)
+    except FileNotFoundError:
+        return _bl_info_cache
+    except Exception as ex:
+        if _bpy.app.debug_python:
+            print("Error reading addon cache:", repr(filepath), ex)
+        return _bl_info_cache
+
+    # Values are written by this version of Python, re-parse when it changes.
+    if (
+            version == _bl_info_cache_version and
+            python_version == sys.version_info[:2]
+    ):
+        _bl_info_cache = cache
+    return _bl_info_cache
+
+
+def _bl_info_cache_save():
+    import os
+    import sys
+    import pickle
+    filepath = _bl_info_cache_filepath()
+    if filepath is None:
+        return
+    filepath_tmp = filepath + "@"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath_tmp, "wb") as fh:
+            pickle.dump(
+                (_bl_info_cache_version, sys.version_info[:2], _bl_info_cache),
+                fh,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(filepath_tmp, filepath)
+    except Exception as ex:
+        if _bpy.app.debug_python:
+            print("Error writing addon cache:", repr(filepath), ex)
+
+
 def modules_refresh(module_cache=addons_fake_modules):
-    global error_encoding
+    global error_encoding, _bl_info_cache
     import os
 
     error_encoding = False
@@ -68,13 +135,26 @@ def modules_refresh(module_cache=addons_fake_modules):
     path_list = paths()
 
     # fake module importing
+    def fake_module_from_bl_info(
+            mod_name, mod_path, mod_time, bl_info, force_support=None,
+    ):
+        ModuleType = type(os)
+        mod = ModuleType(mod_name)
+        mod.bl_info = bl_info
+        mod.__file__ = mod_path
+        mod.__time__ = mod_time
+
+        if force_support is not None:
+            mod.bl_info["support"] = force_support
+
+        return mod
+
     def fake_module(mod_name, mod_path, speedy=True, force_support=None):
         global error_encoding
 
         if _bpy.app.debug_python:
             print("fake_module", mod_path, mod_name)
         import ast
-        ModuleType = type(ast)
         try:
             file_mod = open(mod_path, "r", encoding='UTF-8')
         except OSError as ex:
@@ -133,29 +213,80 @@ def modules_refresh(module_cache=addons_fake_modules):
 
         if body_info:
             try:
-                mod = ModuleType(mod_name)
-                mod.bl_info = ast.literal_eval(body.value)
-                mod.__file__ = mod_path
-                mod.__time__ = os.path.getmtime(mod_path)
+                bl_info = ast.literal_eval(body.value)
+                mod_stat = os.stat(mod_path)
             except:
                 print("AST error parsing bl_info for:", repr(mod_path))
                 import traceback
                 traceback.print_exc()
                 return None
 
-            if force_support is not None:
-                mod.bl_info["support"] = force_support
+            # Store a copy as 'force_support' and callers
+            # may modify the module's 'bl_info'.
+            bl_info_cache[mod_path] = (
+                mod_stat.st_mtime, mod_stat.st_size, bl_info.copy(),
+            )
 
-            return mod
+            return fake_module_from_bl_info(
+                mod_name,
+                mod_path,
+                mod_stat.st_mtime,
+                bl_info,
+                force_support=force_support,
+            )
         else:
-            print(
-                "fake_module: addon missing 'bl_info' "
-                "gives bad performance!:",
-                repr(mod_path),
+            fake_module_missing_bl_info(mod_path)
+            # Cache files without 'bl_info' too,
+            # so they aren't parsed again until they're modified.
+            try:
+                mod_stat = os.stat(mod_path)
+            except OSError:
+                return None
+            bl_info_cache[mod_path] = (
+                mod_stat.st_mtime, mod_stat.st_size, None,
             )
             return None
 
+    def fake_module_missing_bl_info(mod_path):
+        print(
+            "fake_module: addon missing 'bl_info' "
+            "gives bad performance!:",
+            repr(mod_path),
+        )
+
+    def fake_module_cached(mod_name, mod_path, force_support=None):
+        # Use the persistent cache when the file is unchanged,
+        # otherwise return '...'.
+        cache_item = bl_info_cache_prev.get(mod_path)
+        if cache_item is None:
+            return ...
+        mod_time, mod_size, bl_info = cache_item
+        try:
+            mod_stat = os.stat(mod_path)
+        except OSError:
+            return ...
+        if mod_stat.st_mtime != mod_time or mod_stat.st_size != mod_size:
+            return ...
+        bl_info_cache[mod_path] = cache_item
+        if bl_info is None:
+            fake_module_missing_bl_info(mod_path)
+            return None
+        return fake_module_from_bl_info(
+            mod_name,
+            mod_path,
+            mod_time,
+            bl_info.copy(),
+            force_support=force_support,
+        )
+
+    # Only keep entries for files found in this refresh.
+    bl_info_cache_prev = _bl_info_cache_load()
+    bl_info_cache = {}
+
     modules_stale = set(module_cache.keys())
+    # (mod_name, mod_path, force_support)
+    # for modules that aren't in 'module_cache'.
+    modules_new = []
 
     for path in path_list:
 
@@ -175,7 +306,9 @@ def modules_refresh(module_cache=addons_fake_modules):
                         "  %r\n"
                         "  %r" % (mod.__file__, mod_path)
                     )
-                    error_duplicates.append((mod.bl_info["name"], mod.__file__, mod_path))
+                    error_duplicates.append(
+                        (mod.bl_info["name"], mod.__file__, mod_path)
+                    )
 
                 elif mod.__time__ != os.path.getmtime(mod_path):
                     print(
@@ -188,14 +321,69 @@ def modules_refresh(module_cache=addons_fake_modules):
                     del module_cache[mod_name]
                     mod = None
 
+                else:
+                    cache_item = bl_info_cache_prev.get(mod_path)
+                    if cache_item is not None:
+                        bl_info_cache[mod_path] = cache_item
+
             if mod is None:
-                mod = fake_module(
-                    mod_name,
-                    mod_path,
-                    force_support=force_support,
-                )
-                if mod:
-                    module_cache[mod_name] = mod
+                modules_new.append((mod_name, mod_path, force_support))
+
+    # Resolve new modules from the cache, parse the remaining ones in parallel
+    # since reading many files is mostly waiting on the file-system.
+    modules_new = [
+        (
+            mod_name,
+            mod_path,
+            force_support,
+            fake_module_cached(mod_name, mod_path, force_support),
+        )
+        for mod_name, mod_path, force_support in modules_new
+    ]
+    modules_parse = [item for item in modules_new if item[3] is ...]
+
+    def fake_module_parse(item):
+        mod_name, mod_path, force_support, _ = item
+        return fake_module(mod_name, mod_path, force_support=force_support)
+
+    if len(modules_parse) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(
+                max_workers=min(len(modules_parse), 8),
+        ) as executor:
+            mod_parsed = dict(zip(
+                (mod_path for _, mod_path, _, _ in modules_parse),
+                executor.map(fake_module_parse, modules_parse),
+            ))
+    else:
+        mod_parsed = {
+            item[1]: fake_module_parse(item)
+            for item in modules_parse
+        }
+
+    # Add in the order the paths were searched,
+    # so the first module of a given name is used.
+    for mod_name, mod_path, force_support, mod in modules_new:
+        if mod is ...:
+            mod = mod_parsed[mod_path]
+        if mod is None:
+            continue
+        mod_prev = module_cache.get(mod_name)
+        if mod_prev is not None:
+            print(
+                "multiple addons with the same name:\n"
+                "  %r\n"
+                "  %r" % (mod_prev.__file__, mod_path)
+            )
+            error_duplicates.append(
+                (mod_prev.bl_info["name"], mod_prev.__file__, mod_path)
+            )
+        else:
+            module_cache[mod_name] = mod
+
+    if bl_info_cache != bl_info_cache_prev:
+        _bl_info_cache = bl_info_cache
+        _bl_info_cache_save()
 
     # just in case we get stale modules, not likely
     for mod_stale in modules_stale:
@@ -293,12 +481,17 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     import os
     import sys
     from bpy_restrict_state import RestrictBlend
+    import bl_startup_profile_utils
 
     if handle_error is None:
         def handle_error(_ex):
             import traceback
             traceback.print_exc()
 
+    use_profile = bl_startup_profile_utils.is_recording()
+    if use_profile:
+        from time import perf_counter
+
     # reload if the mtime changes
     mod = sys.modules.get(module_name)
     # chances of the file _not_ existing are low, but it could be removed
@@ -346,6 +539,9 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     # while loading an addon is really bad, don't do it!
     with RestrictBlend():
 
+        if use_profile:
+            t = perf_counter()
+
         # 1) try import
         try:
             mod = __import__(module_name)
@@ -377,6 +573,10 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         owner_id_prev = _bl_owner_id_get()
         _bl_owner_id_set(module_name)
 
+        if use_profile:
+            t_import = perf_counter() - t
+            t = perf_counter()
+
         # 3) Try run the modules register function.
         try:
             mod.register()
@@ -393,6 +593,11 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         finally:
             _bl_owner_id_set(owner_id_prev)
 
+        if use_profile:
+            bl_startup_profile_utils.record_addon(
+                module_name, t_import, perf_counter() - t,
+            )
+
     # * OK loaded successfully! *
     mod.__addon_enabled__ = True
     mod.__addon_persistent__ = persistent
@@ -41,6 +41,35 @@ ignore_reg = re.compile(r"^(?:[-*.()/\\+%°0-9]|%d|%f|%s|%r|\s)*$")
 filter_message = ignore_reg.match
 
 
+def _extract_cache_load(settings):
+    """
+    Return the cache of extracted messages, a mapping {(kind, path): (file_hash, signature, messages)}, where
+    messages is a list of (msgctxt, msgid, msgsrc) tuples, and signature identifies the extraction settings.
+    """
+    import pickle
+    cache = settings.EXTRACT_CACHE
+    if cache and os.path.exists(cache):
+        try:
+            with open(cache, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print("WARNING: could not read messages cache {} ({})".format(cache, e))
+    return {}
+
+
+def _extract_cache_save(settings, extract_cache):
+    import pickle
+    cache = settings.EXTRACT_CACHE
+    if cache:
+        with open(cache, 'wb') as f:
+            pickle.dump(extract_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _extract_cache_hash(settings, data):
+    import hashlib
+    return hashlib.new(settings.PARSER_CACHE_HASH, data).hexdigest()
+
+
 def init_spell_check(settings, lang="en_US"):
     try:
         from bl_i18n_utils import utils_spell_check
@@ -626,10 +655,16 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
             "spell_errors": check_ctxt.get("spell_errors"),
         }
 
-    for fp in files:
-        # ~ print("Checking File ", fp)
-        with open(fp, 'r', encoding="utf8") as filedata:
-            root_node = ast.parse(filedata.read(), fp, 'exec')
+    # Messages only depend on the file and on the functions' arguments found in RNA.
+    signature = _extract_cache_hash(settings, repr((
+        bpy.app.build_hash, sorted(func_translate_args.items()), sorted(translate_kw),
+    )).encode())
+    extract_cache = _extract_cache_load(settings)
+    extract_cache_modified = False
+
+    def extract_file_messages(fp, data):
+        ret = []
+        root_node = ast.parse(data.decode("utf8"), fp, 'exec')
 
         fp_rel = make_rel(fp)
 
@@ -691,8 +726,30 @@ def dump_py_messages_from_files(msgs, reports, files, settings):
                                 msgsrc = "{}:{}".format(fp_rel, sorted({nd.lineno for nd in nds})[0])
                             else:
                                 msgsrc = "{}:???".format(fp_rel)
-                            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
-                            reports["py_messages"].append((msgctxt, estr, msgsrc))
+                            ret.append((msgctxt, estr, msgsrc))
+        return ret
+
+    for fp in files:
+        # ~ print("Checking File ", fp)
+        with open(fp, 'rb') as filedata:
+            data = filedata.read()
+        file_hash = _extract_cache_hash(settings, data)
+
+        cache_key = ('PY', fp)
+        cached = extract_cache.get(cache_key)
+        if cached is not None and cached[:2] == (file_hash, signature):
+            file_msgs = cached[2]
+        else:
+            file_msgs = extract_file_messages(fp, data)
+            extract_cache[cache_key] = (file_hash, signature, file_msgs)
+            extract_cache_modified = True
+
+        for msgctxt, estr, msgsrc in file_msgs:
+            process_msg(msgs, msgctxt, estr, msgsrc, reports, check_ctxt_py, settings)
+            reports["py_messages"].append((msgctxt, estr, msgsrc))
+
+    if extract_cache_modified:
+        _extract_cache_save(settings, extract_cache)
 
 
 def dump_py_messages(msgs, reports, addons, settings, addons_only=False):
@@ -729,75 +786,16 @@ def dump_src_messages(msgs, reports, settings):
 
     contexts = get_contexts()
 
-    # Build regexes to extract messages (with optional contexts) from C source.
-    pygettexts = tuple(re.compile(r).search for r in settings.PYGETTEXT_KEYWORDS)
-
-    _clean_str = re.compile(settings.str_clean_re).finditer
-
-    def clean_str(s):
-        return "".join(m.group("clean") for m in _clean_str(s))
-
-    def dump_src_file(path, rel_path, msgs, reports, settings):
-        def process_entry(_msgctxt, _msgid):
-            # Context.
-            msgctxt = settings.DEFAULT_CONTEXT
-            if _msgctxt:
-                if _msgctxt in contexts:
-                    msgctxt = contexts[_msgctxt]
-                elif '"' in _msgctxt or "'" in _msgctxt:
-                    msgctxt = clean_str(_msgctxt)
-                else:
-                    print("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
-            # Message.
-            msgid = ""
-            if _msgid:
-                if '"' in _msgid or "'" in _msgid:
-                    msgid = clean_str(_msgid)
-                else:
-                    print("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
-            return msgctxt, msgid
-
-        check_ctxt_src = None
-        if reports["check_ctxt"]:
-            check_ctxt = reports["check_ctxt"]
-            check_ctxt_src = {
-                "multi_lines": check_ctxt.get("multi_lines"),
-                "not_capitalized": check_ctxt.get("not_capitalized"),
-                "end_point": check_ctxt.get("end_point"),
-                "spell_checker": check_ctxt.get("spell_checker"),
-                "spell_errors": check_ctxt.get("spell_errors"),
-            }
-
-        data = ""
-        with open(path, encoding="utf8") as f:
-            data = f.read()
-        for srch in pygettexts:
-            m = srch(data)
-            line = pos = 0
-            while m:
-                d = m.groupdict()
-                # Line.
-                line += data[pos:m.start()].count('\n')
-                msgsrc = rel_path + ":" + str(line)
-                _msgid = d.get("msg_raw")
-                # First, try the "multi-contexts" stuff!
-                _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
-                if _msgctxts[0]:
-                    for _msgctxt in _msgctxts:
-                        if not _msgctxt:
-                            break
-                        msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                        process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                        reports["src_messages"].append((msgctxt, msgid, msgsrc))
-                else:
-                    _msgctxt = d.get("ctxt_raw")
-                    msgctxt, msgid = process_entry(_msgctxt, _msgid)
-                    process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
-                    reports["src_messages"].append((msgctxt, msgid, msgsrc))
-
-                pos = m.end()
-                line += data[m.start():pos].count('\n')
-                m = srch(data, pos)
+    check_ctxt_src = None
+    if reports["check_ctxt"]:
+        check_ctxt = reports["check_ctxt"]
+        check_ctxt_src = {
+            "multi_lines": check_ctxt.get("multi_lines"),
+            "not_capitalized": check_ctxt.get("not_capitalized"),
+            "end_point": check_ctxt.get("end_point"),
+            "spell_checker": check_ctxt.get("spell_checker"),
+            "spell_errors": check_ctxt.get("spell_errors"),
+        }
 
     forbidden = set()
     forced = set()
@@ -823,10 +821,51 @@ def dump_src_messages(msgs, reports, settings):
                 continue
             elif rel_path not in forced:
                 forced.add(rel_path)
+
+    # Messages only depend on the file, the regexes and the contexts.
+    signature = _extract_cache_hash(settings, repr((
+        settings.PYGETTEXT_KEYWORDS, settings.str_clean_re, settings.DEFAULT_CONTEXT, sorted(contexts.items()),
+    )).encode())
+    extract_cache = _extract_cache_load(settings)
+
+    # Only extract messages from modified files, using multiple processes.
+    src_msgs = {}
+    src_todo = []
     for rel_path in sorted(forced):
         path = os.path.join(settings.SOURCE_DIR, rel_path)
-        if os.path.exists(path):
-            dump_src_file(path, rel_path, msgs, reports, settings)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            file_hash = _extract_cache_hash(settings, f.read())
+        cached = extract_cache.get(('SRC', path))
+        if cached is not None and cached[:2] == (file_hash, signature):
+            src_msgs[rel_path] = cached[2]
+        else:
+            src_todo.append((path, rel_path, file_hash))
+
+    if src_todo:
+        jobs = settings.EXTRACT_JOBS or os.cpu_count() or 1
+        if jobs > 1 and len(src_todo) > 1:
+            import concurrent.futures
+            with concurrent.futures.ProcessPoolExecutor(min(jobs, len(src_todo))) as executor:
+                todo_msgs = executor.map(
+                    utils.extract_src_messages,
+                    *zip(*((path, rel_path, contexts, settings) for path, rel_path, _ in src_todo)),
+                    chunksize=16,
+                )
+                todo_msgs = list(todo_msgs)
+        else:
+            todo_msgs = [utils.extract_src_messages(path, rel_path, contexts, settings)
+                         for path, rel_path, _ in src_todo]
+        for (path, rel_path, file_hash), file_msgs in zip(src_todo, todo_msgs):
+            src_msgs[rel_path] = file_msgs
+            extract_cache[('SRC', path)] = (file_hash, signature, file_msgs)
+        _extract_cache_save(settings, extract_cache)
+
+    for rel_path in sorted(src_msgs):
+        for msgctxt, msgid, msgsrc in src_msgs[rel_path]:
+            process_msg(msgs, msgctxt, msgid, msgsrc, reports, check_ctxt_src, settings)
+            reports["src_messages"].append((msgctxt, msgid, msgsrc))
 
 
 ##### Main functions! #####
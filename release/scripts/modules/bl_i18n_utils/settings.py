@@ -427,6 +427,9 @@ PARSER_PY_MARKER_END = "\n# ##### END AUTOGENERATED I18N SECTION #####\n"
 
 PARSER_MAX_FILE_SIZE = 2 ** 24  # in bytes, i.e. 16 Mb.
 
+# PO files bigger than this are memory-mapped and decoded line by line while parsing (0 to never memory-map them).
+PARSER_MMAP_FILE_SIZE = 2 ** 22  # in bytes, i.e. 4 Mb.
+
 ###############################################################################
 # PATHS
 ###############################################################################
@@ -514,6 +517,12 @@ SRC_POTFILES = ""
 # A cache storing validated msgids, to avoid re-spellchecking them.
 SPELL_CACHE = os.path.join("/tmp", ".spell_cache")
 
+# A cache storing messages extracted from each source file, to avoid parsing unchanged files again.
+EXTRACT_CACHE = os.path.join("/tmp", ".extract_messages_cache")
+
+# Number of processes used to extract messages from C source files (0 to use all available CPUs).
+EXTRACT_JOBS = 0
+
 # Threshold defining whether a new msgid is similar enough with an old one to reuse its translation...
 SIMILAR_MSGID_THRESHOLD = 0.75
 
@@ -28,6 +28,7 @@ import re
 import struct
 import sys
 import tempfile
+import types
 #import time
 
 from bl_i18n_utils import (
@@ -74,6 +75,222 @@ def get_best_similar(data):
     return key, tmp
 
 
+class SimilarMsgidIndex:
+    """
+    Index of existing msgids, to find the most similar one for new msgids.
+    Gives the same results as get_best_similar (highest ratio, last one in pool order for equal ratios), but groups
+    msgids by length, so that only the lengths which can still reach the current best ratio are compared.
+    """
+    __slots__ = ("pool_order", "len_buckets")
+
+    def __init__(self, similar_pool):
+        self.pool_order = {}
+        self.len_buckets = {}
+        for idx, msgid in enumerate(similar_pool):
+            self.pool_order[msgid] = idx
+            self.len_buckets.setdefault(len(msgid), []).append(msgid)
+
+    def _lengths(self, len_key):
+        # Valid lengths (as in get_best_similar), with the highest 'real_quick_ratio' their msgids can reach,
+        # most promising ones first.
+        min_len = len_key // 2
+        max_len = len_key * 2
+        lengths = [(2.0 * min(len_key, length) / (len_key + length), length)
+                   for length in self.len_buckets if min_len < length < max_len]
+        lengths.sort(reverse=True)
+        return lengths
+
+    def best(self, msgid, use_similar):
+        """Return the most similar msgid in the pool, or None."""
+        import difflib
+        pool_order = self.pool_order
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+        best = None
+        best_order = -1
+        for len_ratio, length in self._lengths(len(msgid)):
+            if len_ratio < use_similar:
+                break
+            for x in self.len_buckets[length]:
+                s.set_seq1(x)
+                if s.quick_ratio() >= use_similar:
+                    sratio = s.ratio()
+                    if sratio >= use_similar and (best is None or sratio > use_similar or pool_order[x] > best_order):
+                        best = x
+                        best_order = pool_order[x]
+                        use_similar = sratio
+        return best
+
+    def matches(self, msgid, use_similar, candidates=None):
+        """Return a dict of all msgids in the pool (or also in candidates) with their ratio, when >= use_similar."""
+        import difflib
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+        ret = {}
+        for len_ratio, length in self._lengths(len(msgid)):
+            if len_ratio < use_similar:
+                break
+            for x in self.len_buckets[length]:
+                if candidates is not None and x not in candidates:
+                    continue
+                s.set_seq1(x)
+                if s.quick_ratio() >= use_similar:
+                    sratio = s.ratio()
+                    if sratio >= use_similar:
+                        ret[x] = sratio
+        return ret
+
+    def best_of(self, matches):
+        """Return the best msgid of the pool from a dict returned by matches, or None."""
+        pool_order = self.pool_order
+        best = None
+        best_key = None
+        for x, sratio in matches.items():
+            order = pool_order.get(x)
+            if order is not None and (best_key is None or (sratio, order) > best_key):
+                best = x
+                best_key = (sratio, order)
+        return best
+
+    def best_all(self, keys, use_similar, similar_cache=None, jobs=1):
+        """
+        Yield (key, msgid) tuples with the most similar msgid in the pool (or None) for each of the given keys.
+        similar_cache is a dict which can be shared between updates of different languages, it stores all similar
+        msgids found for each new msgid so that only msgids not already compared have to be processed.
+        With jobs > 1, msgids are compared in that many processes.
+        """
+        keys = tuple(keys)
+        # Keys sharing the same msgid only need to be compared once.
+        msgids = tuple({key[1]: None for key in keys})
+        if similar_cache is None:
+            missing_sets = None
+            tasks = [(msgid, None) for msgid in msgids]
+        else:
+            # Pool msgids not yet compared with each cached msgid.
+            # There are only a few different sets (one per processed pool), compute each difference once.
+            pool_set = frozenset(self.pool_order)
+            covered_none = frozenset()
+            missing_sets = []
+            missing_memo = {}
+            tasks = []
+            for msgid in msgids:
+                covered = similar_cache.get((msgid, use_similar), (covered_none, None))[0]
+                memo = missing_memo.get(id(covered))
+                if memo is None:
+                    missing = pool_set - covered
+                    # Also keep a reference to covered, so that its id can't be reused.
+                    missing_memo[id(covered)] = memo = (len(missing_sets), missing, covered | pool_set, covered)
+                    missing_sets.append(missing if len(missing) != len(pool_set) else None)
+                if memo[1]:
+                    tasks.append((msgid, memo[0]))
+
+        if jobs > 1 and len(tasks) > jobs:
+            import multiprocessing
+            with multiprocessing.Pool(jobs, initializer=_similar_msgid_init,
+                                      initargs=(self, use_similar, missing_sets)) as pool:
+                results = dict(pool.map(_similar_msgid_task, tasks, chunksize=max(1, len(tasks) // (jobs * 8))))
+        else:
+            _similar_msgid_init(self, use_similar, missing_sets)
+            results = dict(map(_similar_msgid_task, tasks))
+            _similar_msgid_init(None, None, None)
+
+        if similar_cache is None:
+            for key in keys:
+                yield key, results[key[1]]
+            return
+
+        for msgid, new_matches in results.items():
+            cache_key = (msgid, use_similar)
+            covered, matches = similar_cache.get(cache_key, (covered_none, None))
+            if matches:
+                new_matches = {**matches, **new_matches}
+            similar_cache[cache_key] = (missing_memo[id(covered)][2], new_matches)
+        for key in keys:
+            matches = similar_cache.get((key[1], use_similar), (None, None))[1]
+            yield key, (self.best_of(matches) if matches else None)
+
+
+# Data of the SimilarMsgidIndex.best_all tasks, as globals of the worker processes.
+_similar_msgid_data = (None, None, None)
+
+
+def _similar_msgid_init(index, use_similar, missing_sets):
+    global _similar_msgid_data
+    _similar_msgid_data = (index, use_similar, missing_sets)
+
+
+def _similar_msgid_task(task):
+    index, use_similar, missing_sets = _similar_msgid_data
+    msgid, missing_idx = task
+    if missing_sets is None:
+        return msgid, index.best(msgid, use_similar)
+    return msgid, index.matches(msgid, use_similar, missing_sets[missing_idx])
+
+
+def extract_src_messages(path, rel_path, contexts, settings):
+    """
+    Extract messages from a C/C++ source file, as a list of (msgctxt, msgid, msgsrc) tuples.
+    contexts is a mapping {C_CTXT_NAME: ctxt_value}.
+    Does not require bpy, so that it can run in separate processes.
+    """
+    pygettexts = tuple(re.compile(r).search for r in settings.PYGETTEXT_KEYWORDS)
+
+    _clean_str = re.compile(settings.str_clean_re).finditer
+
+    def clean_str(s):
+        return "".join(m.group("clean") for m in _clean_str(s))
+
+    def process_entry(_msgctxt, _msgid):
+        # Context.
+        msgctxt = settings.DEFAULT_CONTEXT
+        if _msgctxt:
+            if _msgctxt in contexts:
+                msgctxt = contexts[_msgctxt]
+            elif '"' in _msgctxt or "'" in _msgctxt:
+                msgctxt = clean_str(_msgctxt)
+            else:
+                print("WARNING: raw context “{}” couldn’t be resolved!".format(_msgctxt))
+        # Message.
+        msgid = ""
+        if _msgid:
+            if '"' in _msgid or "'" in _msgid:
+                msgid = clean_str(_msgid)
+            else:
+                print("WARNING: raw message “{}” couldn’t be resolved!".format(_msgid))
+        return msgctxt, msgid
+
+    ret = []
+    data = ""
+    with open(path, encoding="utf8") as f:
+        data = f.read()
+    for srch in pygettexts:
+        m = srch(data)
+        line = pos = 0
+        while m:
+            d = m.groupdict()
+            # Line.
+            line += data[pos:m.start()].count('\n')
+            msgsrc = rel_path + ":" + str(line)
+            _msgid = d.get("msg_raw")
+            # First, try the "multi-contexts" stuff!
+            _msgctxts = tuple(d.get("ctxt_raw{}".format(i)) for i in range(settings.PYGETTEXT_MAX_MULTI_CTXT))
+            if _msgctxts[0]:
+                for _msgctxt in _msgctxts:
+                    if not _msgctxt:
+                        break
+                    msgctxt, msgid = process_entry(_msgctxt, _msgid)
+                    ret.append((msgctxt, msgid, msgsrc))
+            else:
+                _msgctxt = d.get("ctxt_raw")
+                msgctxt, msgid = process_entry(_msgctxt, _msgid)
+                ret.append((msgctxt, msgid, msgsrc))
+
+            pos = m.end()
+            line += data[m.start():pos].count('\n')
+            m = srch(data, pos)
+    return ret
+
+
 _locale_explode_re = re.compile(r"^([a-z]{2,})(?:_([A-Z]{2,}))?(?:@([a-z]{2,}))?$")
 
 
@@ -211,6 +428,174 @@ def list_po_dir(root_path, settings):
                 yield (False, uid, num_id, name, None, None)
 
 
+def iter_po_lines(path, use_mmap=False):
+    """
+    Generator yielding the lines of given po file (without their line ending), decoded one at a time.
+    If use_mmap is True, the file is memory-mapped instead of being read through a buffered file object.
+    """
+    if not use_mmap:
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+        return
+
+    import mmap
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped!
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                yield line.decode("utf-8").rstrip("\r\n")
+
+
+def iter_po_messages(lines, settings=settings, parsing_errors=None):
+    """
+    Generator parsing given po lines, yielding (line_nr, msg) tuples, msg being an unescaped I18nMessage, and line_nr
+    the number of the line ending its definition.
+    Note: This function will silently "arrange" mis-formatted entries (reporting them as (line_nr, error) tuples in
+          parsing_errors list, if given).
+    msgctxt, msgid and comment lines, being the same for all languages, are interned, so that they are shared in memory
+    when several po files are loaded at once.
+    """
+    if parsing_errors is None:
+        parsing_errors = []
+
+    reading_msgid = False
+    reading_msgstr = False
+    reading_msgctxt = False
+    reading_ctxt = False
+    is_commented = False
+    is_fuzzy = False
+    msgctxt_lines = []
+    msgid_lines = []
+    msgstr_lines = []
+    comment_lines = []
+
+    _unescape = I18nMessage.do_unescape
+    _intern = sys.intern
+
+    # Helper function
+    def _message():
+        return I18nMessage([_intern(_unescape(ln)) for ln in msgctxt_lines],
+                           [_intern(_unescape(ln)) for ln in msgid_lines],
+                           [_unescape(ln) for ln in msgstr_lines],
+                           [_intern(_unescape(ln)) for ln in comment_lines],
+                           is_commented, is_fuzzy, settings=settings)
+
+    _msgctxt = settings.PO_MSGCTXT
+    _comm_msgctxt = settings.PO_COMMENT_PREFIX_MSG + _msgctxt
+    _len_msgctxt = len(_msgctxt + '"')
+    _len_comm_msgctxt = len(_comm_msgctxt + '"')
+    _msgid = settings.PO_MSGID
+    _comm_msgid = settings.PO_COMMENT_PREFIX_MSG + _msgid
+    _len_msgid = len(_msgid + '"')
+    _len_comm_msgid = len(_comm_msgid + '"')
+    _msgstr = settings.PO_MSGSTR
+    _comm_msgstr = settings.PO_COMMENT_PREFIX_MSG + _msgstr
+    _len_msgstr = len(_msgstr + '"')
+    _len_comm_msgstr = len(_comm_msgstr + '"')
+    _comm_str = settings.PO_COMMENT_PREFIX_MSG
+    _comm_fuzzy = settings.PO_COMMENT_FUZZY
+    _len_comm_str = len(_comm_str + '"')
+
+    # Main loop over all lines in src...
+    line_nr = 0
+    for line_nr, line in enumerate(lines):
+        if line == "":
+            if reading_msgstr:
+                yield line_nr, _message()
+
+                # Let's clean up and get ready for next message!
+                reading_msgid = reading_msgstr = reading_msgctxt = False
+                is_commented = is_fuzzy = False
+                msgctxt_lines = []
+                msgid_lines = []
+                msgstr_lines = []
+                comment_lines = []
+            continue
+
+        elif line.startswith(_msgctxt) or line.startswith(_comm_msgctxt):
+            reading_ctxt = True
+            if line.startswith(_comm_str):
+                is_commented = True
+                line = line[_len_comm_msgctxt:-1]
+            else:
+                line = line[_len_msgctxt:-1]
+            msgctxt_lines.append(line)
+
+        elif line.startswith(_msgid) or line.startswith(_comm_msgid):
+            reading_msgid = True
+            if line.startswith(_comm_str):
+                if not is_commented and reading_ctxt:
+                    parsing_errors.append((line_nr, "commented msgid following regular msgctxt"))
+                is_commented = True
+                line = line[_len_comm_msgid:-1]
+            else:
+                line = line[_len_msgid:-1]
+            reading_ctxt = False
+            msgid_lines.append(line)
+
+        elif line.startswith(_msgstr) or line.startswith(_comm_msgstr):
+            if not reading_msgid:
+                parsing_errors.append((line_nr, "msgstr without a prior msgid"))
+            else:
+                reading_msgid = False
+            reading_msgstr = True
+            if line.startswith(_comm_str):
+                line = line[_len_comm_msgstr:-1]
+                if not is_commented:
+                    parsing_errors.append((line_nr, "commented msgstr following regular msgid"))
+            else:
+                line = line[_len_msgstr:-1]
+                if is_commented:
+                    parsing_errors.append((line_nr, "regular msgstr following commented msgid"))
+            msgstr_lines.append(line)
+
+        elif line.startswith(_comm_str[0]):
+            if line.startswith(_comm_str):
+                if reading_msgctxt:
+                    if is_commented:
+                        msgctxt_lines.append(line[_len_comm_str:-1])
+                    else:
+                        msgctxt_lines.append(line)
+                        parsing_errors.append((line_nr, "commented string while reading regular msgctxt"))
+                elif reading_msgid:
+                    if is_commented:
+                        msgid_lines.append(line[_len_comm_str:-1])
+                    else:
+                        msgid_lines.append(line)
+                        parsing_errors.append((line_nr, "commented string while reading regular msgid"))
+                elif reading_msgstr:
+                    if is_commented:
+                        msgstr_lines.append(line[_len_comm_str:-1])
+                    else:
+                        msgstr_lines.append(line)
+                        parsing_errors.append((line_nr, "commented string while reading regular msgstr"))
+            else:
+                if reading_msgctxt or reading_msgid or reading_msgstr:
+                    parsing_errors.append((line_nr, "commented string within msgctxt, msgid or msgstr scope, ignored"))
+                elif line.startswith(_comm_fuzzy):
+                    is_fuzzy = True
+                else:
+                    comment_lines.append(line)
+
+        else:
+            if reading_msgctxt:
+                msgctxt_lines.append(line[1:-1])
+            elif reading_msgid:
+                msgid_lines.append(line[1:-1])
+            elif reading_msgstr:
+                line = line[1:-1]
+                msgstr_lines.append(line)
+            else:
+                parsing_errors.append((line_nr, "regular string outside msgctxt, msgid or msgstr scope"))
+
+    # If no final empty line, last message is not finalized!
+    if reading_msgstr:
+        yield line_nr, _message()
+
+
 def enable_addons(addons=None, support=None, disable=False, check_only=False):
     """
     Enable (or disable) addons based either on a set of names, or a set of 'support' types.
@@ -276,62 +661,120 @@ def enable_addons(addons=None, support=None, disable=False, check_only=False):
 class I18nMessage:
     """
     Internal representation of a message.
+    To keep memory usage low when many languages are loaded at once, msgctxt, msgid and msgstr lines are stored
+    packed (None when there is no line, a single string for the most common single-line case), and only turned into
+    actual lists when their *_lines accessors are used.
     """
-    __slots__ = ("msgctxt_lines", "msgid_lines", "msgstr_lines", "comment_lines", "is_fuzzy", "is_commented",
+    __slots__ = ("_msgctxt_lines", "_msgid_lines", "_msgstr_lines", "comment_lines", "is_fuzzy", "is_commented",
                  "settings")
 
     def __init__(self, msgctxt_lines=None, msgid_lines=None, msgstr_lines=None, comment_lines=None,
                  is_commented=False, is_fuzzy=False, settings=settings):
         self.settings = settings
-        self.msgctxt_lines = msgctxt_lines or []
-        self.msgid_lines = msgid_lines or []
-        self.msgstr_lines = msgstr_lines or []
+        self._msgctxt_lines = self._pack_lines(msgctxt_lines)
+        self._msgid_lines = self._pack_lines(msgid_lines)
+        self._msgstr_lines = self._pack_lines(msgstr_lines)
         self.comment_lines = comment_lines or []
         self.is_fuzzy = is_fuzzy
         self.is_commented = is_commented
 
-    # ~ def __getstate__(self):
-        # ~ return {key: getattr(self, key) for key in self.__slots__}
+    def __getstate__(self):
+        # A plain tuple is much faster to pickle than the default per-slot dict.
+        return (self._msgctxt_lines, self._msgid_lines, self._msgstr_lines, self.comment_lines,
+                self.is_fuzzy, self.is_commented, self.settings)
 
-    # ~ def __getstate__(self):
-        # ~ return {key: getattr(self, key) for key in self.__slots__}
+    def __setstate__(self, state):
+        (self._msgctxt_lines, self._msgid_lines, self._msgstr_lines, self.comment_lines,
+         self.is_fuzzy, self.is_commented, self.settings) = state
+
+    @staticmethod
+    def _pack_lines(lines):
+        if not lines:
+            return None
+        if len(lines) == 1:
+            return lines[0]
+        return lines
+
+    @staticmethod
+    def _iter_lines(packed):
+        """Return given packed lines as a sequence, without unpacking them."""
+        if packed is None:
+            return ()
+        if isinstance(packed, str):
+            return (packed,)
+        return packed
+
+    @staticmethod
+    def _join_lines(packed):
+        if packed is None:
+            return ""
+        if isinstance(packed, str):
+            return packed
+        return "".join(packed)
+
+    def _get_msgctxt_lines(self):
+        if not isinstance(self._msgctxt_lines, list):
+            self._msgctxt_lines = list(self._iter_lines(self._msgctxt_lines))
+        return self._msgctxt_lines
+
+    def _set_msgctxt_lines(self, lines):
+        self._msgctxt_lines = self._pack_lines(lines)
+    msgctxt_lines = property(_get_msgctxt_lines, _set_msgctxt_lines)
+
+    def _get_msgid_lines(self):
+        if not isinstance(self._msgid_lines, list):
+            self._msgid_lines = list(self._iter_lines(self._msgid_lines))
+        return self._msgid_lines
+
+    def _set_msgid_lines(self, lines):
+        self._msgid_lines = self._pack_lines(lines)
+    msgid_lines = property(_get_msgid_lines, _set_msgid_lines)
+
+    def _get_msgstr_lines(self):
+        if not isinstance(self._msgstr_lines, list):
+            self._msgstr_lines = list(self._iter_lines(self._msgstr_lines))
+        return self._msgstr_lines
+
+    def _set_msgstr_lines(self, lines):
+        self._msgstr_lines = self._pack_lines(lines)
+    msgstr_lines = property(_get_msgstr_lines, _set_msgstr_lines)
 
     def _get_msgctxt(self):
-        return "".join(self.msgctxt_lines)
+        return self._join_lines(self._msgctxt_lines)
 
     def _set_msgctxt(self, ctxt):
-        self.msgctxt_lines = [ctxt]
+        self._msgctxt_lines = ctxt
     msgctxt = property(_get_msgctxt, _set_msgctxt)
 
     def _get_msgid(self):
-        return "".join(self.msgid_lines)
+        return self._join_lines(self._msgid_lines)
 
     def _set_msgid(self, msgid):
-        self.msgid_lines = [msgid]
+        self._msgid_lines = msgid
     msgid = property(_get_msgid, _set_msgid)
 
     def _get_msgstr(self):
-        return "".join(self.msgstr_lines)
+        return self._join_lines(self._msgstr_lines)
 
     def _set_msgstr(self, msgstr):
-        self.msgstr_lines = [msgstr]
+        self._msgstr_lines = msgstr
     msgstr = property(_get_msgstr, _set_msgstr)
 
     def _get_sources(self):
         lstrip1 = len(self.settings.PO_COMMENT_PREFIX_SOURCE)
         lstrip2 = len(self.settings.PO_COMMENT_PREFIX_SOURCE_CUSTOM)
-        return ([l[lstrip1:] for l in self.comment_lines if l.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE)] +
-                [l[lstrip2:] for l in self.comment_lines
-                 if l.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE_CUSTOM)])
+        return ([ln[lstrip1:] for ln in self.comment_lines if ln.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE)] +
+                [ln[lstrip2:] for ln in self.comment_lines
+                 if ln.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE_CUSTOM)])
 
     def _set_sources(self, sources):
         cmmlines = self.comment_lines.copy()
-        for l in cmmlines:
+        for ln in cmmlines:
             if (
-                    l.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE) or
-                    l.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE_CUSTOM)
+                    ln.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE) or
+                    ln.startswith(self.settings.PO_COMMENT_PREFIX_SOURCE_CUSTOM)
             ):
-                self.comment_lines.remove(l)
+                self.comment_lines.remove(ln)
         lines_src = []
         lines_src_custom = []
         for src in sources:
@@ -349,20 +792,25 @@ class I18nMessage:
 
     def copy(self):
         # Deepcopy everything but the settings!
-        return self.__class__(msgctxt_lines=self.msgctxt_lines[:], msgid_lines=self.msgid_lines[:],
-                              msgstr_lines=self.msgstr_lines[:], comment_lines=self.comment_lines[:],
+        return self.__class__(msgctxt_lines=list(self._iter_lines(self._msgctxt_lines)),
+                              msgid_lines=list(self._iter_lines(self._msgid_lines)),
+                              msgstr_lines=list(self._iter_lines(self._msgstr_lines)),
+                              comment_lines=self.comment_lines[:],
                               is_commented=self.is_commented, is_fuzzy=self.is_fuzzy, settings=self.settings)
 
+    @staticmethod
+    def split_lines(text):
+        """Split text at its new lines, keeping them."""
+        lns = text.splitlines()
+        return [ln + "\n" for ln in lns[:-1]] + lns[-1:]
+
     def normalize(self, max_len=80):
         """
         Normalize this message, call this before exporting it...
         Currently normalize msgctxt, msgid and msgstr lines to given max_len (if below 1, make them single line).
         """
         max_len -= 2  # The two quotes!
-
-        def _splitlines(text):
-            lns = text.splitlines()
-            return [l + "\n" for l in lns[:-1]] + lns[-1:]
+        _splitlines = self.split_lines
 
         # We do not need the full power of textwrap... We just split first at escaped new lines, then into each line
         # if needed... No word splitting, nor fancy spaces handling!
@@ -371,10 +819,10 @@ class I18nMessage:
                 return [text]
             lines = _splitlines(text)
             ret = []
-            for l in lines:
+            for ln in lines:
                 tmp = []
                 cur_len = 0
-                words = l.split(' ')
+                words = ln.split(' ')
                 for w in words:
                     cur_len += len(w) + 1
                     if cur_len > (max_len - 1) and tmp:
@@ -408,15 +856,14 @@ class I18nMessage:
 
         # Be sure comment lines are not duplicated (can happen with sources...).
         tmp = []
-        for l in self.comment_lines:
-            if l not in tmp:
-                tmp.append(l)
+        for ln in self.comment_lines:
+            if ln not in tmp:
+                tmp.append(ln)
         self.comment_lines = tmp
 
     _esc_quotes = re.compile(r'(?!<\\)((?:\\\\)*)"')
     _unesc_quotes = re.compile(r'(?!<\\)((?:\\\\)*)\\"')
-    _esc_names = ("msgctxt_lines", "msgid_lines", "msgstr_lines")
-    _esc_names_all = _esc_names + ("comment_lines",)
+    _esc_names = ("_msgctxt_lines", "_msgid_lines", "_msgstr_lines")
 
     @classmethod
     def do_escape(cls, txt):
@@ -441,14 +888,16 @@ class I18nMessage:
         return txt
 
     def escape(self, do_all=False):
-        names = self._esc_names_all if do_all else self._esc_names
-        for name in names:
-            setattr(self, name, [self.do_escape(l) for l in getattr(self, name)])
+        for name in self._esc_names:
+            setattr(self, name, self._pack_lines([self.do_escape(ln) for ln in self._iter_lines(getattr(self, name))]))
+        if do_all:
+            self.comment_lines = [self.do_escape(ln) for ln in self.comment_lines]
 
     def unescape(self, do_all=True):
-        names = self._esc_names_all if do_all else self._esc_names
-        for name in names:
-            setattr(self, name, [self.do_unescape(l) for l in getattr(self, name)])
+        for name in self._esc_names:
+            setattr(self, name, self._pack_lines([self.do_unescape(ln) for ln in self._iter_lines(getattr(self, name))]))
+        if do_all:
+            self.comment_lines = [self.do_unescape(ln) for ln in self.comment_lines]
 
 
 class I18nMessages:
@@ -601,12 +1050,15 @@ class I18nMessages:
                 sm.msgstr = m.msgstr
                 sm.is_fuzzy = m.is_fuzzy
 
-    def update(self, ref, use_similar=None, keep_old_commented=True):
+    def update(self, ref, use_similar=None, keep_old_commented=True, similar_cache=None, jobs=1):
         """
         Update this I18nMessage with the ref one. Translations from ref are never used. Source comments from ref
         completely replace current ones. If use_similar is not 0.0, it will try to match new messages in ref with an
         existing one. Messages no more found in ref will be marked as commented if keep_old_commented is True,
         or removed.
+        similar_cache is an optional dict shared between updates of several languages from the same ref, to avoid
+        comparing the same msgids again, see SimilarMsgidIndex.best_all. jobs is the number of processes used to
+        compare msgids.
         """
         if use_similar is None:
             use_similar = self.settings.SIMILAR_MSGID_THRESHOLD
@@ -632,8 +1084,8 @@ class I18nMessages:
 
         # Next process new keys.
         if use_similar > 0.0:
-            for key, msgid in map(get_best_similar,
-                                  tuple((nk, use_similar, tuple(similar_pool.keys())) for nk in new_keys)):
+            similar_index = SimilarMsgidIndex(similar_pool.keys())
+            for key, msgid in similar_index.best_all(new_keys, use_similar, similar_cache, jobs):
                 if msgid:
                     # Try to get the same context, else just get one...
                     skey = (key[0], msgid)
@@ -897,175 +1349,47 @@ class I18nMessages:
     def parse(self, kind, key, src):
         del self.parsing_errors[:]
         self.parsers[kind](self, src, key)
+        self.print_parsing_errors(key, src)
+        self.update_info()
+
+    def print_parsing_errors(self, key, src):
         if self.parsing_errors:
             print("{} ({}):".format(key, src))
             self.print_info(print_stats=False)
             print("The parser solved them as well as it could...")
-        self.update_info()
 
-    def parse_messages_from_po(self, src, key=None):
+    def parse_messages_from_po(self, src, key=None, use_mmap=None):
         """
-        Parse a po file.
+        Parse a po file (src being either its path or its content), one message at a time.
+        A po file is memory-mapped if use_mmap is True, or if it is None and the file is bigger than
+        settings.PARSER_MMAP_FILE_SIZE.
         Note: This function will silently "arrange" mis-formatted entries, thus using afterward write_messages() should
               always produce a po-valid file, though not correct!
         """
-        reading_msgid = False
-        reading_msgstr = False
-        reading_msgctxt = False
-        reading_comment = False
-        is_commented = False
-        is_fuzzy = False
-        msgctxt_lines = []
-        msgid_lines = []
-        msgstr_lines = []
-        comment_lines = []
-
         default_context = self.settings.DEFAULT_CONTEXT
 
-        # Helper function
-        def finalize_message(self, line_nr):
-            nonlocal reading_msgid, reading_msgstr, reading_msgctxt, reading_comment
-            nonlocal is_commented, is_fuzzy, msgid_lines, msgstr_lines, msgctxt_lines, comment_lines
-
-            msgid = I18nMessage.do_unescape("".join(msgid_lines))
-            msgctxt = I18nMessage.do_unescape("".join(msgctxt_lines))
-            msgkey = (msgctxt or default_context, msgid)
-
-            # Never allow overriding existing msgid/msgctxt pairs!
-            if msgkey in self.msgs:
-                self.parsing_errors.append((line_nr, "{} context/msgid is already in current messages!".format(msgkey)))
-                return
-
-            self.msgs[msgkey] = I18nMessage(msgctxt_lines, msgid_lines, msgstr_lines, comment_lines,
-                                            is_commented, is_fuzzy, settings=self.settings)
-
-            # Let's clean up and get ready for next message!
-            reading_msgid = reading_msgstr = reading_msgctxt = reading_comment = False
-            is_commented = is_fuzzy = False
-            msgctxt_lines = []
-            msgid_lines = []
-            msgstr_lines = []
-            comment_lines = []
-
         # try to use src as file name...
         if os.path.isfile(src):
-            if os.stat(src).st_size > self.settings.PARSER_MAX_FILE_SIZE:
+            size = os.stat(src).st_size
+            if size > self.settings.PARSER_MAX_FILE_SIZE:
                 # Security, else we could read arbitrary huge files!
                 print("WARNING: skipping file {}, too huge!".format(src))
                 return
             if not key:
                 key = src
-            with open(src, 'r', encoding="utf-8") as f:
-                src = f.read()
-
-        _msgctxt = self.settings.PO_MSGCTXT
-        _comm_msgctxt = self.settings.PO_COMMENT_PREFIX_MSG + _msgctxt
-        _len_msgctxt = len(_msgctxt + '"')
-        _len_comm_msgctxt = len(_comm_msgctxt + '"')
-        _msgid = self.settings.PO_MSGID
-        _comm_msgid = self.settings.PO_COMMENT_PREFIX_MSG + _msgid
-        _len_msgid = len(_msgid + '"')
-        _len_comm_msgid = len(_comm_msgid + '"')
-        _msgstr = self.settings.PO_MSGSTR
-        _comm_msgstr = self.settings.PO_COMMENT_PREFIX_MSG + _msgstr
-        _len_msgstr = len(_msgstr + '"')
-        _len_comm_msgstr = len(_comm_msgstr + '"')
-        _comm_str = self.settings.PO_COMMENT_PREFIX_MSG
-        _comm_fuzzy = self.settings.PO_COMMENT_FUZZY
-        _len_comm_str = len(_comm_str + '"')
-
-        # Main loop over all lines in src...
-        for line_nr, line in enumerate(src.splitlines()):
-            if line == "":
-                if reading_msgstr:
-                    finalize_message(self, line_nr)
-                continue
-
-            elif line.startswith(_msgctxt) or line.startswith(_comm_msgctxt):
-                reading_comment = False
-                reading_ctxt = True
-                if line.startswith(_comm_str):
-                    is_commented = True
-                    line = line[_len_comm_msgctxt:-1]
-                else:
-                    line = line[_len_msgctxt:-1]
-                msgctxt_lines.append(line)
-
-            elif line.startswith(_msgid) or line.startswith(_comm_msgid):
-                reading_comment = False
-                reading_msgid = True
-                if line.startswith(_comm_str):
-                    if not is_commented and reading_ctxt:
-                        self.parsing_errors.append((line_nr, "commented msgid following regular msgctxt"))
-                    is_commented = True
-                    line = line[_len_comm_msgid:-1]
-                else:
-                    line = line[_len_msgid:-1]
-                reading_ctxt = False
-                msgid_lines.append(line)
-
-            elif line.startswith(_msgstr) or line.startswith(_comm_msgstr):
-                if not reading_msgid:
-                    self.parsing_errors.append((line_nr, "msgstr without a prior msgid"))
-                else:
-                    reading_msgid = False
-                reading_msgstr = True
-                if line.startswith(_comm_str):
-                    line = line[_len_comm_msgstr:-1]
-                    if not is_commented:
-                        self.parsing_errors.append((line_nr, "commented msgstr following regular msgid"))
-                else:
-                    line = line[_len_msgstr:-1]
-                    if is_commented:
-                        self.parsing_errors.append((line_nr, "regular msgstr following commented msgid"))
-                msgstr_lines.append(line)
-
-            elif line.startswith(_comm_str[0]):
-                if line.startswith(_comm_str):
-                    if reading_msgctxt:
-                        if is_commented:
-                            msgctxt_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgctxt_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgctxt"))
-                    elif reading_msgid:
-                        if is_commented:
-                            msgid_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgid_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgid"))
-                    elif reading_msgstr:
-                        if is_commented:
-                            msgstr_lines.append(line[_len_comm_str:-1])
-                        else:
-                            msgstr_lines.append(line)
-                            self.parsing_errors.append((line_nr, "commented string while reading regular msgstr"))
-                else:
-                    if reading_msgctxt or reading_msgid or reading_msgstr:
-                        self.parsing_errors.append((line_nr,
-                                                    "commented string within msgctxt, msgid or msgstr scope, ignored"))
-                    elif line.startswith(_comm_fuzzy):
-                        is_fuzzy = True
-                    else:
-                        comment_lines.append(line)
-                    reading_comment = True
-
-            else:
-                if reading_msgctxt:
-                    msgctxt_lines.append(line[1:-1])
-                elif reading_msgid:
-                    msgid_lines.append(line[1:-1])
-                elif reading_msgstr:
-                    line = line[1:-1]
-                    msgstr_lines.append(line)
-                else:
-                    self.parsing_errors.append((line_nr, "regular string outside msgctxt, msgid or msgstr scope"))
-                    #self.parsing_errors += (str(comment_lines), str(msgctxt_lines), str(msgid_lines), str(msgstr_lines))
+            if use_mmap is None:
+                use_mmap = 0 < self.settings.PARSER_MMAP_FILE_SIZE <= size
+            lines = iter_po_lines(src, use_mmap)
+        else:
+            lines = src.splitlines()
 
-        # If no final empty line, last message is not finalized!
-        if reading_msgstr:
-            finalize_message(self, line_nr)
-        self.unescape()
+        for line_nr, msg in iter_po_messages(lines, self.settings, self.parsing_errors):
+            msgkey = (msg.msgctxt or default_context, msg.msgid)
+            # Never allow overriding existing msgid/msgctxt pairs!
+            if msgkey in self.msgs:
+                self.parsing_errors.append((line_nr, "{} context/msgid is already in current messages!".format(msgkey)))
+                continue
+            self.msgs[msgkey] = msg
 
     def write(self, kind, dest):
         self.writers[kind](self, dest)
@@ -1073,6 +1397,8 @@ class I18nMessages:
     def write_messages_to_po(self, fname, compact=False):
         """
         Write messages in fname po file.
+        Messages are written one at a time, without building the whole file content in memory. They are written
+        normalized (without wrapping) and escaped, but are left unchanged.
         """
         default_context = self.settings.DEFAULT_CONTEXT
 
@@ -1081,50 +1407,53 @@ class I18nMessages:
             _msgid = self.settings.PO_MSGID
             _msgstr = self.settings.PO_MSGSTR
             _comm = self.settings.PO_COMMENT_PREFIX_MSG
-
-            self.escape()
+            _escape = I18nMessage.do_escape
+            _splitlines = I18nMessage.split_lines
 
             for num, msg in enumerate(self.msgs.values()):
-                if compact and (msg.is_commented or msg.is_fuzzy or not msg.msgstr_lines):
+                # No wrapping for now...
+                msgstr_lines = [_escape(ln) for ln in _splitlines(msg.msgstr)]
+                if compact and (msg.is_commented or msg.is_fuzzy or not msgstr_lines):
                     continue
                 if not compact:
-                    f.write("\n".join(msg.comment_lines))
+                    # Be sure comment lines are not duplicated (can happen with sources...).
+                    f.write("\n".join(dict.fromkeys(msg.comment_lines)))
                 # Only mark as fuzzy if msgstr is not empty!
-                if msg.is_fuzzy and msg.msgstr_lines:
+                if msg.is_fuzzy and msgstr_lines:
                     f.write("\n" + self.settings.PO_COMMENT_FUZZY)
                 _p = _comm if msg.is_commented else ""
+                msgctxt_lines = [_escape(ln) for ln in _splitlines(msg.msgctxt)]
+                msgid_lines = [_escape(ln) for ln in _splitlines(msg.msgid)]
                 chunks = []
-                if msg.msgctxt and msg.msgctxt != default_context:
-                    if len(msg.msgctxt_lines) > 1:
+                msgctxt = "".join(msgctxt_lines)
+                if msgctxt and msgctxt != default_context:
+                    if len(msgctxt_lines) > 1:
                         chunks += [
                             "\n" + _p + _msgctxt + "\"\"\n" + _p + "\"",
-                            ("\"\n" + _p + "\"").join(msg.msgctxt_lines),
+                            ("\"\n" + _p + "\"").join(msgctxt_lines),
                             "\"",
                         ]
                     else:
-                        chunks += ["\n" + _p + _msgctxt + "\"" + msg.msgctxt + "\""]
-                if len(msg.msgid_lines) > 1:
+                        chunks += ["\n" + _p + _msgctxt + "\"" + msgctxt + "\""]
+                if len(msgid_lines) > 1:
                     chunks += [
                         "\n" + _p + _msgid + "\"\"\n" + _p + "\"",
-                        ("\"\n" + _p + "\"").join(msg.msgid_lines),
+                        ("\"\n" + _p + "\"").join(msgid_lines),
                         "\"",
                     ]
                 else:
-                    chunks += ["\n" + _p + _msgid + "\"" + msg.msgid + "\""]
-                if len(msg.msgstr_lines) > 1:
+                    chunks += ["\n" + _p + _msgid + "\"" + "".join(msgid_lines) + "\""]
+                if len(msgstr_lines) > 1:
                     chunks += [
                         "\n" + _p + _msgstr + "\"\"\n" + _p + "\"",
-                        ("\"\n" + _p + "\"").join(msg.msgstr_lines),
+                        ("\"\n" + _p + "\"").join(msgstr_lines),
                         "\"",
                     ]
                 else:
-                    chunks += ["\n" + _p + _msgstr + "\"" + msg.msgstr + "\""]
+                    chunks += ["\n" + _p + _msgstr + "\"" + "".join(msgstr_lines) + "\""]
                 chunks += ["\n\n"]
                 f.write("".join(chunks))
 
-            self.unescape()
-
-        self.normalize(max_len=0)  # No wrapping for now...
         if isinstance(fname, str):
             with open(fname, 'w', encoding="utf-8") as f:
                 _write(self, f, compact)
@@ -1217,6 +1546,8 @@ class I18nMessages:
 class I18n:
     """
     Internal representation of a whole translation set.
+    Per-language work (parsing, checking and writing po files) is dispatched to a pool of jobs processes
+    (0 meaning one per available CPU), results being always processed in the same order as with a single process.
     """
 
     @staticmethod
@@ -1266,8 +1597,12 @@ class I18n:
                     return os.path.join(os.path.dirname(path), "translations.py")
         return path
 
-    def __init__(self, kind=None, src=None, langs=set(), settings=settings):
+    def __init__(self, kind=None, src=None, langs=set(), settings=settings, jobs=1):
+        if jobs != 1 and isinstance(settings, types.ModuleType):
+            # Modules cannot be pickled, use the equivalent settings object instead.
+            settings = settings.I18nSettings()
         self.settings = settings
+        self.jobs = jobs or os.cpu_count() or 1
         self.trans = {}
         self.src = {}  # Should have the same keys as self.trans (plus PARSER_PY_ID for py file)!
         self.dst = self._dst  # A callable that transforms src_path into dst_path!
@@ -1282,6 +1617,18 @@ class I18n:
         self.src[self.settings.PARSER_PY_ID] = value
     py_file = property(_py_file_get, _py_file_set)
 
+    def _map_langs(self, func, *iterables):
+        """
+        Return the list of results of func applied to given per-language arguments, in order.
+        With more than one job, calls are dispatched to a process pool.
+        """
+        args = tuple(zip(*iterables))
+        if self.jobs > 1 and len(args) > 1:
+            import concurrent.futures
+            with concurrent.futures.ProcessPoolExecutor(min(self.jobs, len(args))) as executor:
+                return list(executor.map(func, *zip(*args)))
+        return [func(*arg) for arg in args]
+
     def escape(self, do_all=False):
         for trans in self.trans.values():
             trans.escape(do_all)
@@ -1306,20 +1653,23 @@ class I18n:
             self.nbr_signs = self.trans[self.settings.PARSER_TEMPLATE_ID].nbr_signs
         else:
             self.nbr_trans = len(self.trans)
-        for msgs in self.trans.values():
+        for uid, msgs in self.trans.items():
             msgs.update_info()
+            self.contexts |= msgs.contexts
+            # Averages are only computed over actual translations.
+            if uid == self.settings.PARSER_TEMPLATE_ID:
+                continue
             if msgs.nbr_msgs > 0:
                 self.lvl += float(msgs.nbr_trans_msgs) / float(msgs.nbr_msgs)
                 self.lvl_ttips += float(msgs.nbr_ttips) / float(msgs.nbr_msgs)
                 self.lvl_comm += float(msgs.nbr_comm_msgs) / float(msgs.nbr_msgs + msgs.nbr_comm_msgs)
             if msgs.nbr_ttips > 0:
-                self.lvl_trans_ttips = float(msgs.nbr_trans_ttips) / float(msgs.nbr_ttips)
+                self.lvl_trans_ttips += float(msgs.nbr_trans_ttips) / float(msgs.nbr_ttips)
             if msgs.nbr_trans_msgs > 0:
-                self.lvl_ttips_in_trans = float(msgs.nbr_trans_ttips) / float(msgs.nbr_trans_msgs)
+                self.lvl_ttips_in_trans += float(msgs.nbr_trans_ttips) / float(msgs.nbr_trans_msgs)
             if self.nbr_signs == 0:
                 self.nbr_signs = msgs.nbr_signs
             self.nbr_trans_signs += msgs.nbr_trans_signs
-            self.contexts |= msgs.contexts
 
     def print_stats(self, prefix="", print_msgs=True):
         """
@@ -1332,7 +1682,7 @@ class I18n:
                 if key == self.settings.PARSER_TEMPLATE_ID:
                     continue
                 print(prefix + key + ":")
-                msgs.print_stats(prefix=msgs_prefix)
+                msgs.print_info(prefix=msgs_prefix, print_errors=False)
                 print(prefix)
 
         nbr_contexts = len(self.contexts - {self.settings.DEFAULT_CONTEXT})
@@ -1352,7 +1702,7 @@ class I18n:
             "    {:>6.1%} of messages are commented.\n".format(self.lvl_comm / self.nbr_trans),
             "    The org msgids are currently made of {} signs.\n".format(self.nbr_signs),
             "    All processed translations are currently made of {} signs.\n".format(self.nbr_trans_signs),
-            "    {} specific context{} present:\n".format(self.nbr_contexts, _ctx_txt)) +
+            "    {} specific context{} present:\n".format(nbr_contexts, _ctx_txt)) +
             tuple("            " + c + "\n" for c in self.contexts - {self.settings.DEFAULT_CONTEXT}) +
             ("\n",)
         )
@@ -1386,6 +1736,38 @@ class I18n:
                 return path, env[tuple_id]
         return None, None  # No data...
 
+    def update(self, ref=None, use_similar=None, keep_old_commented=True, langs=set()):
+        """
+        Update all translations (or only those in langs) from ref messages (the template ones by default).
+        Similar msgids found for new messages are shared between languages, so each new msgid is only compared
+        once with each existing one.
+        """
+        if ref is None:
+            ref = self.trans[self.settings.PARSER_TEMPLATE_ID]
+        similar_cache = {}
+        for uid, msgs in self.trans.items():
+            if uid == self.settings.PARSER_TEMPLATE_ID or (langs and uid not in langs):
+                continue
+            msgs.update(ref, use_similar, keep_old_commented, similar_cache=similar_cache, jobs=self.jobs)
+        self.update_info()
+
+    def check(self, fix=False, langs=set()):
+        """
+        Check all translations (or only those in langs), see I18nMessages.check.
+        Return a dict mapping languages uids to their list of found errors.
+        """
+        uids = [uid for uid in self.trans if not langs or uid in langs]
+        results = self._map_langs(_i18n_check_task, (self.trans[uid] for uid in uids), (fix,) * len(uids))
+        ret = {}
+        for uid, (errors, msgs) in zip(uids, results):
+            # Processes fix copies of the messages.
+            if fix:
+                self.trans[uid] = msgs
+            ret[uid] = errors
+        if fix:
+            self.update_info()
+        return ret
+
     def parse(self, kind, src, langs=set()):
         self.parsers[kind](self, src, langs)
 
@@ -1397,14 +1779,16 @@ class I18n:
         if langs set is void, all languages found are loaded.
         """
         root_dir, pot_file = src
+        po_files = []
         if pot_file and os.path.isfile(pot_file):
-            self.trans[self.settings.PARSER_TEMPLATE_ID] = I18nMessages(self.settings.PARSER_TEMPLATE_ID, 'PO',
-                                                                        pot_file, pot_file, settings=self.settings)
-            self.src_po[self.settings.PARSER_TEMPLATE_ID] = pot_file
+            po_files.append((self.settings.PARSER_TEMPLATE_ID, pot_file))
+        po_files += get_po_files_from_dir(root_dir, langs)
 
-        for uid, po_file in get_po_files_from_dir(root_dir, langs):
-            self.trans[uid] = I18nMessages(uid, 'PO', po_file, po_file, settings=self.settings)
-            self.src_po[uid] = po_file
+        results = self._map_langs(_i18n_parse_po_task, *zip(*po_files), (self.settings,) * len(po_files))
+        for (uid, po_file), msgs in zip(po_files, results):
+            msgs.print_parsing_errors(po_file, po_file)
+            self.trans[uid] = msgs
+            self.src[uid] = po_file
 
     def parse_from_py(self, src, langs=set()):
         """
@@ -1460,9 +1844,9 @@ class I18n:
         keys = self.trans.keys()
         if langs:
             keys &= langs
-        for uid in keys:
-            dst = self.dst(self, self.src.get(uid, ""), uid, 'PO')
-            self.trans[uid].write('PO', dst)
+        keys = sorted(keys)
+        dsts = [self.dst(self, self.src.get(uid, ""), uid, 'PO') for uid in keys]
+        self._map_langs(_i18n_write_po_task, (self.trans[uid] for uid in keys), dsts)
 
     def write_to_py(self, langs=set()):
         """
@@ -1627,3 +2011,19 @@ class I18n:
         "PO": write_to_po,
         "PY": write_to_py,
     }
+
+
+# Per-language tasks of I18n, as module functions so that they can be dispatched to other processes.
+def _i18n_parse_po_task(uid, po_file, settings):
+    msgs = I18nMessages(uid, settings=settings)
+    msgs.parse_messages_from_po(po_file, po_file)
+    msgs.update_info()
+    return msgs
+
+
+def _i18n_check_task(msgs, fix):
+    return msgs.check(fix), (msgs if fix else None)
+
+
+def _i18n_write_po_task(msgs, dst):
+    msgs.write('PO', dst)
@@ -71,6 +71,11 @@ def rtl_process_po(args, settings):
     po.write(kind="PO", dest=args.dst)
 
 
+def _po_translated_ratio(uid, po_path, settings):
+    po = utils_i18n.I18nMessages(uid=uid, kind='PO', src=po_path, settings=settings)
+    return po.nbr_trans_msgs / po.nbr_msgs if po.nbr_msgs > 0 else 0
+
+
 def language_menu(args, settings):
     # 'DEFAULT' and en_US are always valid, fully-translated "languages"!
     stats = {"DEFAULT": 1.0, "en_US": 1.0}
@@ -79,6 +84,7 @@ def language_menu(args, settings):
                  for can_use, uid, _num_id, _name, _isocode, po_path_branch
                      in utils_i18n.list_po_dir(settings.BRANCHES_DIR, settings)
                  if can_use}
+    po_files = []
     for po_dir in os.listdir(settings.BRANCHES_DIR):
         po_dir = os.path.join(settings.BRANCHES_DIR, po_dir)
         if not os.path.isdir(po_dir):
@@ -88,8 +94,18 @@ def language_menu(args, settings):
             #print("Checking %s, found uid %s" % (po_path, uid))
             po_path = os.path.join(settings.TRUNK_PO_DIR, po_path)
             if uid is not None:
-                po = utils_i18n.I18nMessages(uid=uid, kind='PO', src=po_path, settings=settings)
-                stats[uid] = po.nbr_trans_msgs / po.nbr_msgs if po.nbr_msgs > 0 else 0
+                po_files.append((uid, po_path))
+
+    # Each po file is parsed in its own process, results are gathered in the same order anyway.
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(po_files) > 1:
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor(min(jobs, len(po_files))) as executor:
+            ratios = executor.map(_po_translated_ratio, *zip(*po_files), (settings,) * len(po_files))
+            stats.update(zip((uid for uid, _po_path in po_files), ratios))
+    else:
+        for uid, po_path in po_files:
+            stats[uid] = _po_translated_ratio(uid, po_path, settings)
     utils_languages_menu.gen_menu_file(stats, settings)
 
 
@@ -100,6 +116,8 @@ def main():
     parser = argparse.ArgumentParser(description="Tool to perform common actions over PO/MO files.")
     parser.add_argument('-s', '--settings', default=None,
                         help="Override (some) default settings. Either a JSon file name, or a JSon string.")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Number of processes used to process several PO files (0 to use all available CPUs).")
     sub_parsers = parser.add_subparsers()
 
     sub_parser = sub_parsers.add_parser('update_po', help="Update a PO file from a given POT template file")
@@ -20,6 +20,7 @@
 
 __all__ = (
     "io",
+    "keyconfig_cache",
     "keymap_from_toolbar",
     "keymap_hierarchy",
 )
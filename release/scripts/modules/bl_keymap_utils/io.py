@@ -261,18 +261,28 @@ def _kmi_props_setattr(kmi_props, attr, value):
 
 
 def keymap_init_from_data(km, km_items, is_modal=False):
+    # Called for every key-map on load, keep this fast!
     new_fn = getattr(km.keymap_items, "new_modal" if is_modal else "new")
     for (kmi_idname, kmi_args, kmi_data) in km_items:
         kmi = new_fn(kmi_idname, **kmi_args)
-        if kmi_data is not None:
-            if not kmi_data.get("active", True):
-                kmi.active = False
-            kmi_props_data = kmi_data.get("properties", None)
-            if kmi_props_data is not None:
-                kmi_props = kmi.properties
-                assert type(kmi_props_data) is list
-                for attr, value in kmi_props_data:
-                    _kmi_props_setattr(kmi_props, attr, value)
+        if kmi_data is None:
+            continue
+        if not kmi_data.get("active", True):
+            kmi.active = False
+        kmi_props_data = kmi_data.get("properties", None)
+        if kmi_props_data is not None:
+            kmi_props = kmi.properties
+            assert type(kmi_props_data) is list
+            for attr, value in kmi_props_data:
+                # Set values directly, nested properties and
+                # errors are handled by '_kmi_props_setattr'.
+                if type(value) is not list:
+                    try:
+                        setattr(kmi_props, attr, value)
+                        continue
+                    except Exception:
+                        pass
+                _kmi_props_setattr(kmi_props, attr, value)
 
 
 def keyconfig_init_from_data(kc, keyconfig_data):
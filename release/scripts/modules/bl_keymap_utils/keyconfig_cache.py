@@ -0,0 +1,135 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Cache of generated key-configuration data.
+#
+# Executing the key-map data modules (thousands of lines) is slow compared
+# to loading the data they generate, which only changes when the module
+# sources or the key-configuration preferences change.
+
+__all__ = (
+    "keyconfig_data_cached",
+)
+
+CACHE_VERSION = 1
+
+# Entries kept for each key-configuration,
+# so switching preferences back and forth doesn't regenerate the data.
+CACHE_ENTRIES_MAX = 4
+
+
+def _cache_filepath(name):
+    import os
+    import bpy
+    path = bpy.utils.user_resource('CONFIG')
+    if not path:
+        return None
+    return os.path.join(path, "keyconfig_%s.cache" % name)
+
+
+def _source_hash(filepaths):
+    from hashlib import sha1
+    hash_data = sha1()
+    for filepath in filepaths:
+        with open(filepath, "rb") as fh:
+            hash_data.update(fh.read())
+    return hash_data.hexdigest()
+
+
+def _cache_load(filepath):
+    import sys
+    import pickle
+    from bpy.app import version_file
+    try:
+        with open(filepath, "rb") as fh:
+            version, python_version, blender_version, entries = pickle.load(fh)
+    except FileNotFoundError:
+        return {}
+    except Exception as ex:
+        print("Error reading key-map cache:", repr(filepath), ex)
+        return {}
+    if (
+            version != CACHE_VERSION or
+            python_version != sys.version_info[:2] or
+            blender_version != tuple(version_file)
+    ):
+        return {}
+    return entries
+
+
+def _cache_save(filepath, entries):
+    import os
+    import sys
+    import pickle
+    from bpy.app import version_file
+    filepath_tmp = filepath + "@"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath_tmp, "wb") as fh:
+            pickle.dump(
+                (CACHE_VERSION, sys.version_info[:2], tuple(version_file), entries),
+                fh,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(filepath_tmp, filepath)
+    except Exception as ex:
+        print("Error writing key-map cache:", repr(filepath), ex)
+
+
+def keyconfig_data_cached(name, filepaths, params, generate_fn):
+    """
+    Return key-configuration data, loaded from the cache when
+    the source files and parameters are unchanged since it was generated.
+
+    :arg name: The key-configuration name, used for the cache file.
+    :type name: string
+    :arg filepaths: The files the data is generated from.
+    :type filepaths: sequence of strings
+    :arg params: The values the data is generated from
+       (the key-configuration preferences), must be hashable.
+    :type params: tuple
+    :arg generate_fn: Generates the data, called when it's not cached.
+    :type generate_fn: function
+    :return: The key-configuration data, see ``bl_keymap_utils.io``.
+    :rtype: list
+    """
+    filepath = _cache_filepath(name)
+    if filepath is None:
+        return generate_fn()
+
+    try:
+        key = (_source_hash(filepaths), params)
+    except OSError as ex:
+        print("Error reading key-map source:", ex)
+        return generate_fn()
+
+    entries = _cache_load(filepath)
+    keyconfig_data = entries.get(key)
+    if keyconfig_data is not None:
+        return keyconfig_data
+
+    keyconfig_data = generate_fn()
+
+    entries[key] = keyconfig_data
+    while len(entries) > CACHE_ENTRIES_MAX:
+        del entries[next(iter(entries))]
+    _cache_save(filepath, entries)
+
+    return keyconfig_data
@@ -0,0 +1,471 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8-80 compliant>
+
+"""
+Lazy registration of the startup packages (``bl_operators`` & ``bl_ui``).
+
+In background mode the user interface is never drawn, so importing every
+module of these packages and registering all their classes at startup
+is mostly wasted time. When enabled, each module is imported and registered
+the first time one of its classes is accessed, as ``bpy.ops.{module}.{func}``
+or ``bpy.types.{name}``, using a manifest of the classes each module registers.
+
+The manifest is read from the module sources without importing them
+and stored in the user configuration, so it's only updated for modified files.
+
+Blender also looks up some classes by name, without accessing ``bpy.types``,
+such as the parent panel of a panel (``bl_parent_id``).
+``bpy.utils.register_class`` registers deferred parent panels first.
+
+Enable by setting the environment variable ``BLENDER_LAZY_REGISTER=1``
+when running in background mode.
+"""
+
+__all__ = (
+    "ensure",
+    "ensure_all",
+    "is_enabled",
+    "manifest_from_source",
+    "package_modules_imported",
+    "package_register",
+    "package_unregister",
+)
+
+import bpy as _bpy
+
+# Persistent manifest cache, see '_manifest_cache_load'.
+_manifest_cache = None
+_manifest_cache_version = 1
+
+# Modules which aren't registered yet, keyed by package name:
+# '(modules_loaded, {module_name: manifest, ...})'.
+_packages_lazy = {}
+
+# Map 'bpy.types' identifiers of classes which aren't registered yet
+# to their '(package, module_name)'.
+_types_lazy = {}
+
+# The original 'bpy.types', before '_TypesLazy' replaces it.
+_types_orig = None
+
+# The original 'bpy.utils.register_class',
+# before '_register_class_lazy' replaces it.
+_register_class_orig = None
+
+
+def is_enabled():
+    """
+    :return: True when startup packages should register their modules lazily.
+    :rtype: bool
+    """
+    import os
+    return (
+        _bpy.app.background and
+        os.environ.get("BLENDER_LAZY_REGISTER", "0") not in {"", "0"}
+    )
+
+
+def _operator_type_name(idname):
+    # 'module.func' -> 'MODULE_OT_func', matching 'bpy.types'.
+    module, func = idname.split(".", 1)
+    return module.upper() + "_OT_" + func
+
+
+def manifest_from_source(filepath):
+    """
+    Read the classes a module registers from its source, without importing it.
+
+    :arg filepath: The module file.
+    :type filepath: string
+    :return: ``(type_names, operator_names, parent_names)`` tuples,
+       where ``type_names`` are ``bpy.types`` identifiers,
+       ``operator_names`` are ``bpy.ops`` identifiers and
+       ``parent_names`` are identifiers of the parent panels.
+       None when the classes can't be found, such as classes that are
+       generated when the module is imported.
+    :rtype: tuple or None
+    """
+    import ast
+
+    with open(filepath, "r", encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filepath)
+
+    class_defs = {}
+    classes = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            class_defs[node.name] = node
+        elif isinstance(node, (ast.Assign, ast.AugAssign)):
+            targets = (
+                node.targets if isinstance(node, ast.Assign) else
+                (node.target,)
+            )
+            if not any(
+                    isinstance(target, ast.Name) and target.id == "classes"
+                    for target in targets
+            ):
+                continue
+            if (
+                    classes is not None or
+                    isinstance(node, ast.AugAssign) or
+                    not isinstance(node.value, (ast.Tuple, ast.List))
+            ):
+                return None
+            classes = node.value.elts
+
+    if classes is None:
+        return None
+
+    def class_attr(node, attr):
+        # Return the string value of a class attribute (searching base classes
+        # defined in this module) or None when it's not found.
+        # Raise a 'ValueError' for values which aren't constant.
+        for item in node.body:
+            if isinstance(item, ast.Assign) and any(
+                    isinstance(target, ast.Name) and target.id == attr
+                    for target in item.targets
+            ):
+                if (
+                        isinstance(item.value, ast.Constant) and
+                        isinstance(item.value.value, str)
+                ):
+                    return item.value.value
+                raise ValueError(attr)
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                base_node = class_defs.get(base.id)
+                if base_node is not None and base_node is not node:
+                    value = class_attr(base_node, attr)
+                    if value is not None:
+                        return value
+        return None
+
+    type_names = []
+    operator_names = []
+    parent_names = []
+    for elt in classes:
+        if not isinstance(elt, ast.Name):
+            return None
+        node = class_defs.get(elt.id)
+        if node is None:
+            return None
+        try:
+            idname = class_attr(node, "bl_idname")
+            parent_id = class_attr(node, "bl_parent_id")
+        except ValueError:
+            return None
+
+        if idname is None:
+            type_names.append(node.name)
+        elif "." in idname:
+            operator_names.append(idname)
+            type_names.append(_operator_type_name(idname))
+        else:
+            type_names.append(idname)
+        if parent_id is not None:
+            parent_names.append(parent_id)
+
+    return tuple(type_names), tuple(operator_names), tuple(parent_names)
+
+
+def _manifest_cache_filepath():
+    import os
+    path = _bpy.utils.user_resource('CONFIG')
+    if not path:
+        return None
+    return os.path.join(path, "startup_manifest.cache")
+
+
+def _manifest_cache_load():
+    # Map module file paths to '(mtime, size, manifest)',
+    # so unchanged modules don't need to be parsed on every startup.
+    global _manifest_cache
+    if _manifest_cache is not None:
+        return _manifest_cache
+
+    import sys
+    _manifest_cache = {}
+    filepath = _manifest_cache_filepath()
+    if filepath is None:
+        return _manifest_cache
+    try:
+        import pickle
+        with open(filepath, "rb") as fh:
+            version, python_version, cache = pickle.load(fh)
+    except FileNotFoundError:
+        return _manifest_cache
+    except Exception as ex:
+        if _bpy.app.debug_python:
+            print("Error reading startup manifest:", repr(filepath), ex)
+        return _manifest_cache
+
+    if (
+            version == _manifest_cache_version and
+            python_version == sys.version_info[:2]
+    ):
+        _manifest_cache = cache
+    return _manifest_cache
+
+
+def _manifest_cache_save():
+    import os
+    import sys
+    import pickle
+    filepath = _manifest_cache_filepath()
+    if filepath is None:
+        return
+    filepath_tmp = filepath + "@"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath_tmp, "wb") as fh:
+            pickle.dump(
+                (
+                    _manifest_cache_version,
+                    sys.version_info[:2],
+                    _manifest_cache,
+                ),
+                fh,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(filepath_tmp, filepath)
+    except Exception as ex:
+        if _bpy.app.debug_python:
+            print("Error writing startup manifest:", repr(filepath), ex)
+
+
+def _manifest_get(filepath):
+    # Return the manifest of a module file,
+    # parsing it only when it's not in the cache or has been modified.
+    # The second return value is true when the cache was updated.
+    import os
+    cache = _manifest_cache_load()
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None, False
+    cache_item = cache.get(filepath)
+    if (
+            cache_item is not None and
+            cache_item[0] == st.st_mtime and
+            cache_item[1] == st.st_size
+    ):
+        return cache_item[2], False
+
+    try:
+        manifest = manifest_from_source(filepath)
+    except Exception as ex:
+        if _bpy.app.debug_python:
+            print("Error reading classes from:", repr(filepath), ex)
+        manifest = None
+    cache[filepath] = (st.st_mtime, st.st_size, manifest)
+    return manifest, True
+
+
+class _TypesLazy:
+    # Replaces 'bpy.types', registering the classes of deferred modules
+    # the first time they're accessed.
+    __slots__ = ()
+
+    def __getattr__(self, attr):
+        try:
+            return getattr(_types_orig, attr)
+        except AttributeError:
+            item = _types_lazy.get(attr)
+            if item is None:
+                raise
+        ensure(*item)
+        return getattr(_types_orig, attr)
+
+    def __dir__(self):
+        return list(set(dir(_types_orig)).union(_types_lazy))
+
+
+def _register_class_lazy(cls):
+    # Blender looks up the parent panel by name when registering a panel,
+    # a deferred parent (from any script or add-on) must be registered first.
+    parent_id = getattr(cls, "bl_parent_id", None)
+    if isinstance(parent_id, str):
+        item = _types_lazy.get(parent_id)
+        if item is not None:
+            ensure(*item)
+    _register_class_orig(cls)
+
+
+def _types_lazy_install():
+    global _types_orig, _register_class_orig
+    if _types_orig is not None:
+        return
+    import sys
+    _types_orig = _bpy.types
+    _bpy.types = sys.modules["bpy.types"] = _TypesLazy()
+
+    _register_class_orig = _bpy.utils.register_class
+    _bpy.utils.register_class = _register_class_lazy
+
+
+def package_modules_imported(package, module_names):
+    """
+    :arg package: The package name, such as ``bl_ui``.
+    :type package: string
+    :arg module_names: Names of the package modules.
+    :type module_names: sequence of strings
+    :return: The package modules which have already been imported.
+    :rtype: list of modules
+    """
+    import sys
+    return [
+        mod for mod in (
+            sys.modules.get(package + "." + module_name)
+            for module_name in module_names
+        )
+        if mod is not None
+    ]
+
+
+def package_register(package, module_names, modules_loaded):
+    """
+    Defer loading the modules of a package which aren't loaded yet,
+    modules which can't be deferred are imported and added
+    to ``modules_loaded``, for the package to register.
+
+    :arg package: The package name, such as ``bl_ui``.
+    :type package: string
+    :arg module_names: Names of the package modules.
+    :type module_names: sequence of strings
+    :arg modules_loaded: The packages loaded modules,
+       modules are added when they're loaded.
+    :type modules_loaded: list of modules
+    """
+    import os
+    import sys
+    from functools import partial
+    from bpy import ops as _ops
+
+    _types_lazy_install()
+
+    package_dir = os.path.dirname(sys.modules[package].__file__)
+    module_names_loaded = {
+        mod.__name__.rpartition(".")[2] for mod in modules_loaded
+    }
+    modules_lazy = {}
+    cache_changed = False
+    for module_name in module_names:
+        if module_name in module_names_loaded:
+            continue
+        manifest, changed = _manifest_get(
+            os.path.join(package_dir, module_name + ".py")
+        )
+        cache_changed |= changed
+        if manifest is None:
+            modules_loaded.append(
+                __import__(package + "." + module_name, fromlist=["classes"])
+            )
+            continue
+
+        modules_lazy[module_name] = manifest
+        item = package, module_name
+        item_ensure = partial(ensure, package, module_name)
+        type_names, operator_names, _parent_names = manifest
+        for name in type_names:
+            _types_lazy[name] = item
+        for name in operator_names:
+            _ops._op_lazy[name] = item_ensure
+
+    _packages_lazy[package] = modules_loaded, modules_lazy
+
+    if cache_changed:
+        _manifest_cache_save()
+
+    if _bpy.app.debug_python:
+        print(
+            "Lazy register %s: %d deferred modules" %
+            (package, len(modules_lazy))
+        )
+
+
+def package_unregister(package):
+    """
+    Discard deferred modules of a package,
+    the package unregisters the modules which are loaded.
+
+    :arg package: The package name, such as ``bl_ui``.
+    :type package: string
+    """
+    from bpy import ops as _ops
+    _modules_loaded, modules_lazy = _packages_lazy.pop(package, (None, {}))
+    for type_names, operator_names, _parent_names in modules_lazy.values():
+        for name in type_names:
+            _types_lazy.pop(name, None)
+        for name in operator_names:
+            _ops._op_lazy.pop(name, None)
+
+
+def ensure(package, module_name):
+    """
+    Import and register a deferred module,
+    does nothing when the module isn't deferred.
+
+    :arg package: The package name, such as ``bl_ui``.
+    :type package: string
+    :arg module_name: The module name within the package.
+    :type module_name: string
+    """
+    from bpy import ops as _ops
+    from bpy.utils import register_class
+
+    package_data = _packages_lazy.get(package)
+    if package_data is None:
+        return
+    modules_loaded, modules_lazy = package_data
+    manifest = modules_lazy.pop(module_name, None)
+    if manifest is None:
+        return
+
+    type_names, operator_names, parent_names = manifest
+    for name in type_names:
+        del _types_lazy[name]
+    for name in operator_names:
+        del _ops._op_lazy[name]
+
+    # Parent panels must be registered first.
+    for name in parent_names:
+        item = _types_lazy.get(name)
+        if item is not None:
+            ensure(*item)
+
+    if _bpy.app.debug_python:
+        print("Lazy register: %s.%s" % (package, module_name))
+
+    mod = __import__(package + "." + module_name, fromlist=["classes"])
+    modules_loaded.append(mod)
+    for cls in mod.classes:
+        register_class(cls)
+
+
+def ensure_all():
+    """
+    Import and register all deferred modules,
+    needed when the user interface is accessed as a whole.
+    """
+    for package, (_modules_loaded, modules_lazy) in list(
+            _packages_lazy.items()
+    ):
+        for module_name in list(modules_lazy):
+            ensure(package, module_name)
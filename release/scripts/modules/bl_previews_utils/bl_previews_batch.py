@@ -0,0 +1,235 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Run 'bl_previews_render.py' over many .blend files,
+# in several background Blender processes at once.
+#
+# Processed files are stored in a manifest (one JSON line per file),
+# so files which weren't modified since can be skipped,
+# and an interrupted batch continues where it stopped.
+
+import os
+
+MANIFEST_VERSION = 1
+
+# Arguments which don't change the previews stored in the file.
+ARGS_IGNORE = {"--no_backups"}
+
+
+def manifest_filepath():
+    import bpy
+    path = bpy.utils.user_resource('CONFIG')
+    if not path:
+        return None
+    return os.path.join(path, "previews_batch_manifest.jsonl")
+
+
+class Manifest:
+    """
+    Files processed by the previews script, with their modification time and
+    size once processed, and the arguments they were processed with.
+    """
+    __slots__ = (
+        "filepath",
+        "entries",
+        "_fh",
+    )
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.entries = {}
+        self._fh = None
+
+        if filepath is None:
+            return
+
+        import json
+        lines_num = 0
+        try:
+            with open(filepath, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    lines_num += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Likely a line only partially written when interrupted.
+                        continue
+                    if entry.get("version") == MANIFEST_VERSION:
+                        self.entries[entry["path"]] = entry
+        except FileNotFoundError:
+            pass
+        except OSError as ex:
+            print("Error reading previews manifest:", repr(filepath), ex)
+
+        # Files processed again add lines, rewrite when most are outdated.
+        if lines_num > 2 * len(self.entries) + 64:
+            self._write_all()
+
+    def _write_all(self):
+        import json
+        filepath_tmp = self.filepath + "@"
+        try:
+            with open(filepath_tmp, "w", encoding="utf-8") as fh:
+                for entry in self.entries.values():
+                    fh.write(json.dumps(entry) + "\n")
+            os.replace(filepath_tmp, self.filepath)
+        except OSError as ex:
+            print("Error writing previews manifest:", repr(self.filepath), ex)
+
+    @staticmethod
+    def _args_key(args):
+        return sorted(arg for arg in args if arg not in ARGS_IGNORE)
+
+    def is_processed(self, blen_path, args):
+        """
+        Return True when the file wasn't modified since it was processed
+        with the same arguments.
+        """
+        entry = self.entries.get(os.path.abspath(blen_path))
+        if entry is None or entry["args"] != self._args_key(args):
+            return False
+        try:
+            st = os.stat(blen_path)
+        except OSError:
+            return False
+        return entry["mtime"] == st.st_mtime and entry["size"] == st.st_size
+
+    def add(self, blen_path, args):
+        """
+        Store a file as processed, written to the manifest at once.
+        """
+        import json
+        try:
+            st = os.stat(blen_path)
+        except OSError:
+            return
+        entry = {
+            "version": MANIFEST_VERSION,
+            "path": os.path.abspath(blen_path),
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+            "args": self._args_key(args),
+        }
+        self.entries[entry["path"]] = entry
+
+        if self.filepath is None:
+            return
+        try:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+                self._fh = open(self.filepath, "a", encoding="utf-8")
+            self._fh.write(json.dumps(entry) + "\n")
+            self._fh.flush()
+        except OSError as ex:
+            print("Error writing previews manifest:", repr(self.filepath), ex)
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def command(blen_path, args, *, use_trusted=False):
+    import bpy
+    cmd = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        "-noaudio",
+    ]
+    if use_trusted:
+        cmd.append("--enable-autoexec")
+    cmd.extend([
+        blen_path,
+        "--python",
+        os.path.join(os.path.dirname(__file__), "bl_previews_render.py"),
+        "--",
+    ])
+    cmd.extend(args)
+    return cmd
+
+
+def process(
+        blen_paths,
+        args,
+        *,
+        use_trusted=False,
+        use_skip_unchanged=False,
+        processes=1,
+        progress_update=None,
+):
+    """
+    Run the previews script for each file, with up to ``processes``
+    Blender processes at once.
+
+    Once a file fails no more files are started, returns the failed file or None.
+    ``progress_update`` is called with the number of files done.
+    """
+    import subprocess
+    import time
+    from collections import deque
+
+    manifest = Manifest(manifest_filepath())
+
+    blen_paths_todo = deque()
+    done = 0
+    for blen_path in blen_paths:
+        if use_skip_unchanged and manifest.is_processed(blen_path, args):
+            done += 1
+        else:
+            blen_paths_todo.append(blen_path)
+
+    if progress_update is not None:
+        progress_update(done)
+
+    # Map running processes to their file.
+    running = {}
+    blen_path_failed = None
+    try:
+        while blen_paths_todo or running:
+            while blen_paths_todo and len(running) < processes and blen_path_failed is None:
+                blen_path = blen_paths_todo.popleft()
+                running[subprocess.Popen(command(blen_path, args, use_trusted=use_trusted))] = blen_path
+
+            if not running:
+                break
+
+            for proc in [proc for proc in running if proc.poll() is not None]:
+                blen_path = running.pop(proc)
+                if proc.returncode:
+                    if blen_path_failed is None:
+                        blen_path_failed = blen_path
+                    continue
+                manifest.add(blen_path, args)
+                done += 1
+                if progress_update is not None:
+                    progress_update(done)
+
+            if running:
+                time.sleep(0.05)
+    finally:
+        # Don't leave processes running when interrupted.
+        for proc in running:
+            proc.kill()
+        for proc in running:
+            proc.wait()
+        manifest.close()
+
+    return blen_path_failed
@@ -0,0 +1,267 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8-80 compliant>
+
+"""
+Timing of the scripts loaded by ``bpy.utils.load_scripts``.
+
+Records the import time of each startup module, the time of each modules
+``register`` function, each class registration and each add-on enabled.
+
+Enabled by ``--debug-python`` or by setting the environment variable
+``BLENDER_STARTUP_PROFILE``, to ``1`` to print the report,
+or to a file path to also write the report there as JSON.
+"""
+
+__all__ = (
+    "begin",
+    "end",
+    "is_enabled",
+    "is_recording",
+    "record_addon",
+    "record_import",
+    "record_register",
+    "report",
+    "report_print",
+    "report_write",
+)
+
+import bpy as _bpy
+from time import perf_counter as _time
+
+# Lists of records by category, None when disabled.
+_records = None
+
+# True between 'begin' and 'end', nothing is recorded outside of this.
+_recording = False
+
+# Time 'begin' was called.
+_time_begin = 0.0
+# Time between 'begin' and 'end'.
+_time_total = 0.0
+
+# The 'register_class' function wrapped while profiling.
+_register_class_orig = None
+
+
+def _env_value():
+    import os
+    value = os.environ.get("BLENDER_STARTUP_PROFILE", "")
+    return "" if value == "0" else value
+
+
+def is_enabled():
+    """
+    :return: True when startup scripts are profiled.
+    :rtype: bool
+    """
+    return _records is not None
+
+
+def is_recording():
+    """
+    :return: True while startup scripts are loading and being profiled.
+    :rtype: bool
+    """
+    return _recording
+
+
+def _records_new():
+    return {
+        "imports": [],
+        "registers": [],
+        "classes": [],
+        "addons": [],
+    }
+
+
+def _register_class_timed(cls):
+    if not _recording:
+        return _register_class_orig(cls)
+    t = _time()
+    try:
+        _register_class_orig(cls)
+    finally:
+        _records["classes"].append((cls.__module__, cls.__name__, _time() - t))
+
+
+def begin():
+    """
+    Clear all records, called when scripts start loading.
+    """
+    global _records, _recording, _time_begin, _register_class_orig
+
+    _records = _records_new()
+    _recording = True
+
+    # Time classes registered through 'bpy.utils.register_class'
+    # (directly or from 'register_classes_factory'), until 'end' is called.
+    if _bpy.utils.register_class is not _register_class_timed:
+        _register_class_orig = _bpy.utils.register_class
+        _bpy.utils.register_class = _register_class_timed
+
+    _time_begin = _time()
+
+
+def end():
+    """
+    Report the timing, called once scripts have been loaded.
+    Classes and add-ons registered afterwards are not recorded.
+    """
+    global _recording, _time_total
+
+    if not _recording:
+        return
+    _recording = False
+    _time_total = _time() - _time_begin
+
+    if _bpy.utils.register_class is _register_class_timed:
+        _bpy.utils.register_class = _register_class_orig
+
+    report_print()
+
+    filepath = _env_value()
+    if filepath and filepath != "1":
+        report_write(filepath)
+
+
+def record_import(module_name, time_import):
+    """
+    Record the time a startup module took to import.
+    """
+    if _recording:
+        _records["imports"].append((module_name, time_import))
+
+
+def record_register(module_name, time_register):
+    """
+    Record the time of a startup modules ``register`` function.
+    """
+    if _recording:
+        _records["registers"].append((module_name, time_register))
+
+
+def record_addon(module_name, time_import, time_register):
+    """
+    Record the time enabling an add-on took.
+    """
+    if _recording:
+        _records["addons"].append((module_name, time_import, time_register))
+
+
+def report():
+    """
+    :return: The recorded times in seconds, sorted slowest first,
+       in a dictionary which can be written as JSON.
+    :rtype: dict
+    """
+    if _records is None:
+        return {}
+
+    def sort_by_time(items):
+        return sorted(items, key=lambda item: item["time"], reverse=True)
+
+    return {
+        "version": _bpy.app.version_string,
+        "time": _time_total,
+        "imports": sort_by_time(
+            {"module": module_name, "time": t}
+            for module_name, t in _records["imports"]
+        ),
+        "registers": sort_by_time(
+            {"module": module_name, "time": t}
+            for module_name, t in _records["registers"]
+        ),
+        "classes": sort_by_time(
+            {"module": module_name, "class": class_name, "time": t}
+            for module_name, class_name, t in _records["classes"]
+        ),
+        "addons": sort_by_time(
+            {
+                "module": module_name,
+                "time": t_import + t_register,
+                "time_import": t_import,
+                "time_register": t_register,
+            }
+            for module_name, t_import, t_register in _records["addons"]
+        ),
+    }
+
+
+def report_print(limit=20):
+    """
+    Print a table of the slowest items of each category.
+
+    :arg limit: The maximum number of items to print for each category.
+    :type limit: int
+    """
+    data = report()
+    if not data:
+        return
+
+    print("Python startup profile: %.4f" % data["time"])
+    for category, label in (
+            ("imports", "Module imports"),
+            ("registers", "Module register() calls"),
+            ("classes", "Class registration"),
+            ("addons", "Add-ons enabled"),
+    ):
+        items = data[category]
+        if not items:
+            continue
+        print(
+            "  %s: %d, %.4f" %
+            (label, len(items), sum(item["time"] for item in items))
+        )
+        for item in items[:limit]:
+            if category == "classes":
+                name = "%s.%s" % (item["module"], item["class"])
+            else:
+                name = item["module"]
+            if category == "addons":
+                print(
+                    "    %.4f  %s (import %.4f, register %.4f)" %
+                    (
+                        item["time"],
+                        name,
+                        item["time_import"],
+                        item["time_register"],
+                    )
+                )
+            else:
+                print("    %.4f  %s" % (item["time"], name))
+
+
+def report_write(filepath):
+    """
+    Write the report as JSON.
+
+    :arg filepath: The file to write.
+    :type filepath: string
+    """
+    import json
+    try:
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(report(), fh, indent=1)
+    except OSError as ex:
+        print("Error writing startup profile:", repr(filepath), ex)
+
+
+if _bpy.app.debug_python or _env_value():
+    _records = _records_new()
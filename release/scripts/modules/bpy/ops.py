@@ -31,6 +31,10 @@ _op_get_bl_options = _ops_module.get_bl_options
 
 _ModuleType = type(_ops_module)
 
+# Operators registered on first access, see: `bl_lazy_register_utils`.
+# Maps Python operator identifiers ("module.func") to their register function.
+_op_lazy = {}
+
 
 # -----------------------------------------------------------------------------
 # Callable Operator Wrapper
@@ -159,6 +163,10 @@ def _bpy_ops_submodule__getattr__(module, func):
     # Return a value from `bpy.ops.{module}.{func}`
     if func.startswith("__"):
         raise AttributeError(func)
+    if _op_lazy:
+        register = _op_lazy.get(module + "." + func)
+        if register is not None:
+            register()
     return _BPyOpsSubModOp(module, func)
 
 
@@ -171,6 +179,11 @@ def _bpy_ops_submodule__dir__(module):
         if len(id_split) == 2 and module_upper == id_split[0]:
             functions.add(id_split[1])
 
+    for id_name in _op_lazy:
+        id_split = id_name.split(".", 1)
+        if module == id_split[0]:
+            functions.add(id_split[1])
+
     return list(functions)
 
 
@@ -201,4 +214,7 @@ def __dir__():
         else:
             submodules.add(id_split[0])
 
+    for id_name in _op_lazy:
+        submodules.add(id_name.split(".", 1)[0])
+
     return list(submodules)
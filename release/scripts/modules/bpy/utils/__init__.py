@@ -75,6 +75,7 @@ import os as _os
 import sys as _sys
 
 import addon_utils as _addon_utils
+import bl_startup_profile_utils as _startup_profile
 
 _preferences = _bpy.context.preferences
 _script_module_dirs = "startup", "modules"
@@ -95,6 +96,7 @@ def execfile(filepath, mod=None):
 
 def _test_import(module_name, loaded_modules):
     use_time = _bpy.app.debug_python
+    use_profile = _startup_profile.is_recording()
 
     if module_name in loaded_modules:
         return None
@@ -103,9 +105,9 @@ def _test_import(module_name, loaded_modules):
               "multiple periods" % module_name)
         return None
 
-    if use_time:
+    if use_time or use_profile:
         import time
-        t = time.time()
+        t = time.perf_counter()
 
     try:
         mod = __import__(module_name)
@@ -114,8 +116,11 @@ def _test_import(module_name, loaded_modules):
         traceback.print_exc()
         return None
 
-    if use_time:
-        print("time %s %.4f" % (module_name, time.time() - t))
+    if use_time or use_profile:
+        t = time.perf_counter() - t
+        if use_time:
+            print("time %s %.4f" % (module_name, t))
+        _startup_profile.record_import(module_name, t)
 
     loaded_modules.add(mod.__name__)  # should match mod.__name__ too
     return mod
@@ -171,11 +176,16 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     """
     use_time = use_class_register_check = _bpy.app.debug_python
     use_user = not _is_factory_startup
+    use_profile = _startup_profile.is_enabled()
 
     if use_time:
         import time
         t_main = time.time()
 
+    if use_profile:
+        from time import perf_counter
+        _startup_profile.begin()
+
     loaded_modules = set()
 
     if refresh_scripts:
@@ -192,11 +202,17 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     def register_module_call(mod):
         register = getattr(mod, "register", None)
         if register:
+            if use_profile:
+                t = perf_counter()
             try:
                 register()
             except:
                 import traceback
                 traceback.print_exc()
+            if use_profile:
+                _startup_profile.record_register(
+                    mod.__name__, perf_counter() - t,
+                )
         else:
             print("\nWarning! '%s' has no register function, "
                   "this is now a requirement for registerable scripts" %
@@ -293,6 +309,9 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     if use_time:
         print("Python Script Load Time %.4f" % (time.time() - t_main))
 
+    if use_profile:
+        _startup_profile.end()
+
     if use_class_register_check:
         for cls in _bpy.types.bpy_struct.__subclasses__():
             if getattr(cls, "is_registered", False):
@@ -791,6 +810,11 @@ def register_tool(tool_cls, *, after=None, separator=False, group=False):
         ToolDef,
     )
 
+    # The toolbar classes may not be loaded yet in background mode.
+    import bl_lazy_register_utils
+    bl_lazy_register_utils.ensure("bl_ui", "space_toolsystem_toolbar")
+    del bl_lazy_register_utils
+
     cls = ToolSelectPanelHelper._tool_class_from_space_type(space_type)
     if cls is None:
         raise Exception("Space type %r has no toolbar" % space_type)
@@ -975,12 +999,27 @@ def unregister_tool(tool_cls):
 # Manual lookups, each function has to return a basepath and a sequence
 # of...
 
+# The language and result of '_blender_default_map',
+# so the module isn't imported again for each lookup.
+_blender_default_map_cache = None
+
+
 # we start with the built-in default mapping
 def _blender_default_map():
+    global _blender_default_map_cache
+    # The URL prefix depends on the language.
+    language = _preferences.view.language
+    if (
+            _blender_default_map_cache is not None and
+            _blender_default_map_cache[0] == language
+    ):
+        return _blender_default_map_cache[1]
+
     import rna_manual_reference as ref_mod
     ret = (ref_mod.url_manual_prefix, ref_mod.url_manual_mapping)
-    # avoid storing in memory
+    # avoid storing the module in memory
     del _sys.modules["rna_manual_reference"]
+    _blender_default_map_cache = (language, ret)
     return ret
 
 
@@ -67,8 +67,8 @@ def bake_action_objects(
     """
     A version of :func:`bake_action_objects_iter` that takes frames and returns the output.
 
-    :arg frames: Frames to bake.
-    :type frames: iterable of int
+    :arg frames: Frames to bake, fractional frames are baked at sub-frames.
+    :type frames: iterable of int or float
 
     :return: A sequence of Action or None types (aligned with `object_action_pairs`)
     :rtype: sequence of :class:`bpy.types.Action`
@@ -91,6 +91,8 @@ def bake_action_objects_iter(
        action is the destination for the baked data. When None a new action will be created.
     :type object_action_pairs: Sequence of (:class:`bpy.types.Object`, :class:`bpy.types.Action`)
     """
+    from math import floor
+
     scene = bpy.context.scene
     frame_back = scene.frame_current
     iter_all = tuple(
@@ -103,14 +105,205 @@ def bake_action_objects_iter(
         frame = yield None
         if frame is None:
             break
-        scene.frame_set(frame)
-        bpy.context.view_layer.update()
+        # Evaluates the depsgraph once for all objects.
+        frame_int = floor(frame)
+        scene.frame_set(frame_int, subframe=frame - frame_int)
         for iter in iter_all:
             iter.send(frame)
     scene.frame_set(frame_back)
     yield tuple(iter.send(None) for iter in iter_all)
 
 
+# Minimal distance between baked frames, so that 'keyframe_insert' doesn't replace previous keyframes.
+_BAKE_FRAME_THRESHOLD = 0.02
+# Number of frames of pose samples stored together, then written to F-Curves at once.
+_BAKE_CHUNK_FRAMES = 256
+
+
+def _keyframes_clean_keep(values, values_orig=()):
+    # Indices of the keyframes kept when removing redundant ones,
+    # as successive calls to 'keyframe_points.remove' would do.
+    # Keyframes which values are in 'values_orig' are always kept.
+    num = len(values)
+    keep = [0]
+    for i in range(1, num - 1):
+        val = values[i]
+        if val not in values_orig:
+            val_prev = values[keep[-1]]
+            val_next = values[i + 1]
+            if abs(val - val_prev) + abs(val - val_next) < 0.0001:
+                continue
+        keep.append(i)
+    if num > 1:
+        keep.append(num - 1)
+    return keep
+
+
+def _fcurve_keyframes_write(fcu, frames, values):
+    # Append keyframes to an F-Curve only containing keyframes inserted by 'keyframe_insert' or this function,
+    # using the same settings as its first keyframe.
+    from array import array
+
+    keyframe_points = fcu.keyframe_points
+    keyframe_first = keyframe_points[0]
+    num_prev = len(keyframe_points)
+    num = num_prev + len(frames)
+
+    co_new = array('f', (0.0,)) * (len(frames) * 2)
+    co_new[0::2] = array('f', frames)
+    co_new[1::2] = array('f', values)
+    co = array('f', (0.0,)) * (num_prev * 2)
+    keyframe_points.foreach_get("co", co)
+    co.extend(co_new)
+    # Same initial handles as 'keyframe_insert', only kept as is by 'FREE' handles.
+    handles_new = co_new[:]
+    handles_new[0::2] = array('f', (frame - 1.0 for frame in frames))
+    handles_left = array('f', (0.0,)) * (num_prev * 2)
+    keyframe_points.foreach_get("handle_left", handles_left)
+    handles_left.extend(handles_new)
+    handles_new[0::2] = array('f', (frame + 1.0 for frame in frames))
+    handles_right = array('f', (0.0,)) * (num_prev * 2)
+    keyframe_points.foreach_get("handle_right", handles_right)
+    handles_right.extend(handles_new)
+
+    keyframe_points.add(len(frames))
+    keyframe_points.foreach_set("co", co)
+    keyframe_points.foreach_set("handle_left", handles_left)
+    keyframe_points.foreach_set("handle_right", handles_right)
+    for attr in ("back", "amplitude", "period"):
+        keyframe_points.foreach_set(attr, array('f', (getattr(keyframe_first, attr),)) * num)
+
+    # Enums can't be written with 'foreach_set', these only differ from the defaults of
+    # 'keyframe_points.add' when preferences use other interpolation or handle types.
+    settings = {
+        attr: getattr(keyframe_first, attr)
+        for attr in ("interpolation", "handle_left_type", "handle_right_type", "easing", "type")
+    }
+    keyframe_added = keyframe_points[num_prev]
+    settings = {attr: value for attr, value in settings.items() if getattr(keyframe_added, attr) != value}
+    if settings:
+        for keyframe in keyframe_points[num_prev:]:
+            for attr, value in settings.items():
+                setattr(keyframe, attr, value)
+
+
+class _BakeKeyframes:
+    """
+    Keyframes of the properties of a single object or pose bone, baked over increasing frames.
+
+    The first and last keyframes of each F-Curve are inserted with ``keyframe_insert``,
+    which creates F-Curves and their group as usual, keyframes in between are written at once by ``flush``.
+    F-Curves which already have keyframes (or all of them when ``use_bulk`` is False)
+    get all their keyframes inserted with ``keyframe_insert``.
+    """
+    __slots__ = (
+        "action",
+        "struct",
+        "group",
+        "use_bulk",
+        "channels",
+    )
+
+    def __init__(self, action, struct, group, use_bulk):
+        self.action = action
+        self.struct = struct
+        self.group = group
+        self.use_bulk = use_bulk
+        # Property name: (data_path, (frames, values) of each array index), None when using 'keyframe_insert' only.
+        # The first frame and value are the ones of the last keyframe already in the F-Curve.
+        self.channels = {}
+
+    def _keyframes_len(self, data_path, index):
+        fcu = self.action.fcurves.find(data_path, index=index)
+        return 0 if fcu is None else len(fcu.keyframe_points)
+
+    def _insert_first(self, prop, frame):
+        from array import array
+
+        struct = self.struct
+        value = getattr(struct, prop)
+        value = tuple(value) if hasattr(value, "__len__") else (value,)
+        data_path = struct.path_from_id(prop)
+        indices = range(len(value))
+
+        use_bulk = self.use_bulk and not any(self._keyframes_len(data_path, i) for i in indices)
+        struct.keyframe_insert(prop, index=-1, frame=frame, group=self.group)
+        if not (use_bulk and all(self._keyframes_len(data_path, i) == 1 for i in indices)):
+            return None
+        return data_path, tuple((array('f', (frame,)), array('f', (v,))) for v in value)
+
+    def insert(self, prop, frame):
+        """
+        Key the current value of the given property at the given frame.
+        """
+        channel = self.channels.get(prop, ...)
+        if channel is ...:
+            self.channels[prop] = self._insert_first(prop, frame)
+        elif channel is None:
+            self.struct.keyframe_insert(prop, index=-1, frame=frame, group=self.group)
+        else:
+            _data_path, keys = channel
+            value = getattr(self.struct, prop)
+            if len(keys) == 1:
+                value = (value,)
+            for (frames, values), v in zip(keys, value):
+                frames.append(frame)
+                values.append(v)
+
+    def flush(self, do_clean=False):
+        """
+        Write the keyframes inserted so far, except the last one of each F-Curve,
+        so they don't have to be kept in memory until the end of the bake.
+        """
+        fcurves = self.action.fcurves
+        for channel in self.channels.values():
+            if channel is None:
+                continue
+            data_path, keys = channel
+            for index, (frames, values) in enumerate(keys):
+                if len(frames) < 3:
+                    continue
+                # Values are cleaned as single precision floats, as stored in keyframes.
+                keep = _keyframes_clean_keep(values) if do_clean else range(len(values))
+                # The first keyframe is already written, the last one depends on the next values.
+                write = keep[1:-1]
+                if write:
+                    _fcurve_keyframes_write(
+                        fcurves.find(data_path, index=index),
+                        [frames[i] for i in write],
+                        [values[i] for i in write],
+                    )
+                    last = write[-1]
+                else:
+                    last = 0
+                for array_data in (frames, values):
+                    del array_data[last + 1:-1]
+                    del array_data[:last]
+
+    def finish(self, do_clean=False):
+        """
+        Write the keyframes, must be called while properties still have their values of the last frame.
+
+        :return: F-Curves written by this function (with redundant keyframes already removed when do_clean is set).
+        :rtype: list of :class:`bpy.types.FCurve`
+        """
+        self.flush(do_clean)
+        fcurves = self.action.fcurves
+        fcurves_written = []
+        for prop, channel in self.channels.items():
+            if channel is None:
+                continue
+            data_path, keys = channel
+            frames = keys[0][0]
+            if len(frames) < 2:
+                continue
+            fcurves_written.extend(fcurves.find(data_path, index=index) for index in range(len(keys)))
+            # Inserting the last keyframes also computes handles of all the others.
+            self.struct.keyframe_insert(prop, index=-1, frame=frames[-1], group=self.group)
+        self.channels.clear()
+        return fcurves_written
+
+
 # XXX visual keying is actually always considered as True in this code...
 def bake_action_iter(
         obj,
@@ -150,6 +343,9 @@ def bake_action_iter(
     :return: an action or None
     :rtype: :class:`bpy.types.Action`
     """
+    from array import array
+    from mathutils import Matrix
+
     # -------------------------------------------------------------------------
     # Helper Functions and vars
 
@@ -163,21 +359,20 @@ def bake_action_iter(
         'bbone_easein', 'bbone_easeout'
     ]
 
-    def pose_frame_info(obj):
-        matrix = {}
-        bbones = {}
-        for name, pbone in obj.pose.bones.items():
-            if do_visual_keying:
-                # Get the final transform of the bone in its own local space...
-                matrix[name] = obj.convert_space(pose_bone=pbone, matrix=pbone.matrix,
-                                                 from_space='POSE', to_space='LOCAL')
-            else:
-                matrix[name] = pbone.matrix_basis.copy()
-
-            # Bendy Bones
-            if pbone.bone.bbone_segments > 1:
-                bbones[name] = {bb_prop: getattr(pbone, bb_prop) for bb_prop in BBONE_PROPS}
-        return matrix, bbones
+    def pose_frame_info(matrices, bbones):
+        # Read the matrices of all bones at once, 16 floats (column major) per bone.
+        # With visual keying, these are pose space matrices converted to local space when applied.
+        pose_bones.foreach_get("matrix" if do_visual_keying else "matrix_basis", pose_matrix_buf)
+        matrices.extend(pose_matrix_buf)
+
+        # Bendy Bones
+        if use_bbones:
+            for bb_prop in BBONE_PROPS:
+                pose_bones.foreach_get(bb_prop, pose_bbone_buf)
+                bbones.extend(pose_bbone_buf)
+
+    def pose_matrix_get(matrices, offset):
+        return Matrix([matrices[offset + i:offset + 16:4] for i in range(4)])
 
     if do_parents_clear:
         if do_visual_keying:
@@ -213,6 +408,16 @@ def bake_action_iter(
     if not (do_pose or do_object):
         raise Exception("Pose and object baking is disabled, no action needed")
 
+    if do_pose:
+        pose_bones = obj.pose.bones
+        pose_bones_len = len(pose_bones)
+        pose_matrix_buf = array('f', (0.0,)) * (pose_bones_len * 16)
+        pose_bbone_buf = array('f', (0.0,)) * pose_bones_len
+        use_bbones = any(pbone.bone.bbone_segments > 1 for pbone in pose_bones)
+
+    frames = []
+    # Chunks of '_BAKE_CHUNK_FRAMES' frames: (matrices, bbones) where matrices are (frames x bones x 16) floats,
+    # and bbones (frames x BBONE_PROPS x bones) floats.
     pose_info = []
     obj_info = []
 
@@ -228,9 +433,12 @@ def bake_action_iter(
             break
 
         if do_pose:
-            pose_info.append((frame, *pose_frame_info(obj)))
+            if len(frames) % _BAKE_CHUNK_FRAMES == 0:
+                pose_info.append((array('f'), array('f')))
+            pose_frame_info(*pose_info[-1])
         if do_object:
-            obj_info.append((frame, obj_frame_info(obj)))
+            obj_info.append(obj_frame_info(obj))
+        frames.append(frame)
 
     # -------------------------------------------------------------------------
     # Clean (store initial data)
@@ -262,9 +470,20 @@ def bake_action_iter(
     # -------------------------------------------------------------------------
     # Apply transformations to action
 
+    # Keyframes are written at once, unless 'keyframe_insert' would remap them (NLA tweak mode or blending),
+    # or frames are not increasing (keyframes replacing previous ones).
+    use_bulk = (
+        (not atd.use_tweak_mode) and
+        (not (atd.use_nla and atd.nla_tracks) or atd.action_influence == 1.0) and
+        all((frame_next - frame) >= _BAKE_FRAME_THRESHOLD for frame, frame_next in zip(frames, frames[1:]))
+    )
+    fcurves_cleaned = set()
+
     # pose
     if do_pose:
-        for name, pbone in obj.pose.bones.items():
+        bones = []
+        bone_indices = {pbone.name: i for i, pbone in enumerate(pose_bones)}
+        for i, (name, pbone) in enumerate(pose_bones.items()):
             if only_selected and not pbone.bone.select:
                 continue
 
@@ -272,45 +491,90 @@ def bake_action_iter(
                 while pbone.constraints:
                     pbone.constraints.remove(pbone.constraints[0])
 
-            # Create compatible eulers, quats.
-            euler_prev = None
-            quat_prev = None
-
-            for (f, matrix, bbones) in pose_info:
-                pbone.matrix_basis = matrix[name].copy()
-
-                pbone.keyframe_insert("location", index=-1, frame=f, group=name)
-
-                rotation_mode = pbone.rotation_mode
-                if rotation_mode == 'QUATERNION':
-                    if quat_prev is not None:
-                        quat = pbone.rotation_quaternion.copy()
-                        quat.make_compatible(quat_prev)
-                        pbone.rotation_quaternion = quat
-                        quat_prev = quat
-                        del quat
-                    else:
-                        quat_prev = pbone.rotation_quaternion.copy()
-                    pbone.keyframe_insert("rotation_quaternion", index=-1, frame=f, group=name)
-                elif rotation_mode == 'AXIS_ANGLE':
-                    pbone.keyframe_insert("rotation_axis_angle", index=-1, frame=f, group=name)
-                else:  # euler, XYZ, ZXY etc
-                    if euler_prev is not None:
-                        euler = pbone.matrix_basis.to_euler(obj.rotation_mode, euler_prev)
-                        pbone.rotation_euler = euler
-                        del euler
-                    euler_prev = pbone.rotation_euler.copy()
-                    pbone.keyframe_insert("rotation_euler", index=-1, frame=f, group=name)
-
-                pbone.keyframe_insert("scale", index=-1, frame=f, group=name)
-
-                # Bendy Bones
-                if pbone.bone.bbone_segments > 1:
-                    bbone_shape = bbones[name]
-                    for bb_prop in BBONE_PROPS:
-                        # update this property with value from bbone_shape, then key it
-                        setattr(pbone, bb_prop, bbone_shape[bb_prop])
-                        pbone.keyframe_insert(bb_prop, index=-1, frame=f, group=name)
+            parent = pbone.parent
+            bones.append((
+                i, pbone,
+                -1 if parent is None else bone_indices[parent.name],
+                _BakeKeyframes(action, pbone, name, use_bulk),
+            ))
+
+        # Create compatible eulers, quats.
+        euler_prev_all = [None] * len(bones)
+        quat_prev_all = [None] * len(bones)
+
+        # Apply a chunk of frames to all bones at once, so the samples can be freed once written.
+        pose_info.reverse()
+        chunk_start = 0
+        while pose_info:
+            matrices, bbones = pose_info.pop()
+            frames_chunk = frames[chunk_start:chunk_start + _BAKE_CHUNK_FRAMES]
+            for bone_index, (i, pbone, i_parent, keyframes) in enumerate(bones):
+                euler_prev = euler_prev_all[bone_index]
+                quat_prev = quat_prev_all[bone_index]
+                if do_visual_keying:
+                    bone = pbone.bone
+                    bone_matrix_local = bone.matrix_local
+                    if i_parent != -1:
+                        bone_parent_matrix_local = bone.parent.matrix_local
+
+                for frame_index, f in enumerate(frames_chunk):
+                    offset = frame_index * pose_bones_len
+                    matrix = pose_matrix_get(matrices, (offset + i) * 16)
+                    if do_visual_keying:
+                        # Get the final transform of the bone in its own local space...
+                        if i_parent != -1:
+                            matrix = bone.convert_local_to_pose(
+                                matrix, bone_matrix_local,
+                                parent_matrix=pose_matrix_get(matrices, (offset + i_parent) * 16),
+                                parent_matrix_local=bone_parent_matrix_local,
+                                invert=True,
+                            )
+                        else:
+                            matrix = bone.convert_local_to_pose(matrix, bone_matrix_local, invert=True)
+                    pbone.matrix_basis = matrix
+
+                    keyframes.insert("location", f)
+
+                    rotation_mode = pbone.rotation_mode
+                    if rotation_mode == 'QUATERNION':
+                        if quat_prev is not None:
+                            quat = pbone.rotation_quaternion.copy()
+                            quat.make_compatible(quat_prev)
+                            pbone.rotation_quaternion = quat
+                            quat_prev = quat
+                            del quat
+                        else:
+                            quat_prev = pbone.rotation_quaternion.copy()
+                        keyframes.insert("rotation_quaternion", f)
+                    elif rotation_mode == 'AXIS_ANGLE':
+                        keyframes.insert("rotation_axis_angle", f)
+                    else:  # euler, XYZ, ZXY etc
+                        if euler_prev is not None:
+                            euler = pbone.matrix_basis.to_euler(obj.rotation_mode, euler_prev)
+                            pbone.rotation_euler = euler
+                            del euler
+                        euler_prev = pbone.rotation_euler.copy()
+                        keyframes.insert("rotation_euler", f)
+
+                    keyframes.insert("scale", f)
+
+                    # Bendy Bones
+                    if pbone.bone.bbone_segments > 1:
+                        offset = frame_index * len(BBONE_PROPS) * pose_bones_len + i
+                        for bb_prop in BBONE_PROPS:
+                            # update this property with the sampled value, then key it
+                            setattr(pbone, bb_prop, bbones[offset])
+                            keyframes.insert(bb_prop, f)
+                            offset += pose_bones_len
+
+                euler_prev_all[bone_index] = euler_prev
+                quat_prev_all[bone_index] = quat_prev
+                keyframes.flush(do_clean)
+            chunk_start += _BAKE_CHUNK_FRAMES
+            del matrices, bbones
+
+        for _i, _pbone, _i_parent, keyframes in bones:
+            fcurves_cleaned.update(keyframes.finish(do_clean))
 
     # object. TODO. multiple objects
     if do_object:
@@ -322,11 +586,12 @@ def bake_action_iter(
         euler_prev = None
         quat_prev = None
 
-        for (f, matrix) in obj_info:
-            name = "Action Bake"  # XXX: placeholder
+        name = "Action Bake"  # XXX: placeholder
+        keyframes = _BakeKeyframes(action, obj, name, use_bulk)
+        for (f, matrix) in zip(frames, obj_info):
             obj.matrix_basis = matrix
 
-            obj.keyframe_insert("location", index=-1, frame=f, group=name)
+            keyframes.insert("location", f)
 
             rotation_mode = obj.rotation_mode
             if rotation_mode == 'QUATERNION':
@@ -338,16 +603,18 @@ def bake_action_iter(
                     del quat
                 else:
                     quat_prev = obj.rotation_quaternion.copy()
-                obj.keyframe_insert("rotation_quaternion", index=-1, frame=f, group=name)
+                keyframes.insert("rotation_quaternion", f)
             elif rotation_mode == 'AXIS_ANGLE':
-                obj.keyframe_insert("rotation_axis_angle", index=-1, frame=f, group=name)
+                keyframes.insert("rotation_axis_angle", f)
             else:  # euler, XYZ, ZXY etc
                 if euler_prev is not None:
                     obj.rotation_euler = matrix.to_euler(obj.rotation_mode, euler_prev)
                 euler_prev = obj.rotation_euler.copy()
-                obj.keyframe_insert("rotation_euler", index=-1, frame=f, group=name)
+                keyframes.insert("rotation_euler", f)
+
+            keyframes.insert("scale", f)
 
-            obj.keyframe_insert("scale", index=-1, frame=f, group=name)
+        fcurves_cleaned.update(keyframes.finish(do_clean))
 
         if do_parents_clear:
             obj.parent = None
@@ -357,23 +624,17 @@ def bake_action_iter(
 
     if do_clean:
         for fcu in action.fcurves:
+            if fcu in fcurves_cleaned:
+                continue
             fcu_orig_data = clean_orig_data.get(fcu, set())
 
             keyframe_points = fcu.keyframe_points
-            i = 1
-            while i < len(keyframe_points) - 1:
-                val = keyframe_points[i].co[1]
-
-                if val in fcu_orig_data:
-                    i += 1
-                    continue
-
-                val_prev = keyframe_points[i - 1].co[1]
-                val_next = keyframe_points[i + 1].co[1]
-
-                if abs(val - val_prev) + abs(val - val_next) < 0.0001:
-                    keyframe_points.remove(keyframe_points[i])
-                else:
-                    i += 1
+            co = array('f', (0.0,)) * (len(keyframe_points) * 2)
+            keyframe_points.foreach_get("co", co)
+            keep = set(_keyframes_clean_keep(co[1::2], fcu_orig_data))
+            remove = [i for i in range(len(keyframe_points)) if i not in keep]
+            # Remove from the end, only computing handles once all keyframes are removed.
+            for i in reversed(remove):
+                keyframe_points.remove(keyframe_points[i], fast=(i != remove[0]))
 
     yield action
@@ -19,8 +19,10 @@
 # <pep8-80 compliant>
 
 __all__ = (
+    "MeshTopology",
     "mesh_linked_uv_islands",
     "mesh_linked_triangles",
+    "mesh_linked_polygons",
     "edge_face_count_dict",
     "edge_face_count",
     "edge_loops_from_edges",
@@ -29,6 +31,204 @@ __all__ = (
 )
 
 
+def _mesh_data_array(collection, attr, typecode, stride=1):
+    # Read an attribute of every item in a collection
+    # with a single 'foreach_get'.
+    from array import array
+    data = array(typecode, (0,)) * (len(collection) * stride)
+    collection.foreach_get(attr, data)
+    return data
+
+
+def _disjoint_set_find(parent, i):
+    # Find the root of 'i', halving the path to it along the way.
+    while parent[i] != i:
+        parent[i] = i = parent[parent[i]]
+    return i
+
+
+def _disjoint_set_union(parent, i, j):
+    # Keep the lowest index as the root so roots always come first.
+    i = _disjoint_set_find(parent, i)
+    j = _disjoint_set_find(parent, j)
+    if i < j:
+        parent[j] = i
+    elif j < i:
+        parent[i] = j
+
+
+def _disjoint_set_ids(parent):
+    # Compact set index for every item,
+    # numbered in order of each set's first item.
+    from array import array
+    ids = array('i', (0,)) * len(parent)
+    ids_len = 0
+    for i in range(len(parent)):
+        root = _disjoint_set_find(parent, i)
+        if root == i:
+            ids[i] = ids_len
+            ids_len += 1
+        else:
+            ids[i] = ids[root]
+    return ids, ids_len
+
+
+def _disjoint_set_groups(parent):
+    ids, ids_len = _disjoint_set_ids(parent)
+    groups = [[] for _ in range(ids_len)]
+    for i, group_index in enumerate(ids):
+        groups[group_index].append(i)
+    return groups
+
+
+class MeshTopology:
+    """
+    Flat topology arrays of a mesh, read once using ``foreach_get``
+    so they can be shared between the functions in this module.
+
+    Tables derived from these arrays are calculated on first access and cached,
+    a new instance must be created when the mesh is edited.
+
+    :arg mesh: the mesh to read from.
+    :type mesh: :class:`bpy.types.Mesh`
+    """
+
+    __slots__ = (
+        "mesh",
+        "edge_verts",
+        "loop_verts",
+        "loop_edges",
+        "poly_loop_starts",
+        "poly_loop_totals",
+        "_vert_coords",
+        "_loop_polys",
+        "_edge_face_count",
+        "_vert_face_offsets",
+        "_vert_faces",
+    )
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        # Vertex index pairs for each edge.
+        self.edge_verts = _mesh_data_array(mesh.edges, "vertices", 'i', 2)
+        self.loop_verts = _mesh_data_array(mesh.loops, "vertex_index", 'i')
+        self.loop_edges = _mesh_data_array(mesh.loops, "edge_index", 'i')
+        self.poly_loop_starts = _mesh_data_array(
+            mesh.polygons, "loop_start", 'i',
+        )
+        self.poly_loop_totals = _mesh_data_array(
+            mesh.polygons, "loop_total", 'i',
+        )
+        self._vert_coords = ...
+        self._loop_polys = ...
+        self._edge_face_count = ...
+        self._vert_face_offsets = ...
+        self._vert_faces = ...
+
+    def vert_coords_get(self):
+        # X, Y, Z for each vertex, only read when needed.
+        if self._vert_coords is ...:
+            self._vert_coords = _mesh_data_array(
+                self.mesh.vertices, "co", 'f', 3,
+            )
+        return self._vert_coords
+
+    vert_coords = property(vert_coords_get)
+
+    def loop_polys_get(self):
+        # Polygon index for each loop.
+        if self._loop_polys is ...:
+            from array import array
+            loop_polys = array('i', (0,)) * len(self.loop_verts)
+            for pi, (loop_start, loop_total) in enumerate(
+                    zip(self.poly_loop_starts, self.poly_loop_totals)
+            ):
+                loop_polys[loop_start:loop_start + loop_total] = (
+                    array('i', (pi,)) * loop_total
+                )
+            self._loop_polys = loop_polys
+        return self._loop_polys
+
+    loop_polys = property(loop_polys_get)
+
+    def edge_face_count_get(self):
+        # Number of faces using each edge.
+        if self._edge_face_count is ...:
+            from array import array
+            edge_face_count = array('i', (0,)) * (len(self.edge_verts) // 2)
+            for ei in self.loop_edges:
+                edge_face_count[ei] += 1
+            self._edge_face_count = edge_face_count
+        return self._edge_face_count
+
+    edge_face_count = property(edge_face_count_get)
+
+    def vert_face_offsets_get(self):
+        # Compressed (CSR) vertex to face adjacency,
+        # the faces using vertex 'i' are:
+        # 'vert_faces[vert_face_offsets[i]:vert_face_offsets[i + 1]]'.
+        if self._vert_face_offsets is ...:
+            self._vert_face_adjacency_calc()
+        return self._vert_face_offsets
+
+    vert_face_offsets = property(vert_face_offsets_get)
+
+    def vert_faces_get(self):
+        if self._vert_faces is ...:
+            self._vert_face_adjacency_calc()
+        return self._vert_faces
+
+    vert_faces = property(vert_faces_get)
+
+    def _vert_face_adjacency_calc(self):
+        from array import array
+        from itertools import accumulate
+        vert_len = len(self.mesh.vertices)
+        loop_verts = self.loop_verts
+        vert_face_offsets = array('i', (0,)) * (vert_len + 1)
+        for vi in loop_verts:
+            vert_face_offsets[vi + 1] += 1
+        vert_face_offsets = array('i', accumulate(vert_face_offsets))
+        vert_faces = array('i', (0,)) * len(loop_verts)
+        vert_fill = vert_face_offsets[:-1]
+        for vi, pi in zip(loop_verts, self.loop_polys):
+            vert_faces[vert_fill[vi]] = pi
+            vert_fill[vi] += 1
+        self._vert_face_offsets = vert_face_offsets
+        self._vert_faces = vert_faces
+
+    def edge_keys(self):
+        """
+        :return: sorted vertex index pairs for each edge.
+        :rtype: list
+        """
+        edge_verts = self.edge_verts
+        return [
+            (v1, v2) if v1 < v2 else (v2, v1)
+            for v1, v2 in zip(edge_verts[0::2], edge_verts[1::2])
+        ]
+
+    def edge_boundary_mask(self):
+        """
+        :return: True for each edge used by a single face.
+        :rtype: list
+        """
+        return [count == 1 for count in self.edge_face_count]
+
+    def edge_non_manifold_mask(self):
+        """
+        :return: True for each edge used by more than two faces.
+        :rtype: list
+        """
+        return [count > 2 for count in self.edge_face_count]
+
+
+def _mesh_topology(mesh):
+    if isinstance(mesh, MeshTopology):
+        return mesh
+    return MeshTopology(mesh)
+
+
 def mesh_linked_uv_islands(mesh):
     """
     Splits the mesh into connected polygons, use this for separating cubes from
@@ -39,54 +239,26 @@ def mesh_linked_uv_islands(mesh):
     :return: lists of lists containing polygon indices
     :rtype: list
     """
-    uv_loops = [luv.uv[:] for luv in mesh.uv_layers.active.data]
-    poly_loops = [poly.loop_indices for poly in mesh.polygons]
-    luv_hash = {}
-    luv_hash_get = luv_hash.get
-    luv_hash_ls = [None] * len(uv_loops)
-    for pi, poly_indices in enumerate(poly_loops):
-        for li in poly_indices:
-            uv = uv_loops[li]
-            uv_hub = luv_hash_get(uv)
-            if uv_hub is None:
-                uv_hub = luv_hash[uv] = [pi]
-            else:
-                uv_hub.append(pi)
-            luv_hash_ls[li] = uv_hub
-
-    poly_islands = []
-
-    # 0 = none, 1 = added, 2 = searched
-    poly_tag = [0] * len(poly_loops)
-
-    while True:
-        poly_index = -1
-        for i in range(len(poly_loops)):
-            if poly_tag[i] == 0:
-                poly_index = i
-                break
-
-        if poly_index != -1:
-            island = [poly_index]
-            poly_tag[poly_index] = 1
-            poly_islands.append(island)
-        else:
-            break  # we're done
-
-        added = True
-        while added:
-            added = False
-            for poly_index in island[:]:
-                if poly_tag[poly_index] == 1:
-                    for li in poly_loops[poly_index]:
-                        for poly_index_shared in luv_hash_ls[li]:
-                            if poly_tag[poly_index_shared] == 0:
-                                added = True
-                                poly_tag[poly_index_shared] = 1
-                                island.append(poly_index_shared)
-                    poly_tag[poly_index] = 2
-
-    return poly_islands
+    polygons = mesh.polygons
+    loop_starts = _mesh_data_array(polygons, "loop_start", 'i')
+    loop_totals = _mesh_data_array(polygons, "loop_total", 'i')
+    uv_loops = _mesh_data_array(mesh.uv_layers.active.data, "uv", 'f', 2)
+
+    # Polygons sharing a UV coordinate are part of the same island.
+    parent = list(range(len(polygons)))
+    luv_poly = {}
+    luv_poly_setdefault = luv_poly.setdefault
+    for pi, (loop_start, loop_total) in enumerate(
+            zip(loop_starts, loop_totals)
+    ):
+        for li in range(loop_start * 2, (loop_start + loop_total) * 2, 2):
+            pi_shared = luv_poly_setdefault(
+                (uv_loops[li], uv_loops[li + 1]), pi,
+            )
+            if pi_shared != pi:
+                _disjoint_set_union(parent, pi_shared, pi)
+
+    return _disjoint_set_groups(parent)
 
 
 def mesh_linked_triangles(mesh):
@@ -99,106 +271,174 @@ def mesh_linked_triangles(mesh):
     :return: lists of lists containing triangles.
     :rtype: list
     """
+    loop_triangles = mesh.loop_triangles
+    tri_verts = _mesh_data_array(loop_triangles, "vertices", 'i', 3)
+
+    # Triangles sharing a vertex are part of the same group.
+    parent = list(range(len(loop_triangles)))
+    vert_tri = [-1] * len(mesh.vertices)
+    for i, v in enumerate(tri_verts):
+        ti = i // 3
+        ti_shared = vert_tri[v]
+        if ti_shared == -1:
+            vert_tri[v] = ti
+        elif ti_shared != ti:
+            _disjoint_set_union(parent, ti_shared, ti)
+
+    loop_triangles = loop_triangles[:]
+    return [
+        [loop_triangles[ti] for ti in group]
+        for group in _disjoint_set_groups(parent)
+    ]
+
+
+def mesh_linked_polygons(mesh, delimit=frozenset({'SEAM', 'UV', 'MATERIAL'})):
+    """
+    Splits the mesh into polygons connected by their edges.
 
-    # Build vert face connectivity
-    vert_tris = [[] for i in range(len(mesh.vertices))]
-    for t in mesh.loop_triangles:
-        for v in t.vertices:
-            vert_tris[v].append(t)
-
-    # sort triangles into connectivity groups
-    tri_groups = [[t] for t in mesh.loop_triangles]
-    # map old, new tri location
-    tri_mapping = list(range(len(mesh.loop_triangles)))
-
-    # Now clump triangles iteratively
-    ok = True
-    while ok:
-        ok = False
-
-        for t in mesh.loop_triangles:
-            mapped_index = tri_mapping[t.index]
-            mapped_group = tri_groups[mapped_index]
-
-            for v in t.vertices:
-                for nxt_t in vert_tris[v]:
-                    if nxt_t != t:
-                        nxt_mapped_index = tri_mapping[nxt_t.index]
-
-                        # We are not a part of the same group
-                        if mapped_index != nxt_mapped_index:
-                            ok = True
-
-                            # Assign mapping to this group so they
-                            # all map to this group
-                            for grp_t in tri_groups[nxt_mapped_index]:
-                                tri_mapping[grp_t.index] = mapped_index
-
-                            # Move triangles into this group
-                            mapped_group.extend(tri_groups[nxt_mapped_index])
-
-                            # remove reference to the list
-                            tri_groups[nxt_mapped_index] = None
-
-    # return all tri groups that are not null
-    # this is all the triangles that are connected in their own lists.
-    return [tg for tg in tri_groups if tg]
+    :arg mesh: the mesh used to group with.
+    :type mesh: :class:`bpy.types.Mesh` or :class:`MeshTopology`
+    :arg delimit: Edges not to cross when connecting polygons,
+       in ['SEAM', 'SHARP', 'MATERIAL', 'UV'].
+    :type delimit: set
+    :return: island index for each polygon,
+       numbered in order of the first polygon of each island.
+    :rtype: :class:`array.array`
+    """
+    topology = _mesh_topology(mesh)
+    mesh = topology.mesh
+    polygons = mesh.polygons
+    edges = mesh.edges
+    loop_starts = topology.poly_loop_starts
+    loop_totals = topology.poly_loop_totals
+    loop_edges = topology.loop_edges
+
+    edge_delimit = None
+    for attr, key in (("use_seam", 'SEAM'), ("use_edge_sharp", 'SHARP')):
+        if key in delimit:
+            if edge_delimit is None:
+                edge_delimit = [False] * len(edges)
+            edge_flags = [False] * len(edges)
+            edges.foreach_get(attr, edge_flags)
+            edge_delimit = [a or b for a, b in zip(edge_delimit, edge_flags)]
+
+    poly_materials = None
+    if 'MATERIAL' in delimit:
+        poly_materials = _mesh_data_array(polygons, "material_index", 'i')
+
+    uv_loops = None
+    if 'UV' in delimit and mesh.uv_layers.active is not None:
+        loop_verts = topology.loop_verts
+        uv_loops = _mesh_data_array(mesh.uv_layers.active.data, "uv", 'f', 2)
+
+    parent = list(range(len(polygons)))
+    # The first polygon and its UV's (ordered by vertex index) using each edge.
+    edge_poly = [-1] * len(edges)
+    edge_uv = {}
+    for pi, (loop_start, loop_total) in enumerate(
+            zip(loop_starts, loop_totals)
+    ):
+        loop_end = loop_start + loop_total
+        for li in range(loop_start, loop_end):
+            ei = loop_edges[li]
+            if edge_delimit is not None and edge_delimit[ei]:
+                continue
+
+            if uv_loops is not None:
+                li_next = li + 1 if li + 1 != loop_end else loop_start
+                uv_pair = (
+                    (
+                        loop_verts[li],
+                        uv_loops[li * 2],
+                        uv_loops[li * 2 + 1],
+                    ),
+                    (
+                        loop_verts[li_next],
+                        uv_loops[li_next * 2],
+                        uv_loops[li_next * 2 + 1],
+                    ),
+                )
+                if uv_pair[0] > uv_pair[1]:
+                    uv_pair = uv_pair[1], uv_pair[0]
+
+            pi_shared = edge_poly[ei]
+            if pi_shared == -1:
+                edge_poly[ei] = pi
+                if uv_loops is not None:
+                    edge_uv[ei] = uv_pair
+                continue
+            if pi_shared == pi:
+                continue
+            if (
+                    poly_materials is not None and
+                    poly_materials[pi_shared] != poly_materials[pi]
+            ):
+                continue
+            if uv_loops is not None and edge_uv[ei] != uv_pair:
+                continue
+            _disjoint_set_union(parent, pi_shared, pi)
+
+    return _disjoint_set_ids(parent)[0]
 
 
 def edge_face_count_dict(mesh):
     """
+    :arg mesh: the mesh, or its topology.
+    :type mesh: :class:`bpy.types.Mesh` or :class:`MeshTopology`
     :return: dict of edge keys with their value set to the number of
        faces using each edge.
     :rtype: dict
     """
-
+    topology = _mesh_topology(mesh)
     face_edge_count = {}
-    loops = mesh.loops
-    edges = mesh.edges
-    for poly in mesh.polygons:
-        for i in poly.loop_indices:
-            key = edges[loops[i].edge_index].key
-            try:
-                face_edge_count[key] += 1
-            except:
-                face_edge_count[key] = 1
+    for key, count in zip(topology.edge_keys(), topology.edge_face_count):
+        if count:
+            face_edge_count[key] = face_edge_count.get(key, 0) + count
 
     return face_edge_count
 
 
 def edge_face_count(mesh):
     """
+    :arg mesh: the mesh, or its topology.
+    :type mesh: :class:`bpy.types.Mesh` or :class:`MeshTopology`
     :return: list face users for each item in mesh.edges.
     :rtype: list
     """
-    edge_face_count = edge_face_count_dict(mesh)
-    get = dict.get
-    return [get(edge_face_count, ed.key, 0) for ed in mesh.edges]
+    return _mesh_topology(mesh).edge_face_count.tolist()
 
 
 def edge_loops_from_edges(mesh, edges=None):
     """
     Edge loops defined by edges
 
-    Takes me.edges or a list of edges and returns the edge loops
+    Takes me.edges or a list of edges and returns the edge loops,
+    when *mesh* is a :class:`MeshTopology` all its edges are used by default.
 
     return a list of vertex indices.
     [ [1, 6, 7, 2], ...]
 
     closed loops have matching start and end values.
     """
+    from operator import attrgetter
+
     line_polys = []
+    edge_verts_get = attrgetter("vertices")
 
     # Get edges not used by a face
     if edges is None:
-        edges = mesh.edges
+        if isinstance(mesh, MeshTopology):
+            edges = mesh.edge_keys()
+            edge_verts_get = tuple
+        else:
+            edges = mesh.edges
 
     if not hasattr(edges, "pop"):
         edges = edges[:]
 
     while edges:
         current_edge = edges.pop()
-        vert_end, vert_start = current_edge.vertices[:]
+        vert_end, vert_start = edge_verts_get(current_edge)[:]
         line_poly = [vert_start, vert_end]
 
         ok = True
@@ -208,8 +448,7 @@ def edge_loops_from_edges(mesh, edges=None):
             i = len(edges)
             while i:
                 i -= 1
-                ed = edges[i]
-                v1, v2 = ed.vertices
+                v1, v2 = edge_verts_get(edges[i])
                 if v1 == vert_end:
                     line_poly.append(v2)
                     vert_end = line_poly[-1]
@@ -245,8 +484,8 @@ def ngon_tessellate(from_data, indices, fix_loops=True, debug_print=True):
     index lists. Designed to be used for importers that need indices for an
     ngon to create from existing verts.
 
-    :arg from_data: either a mesh, or a list/tuple of vectors.
-    :type from_data: list or :class:`bpy.types.Mesh`
+    :arg from_data: either a mesh, its topology, or a list/tuple of vectors.
+    :type from_data: list, :class:`bpy.types.Mesh` or :class:`MeshTopology`
     :arg indices: a list of indices to use this list
        is the ordered closed polyline
        to fill, and can be a subset of the data given.
@@ -264,6 +503,20 @@ def ngon_tessellate(from_data, indices, fix_loops=True, debug_print=True):
     if not indices:
         return []
 
+    if type(from_data) in {tuple, list}:
+        def vert_co(i):
+            return Vector(from_data[i])
+    elif isinstance(from_data, MeshTopology):
+        vert_coords = from_data.vert_coords
+
+        def vert_co(i):
+            return Vector(vert_coords[i * 3:i * 3 + 3])
+    else:
+        mesh_verts = from_data.vertices
+
+        def vert_co(i):
+            return mesh_verts[i].co
+
     def mlen(co):
         # Manhatten length of a vector, faster then length.
         return abs(co[0]) + abs(co[1]) + abs(co[2])
@@ -281,10 +534,7 @@ def ngon_tessellate(from_data, indices, fix_loops=True, debug_print=True):
     if not fix_loops:
         # Normal single concave loop filling.
 
-        if type(from_data) in {tuple, list}:
-            verts = [Vector(from_data[i]) for ii, i in enumerate(indices)]
-        else:
-            verts = [from_data.vertices[i].co for ii, i in enumerate(indices)]
+        verts = [vert_co(i) for i in indices]
 
         # same as reversed(range(1, len(verts))):
         for i in range(len(verts) - 1, 0, -1):
@@ -297,16 +547,10 @@ def ngon_tessellate(from_data, indices, fix_loops=True, debug_print=True):
         # Separate this loop into multiple loops be finding edges that are
         # used twice. This is used by Light-Wave LWO files a lot.
 
-        if type(from_data) in {tuple, list}:
-            verts = [
-                vert_from_vector_with_extra_data(Vector(from_data[i]), ii)
-                for ii, i in enumerate(indices)
-            ]
-        else:
-            verts = [
-                vert_from_vector_with_extra_data(from_data.vertices[i].co, ii)
-                for ii, i in enumerate(indices)
-            ]
+        verts = [
+            vert_from_vector_with_extra_data(vert_co(i), ii)
+            for ii, i in enumerate(indices)
+        ]
 
         edges = [(i, i - 1) for i in range(len(verts))]
         if edges:
@@ -429,6 +429,39 @@ def ord_ind(i1, i2):
     return i2, i1
 
 
+def _mesh_flat_array(seq, typecode):
+    # Return 'seq' as a flat sequence which 'foreach_set' can read from.
+    # Contiguous buffers of a matching type are passed through without copying,
+    # other buffers are converted, nested Python sequences are flattened.
+    from array import array
+    try:
+        view = memoryview(seq)
+    except TypeError:
+        from itertools import chain
+        seq = tuple(seq)
+        if seq and hasattr(seq[0], "__len__"):
+            seq = chain.from_iterable(seq)
+        return array(typecode, seq)
+
+    if view.itemsize == array(typecode).itemsize and view.format in (
+            ("f",) if typecode == "f" else ("i", "l")
+    ):
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes())
+        return view.cast("B").cast(typecode)
+
+    try:
+        items = memoryview(view.tobytes()).cast(view.format)
+    except (TypeError, ValueError):
+        # Formats 'memoryview' can't cast to
+        # (byte order prefix, structs... etc).
+        from itertools import chain
+        items = view.tolist()
+        for _ in range(view.ndim - 1):
+            items = chain.from_iterable(items)
+    return array(typecode, items)
+
+
 class Mesh(bpy_types.ID):
     __slots__ = ()
 
@@ -495,6 +528,148 @@ class Mesh(bpy_types.ID):
                 calc_edges_loose=bool(edges),
             )
 
+    def from_arrays(
+            self,
+            vertices,
+            edges=(),
+            loop_vertices=(),
+            loop_totals=(),
+            loop_starts=None,
+    ):
+        """
+        Make a mesh from flat arrays of vertices/edges/faces.
+
+        This is an alternative to :class:`Mesh.from_pydata` for large meshes,
+        objects supporting the buffer protocol
+        (``array.array``, ``memoryview``, NumPy arrays... etc)
+        are passed to ``foreach_set`` without creating a Python object
+        for each value.
+        Buffers of 32 bit floats (coordinates) and 32 bit integers (indices)
+        are used without copying, other types are converted first.
+
+        :arg vertices:
+
+           X, Y, Z coordinates for each vertex,
+           either flat or with a (n, 3) shape.
+
+        :type vertices: buffer or sequence of floats
+        :arg edges:
+
+           Pairs of indices to the *vertices* argument,
+           either flat or with a (n, 2) shape.
+
+           When empty, the edges are inferred from the polygons.
+
+        :type edges: buffer or sequence of ints
+        :arg loop_vertices:
+
+           Vertex index of every face corner,
+           the corners of each face stored one after another.
+
+        :type loop_vertices: buffer or sequence of ints
+        :arg loop_totals:
+
+           Number of corners of each face.
+
+        :type loop_totals: buffer or sequence of ints
+        :arg loop_starts:
+
+           Index of the first corner of each face in *loop_vertices*,
+           calculated from *loop_totals* when not passed in.
+
+        :type loop_starts: buffer or sequence of ints
+
+        .. warning::
+
+           Invalid mesh data is **not** prevented,
+           see :class:`Mesh.from_pydata`.
+        """
+        vertices = _mesh_flat_array(vertices, "f")
+        edges = _mesh_flat_array(edges, "i")
+        loop_vertices = _mesh_flat_array(loop_vertices, "i")
+        loop_totals = _mesh_flat_array(loop_totals, "i")
+
+        if loop_starts is None:
+            from array import array
+            from itertools import chain, islice, accumulate
+            loop_starts = array("i", islice(
+                chain((0,), accumulate(loop_totals)),
+                len(loop_totals),
+            ))
+        else:
+            loop_starts = _mesh_flat_array(loop_starts, "i")
+
+        self.vertices.add(len(vertices) // 3)
+        self.edges.add(len(edges) // 2)
+        self.loops.add(len(loop_vertices))
+        self.polygons.add(len(loop_totals))
+
+        self.vertices.foreach_set("co", vertices)
+        self.edges.foreach_set("vertices", edges)
+        self.loops.foreach_set("vertex_index", loop_vertices)
+        self.polygons.foreach_set("loop_total", loop_totals)
+        self.polygons.foreach_set("loop_start", loop_starts)
+
+        if edges or loop_totals:
+            self.update(
+                calc_edges=bool(loop_totals),
+                calc_edges_loose=bool(edges),
+            )
+
+    def from_array_chunks(self, chunks):
+        """
+        Make a mesh from geometry generated in chunks,
+        see :class:`Mesh.from_arrays`.
+
+        Each chunk is only kept until its data has been copied into
+        a single contiguous array per attribute, so geometry can be streamed
+        from a generator without holding on to every chunk.
+
+        :arg chunks:
+
+           Iterable of ``(vertices, edges, loop_vertices, loop_totals)``
+           tuples, using the same formats as :class:`Mesh.from_arrays`.
+           Indices in each chunk refer to the vertices of that chunk.
+
+        :type chunks: iterable of tuples
+        """
+        from array import array
+
+        vertices = array("f")
+        edges = array("i")
+        loop_vertices = array("i")
+        loop_totals = array("i")
+
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        def extend(data, seq, offset=0):
+            seq = _mesh_flat_array(seq, data.typecode)
+            if offset:
+                # Offset indices as a whole, when NumPy isn't available
+                # this is done in a single pass over the chunk.
+                if np is not None:
+                    seq = np.frombuffer(seq, dtype=np.intc) + offset
+                else:
+                    seq = array(data.typecode, map(offset.__add__, seq))
+            data.frombytes(memoryview(seq).cast("B"))
+
+        for (
+                chunk_vertices,
+                chunk_edges,
+                chunk_loop_vertices,
+                chunk_loop_totals,
+        ) in chunks:
+            offset = len(vertices) // 3
+            extend(vertices, chunk_vertices)
+            extend(edges, chunk_edges, offset)
+            extend(loop_vertices, chunk_loop_vertices, offset)
+            extend(loop_totals, chunk_loop_totals)
+
+        self.from_arrays(vertices, edges, loop_vertices, loop_totals)
+
     @property
     def edge_keys(self):
         return [ed.key for ed in self.edges]
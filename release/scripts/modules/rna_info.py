@@ -27,6 +27,9 @@ script_paths = bpy.utils.script_paths()
 
 _FAKE_STRUCT_SUBCLASS = True
 
+# Increment when the data stored in snapshots changes.
+SNAPSHOT_VERSION = 2
+
 
 def _get_direct_attr(rna_type, attr):
     props = getattr(rna_type, attr)
@@ -82,6 +85,14 @@ def float_as_string(f):
     return val_str
 
 
+def _py_subclasses_recurse(cls):
+    for c in cls.__subclasses__():
+        # is_registered
+        if "bl_rna" in cls.__dict__:
+            yield c
+        yield from _py_subclasses_recurse(c)
+
+
 def get_py_class_from_rna(rna_type):
     """ Gets the Python type for a class which isn't necessarily added to ``bpy.types``.
     """
@@ -90,24 +101,41 @@ def get_py_class_from_rna(rna_type):
     if py_class is not None:
         return py_class
 
-    def subclasses_recurse(cls):
-        for c in cls.__subclasses__():
-            # is_registered
-            if "bl_rna" in cls.__dict__:
-                yield c
-            yield from subclasses_recurse(c)
-
     while py_class is None:
         base = rna_type.base
         if base is None:
             raise Exception("can't find type")
         py_class_base = getattr(bpy.types, base.identifier, None)
         if py_class_base is not None:
-            for cls in subclasses_recurse(py_class_base):
+            for cls in _py_subclasses_recurse(py_class_base):
                 if cls.bl_rna.identifier == identifier:
                     return cls
 
 
+def _slots_state(self, exclude):
+    # State for pickle, without the attributes referencing Blender's data.
+    state = {}
+    for attr in self.__slots__:
+        if attr in exclude:
+            continue
+        try:
+            state[attr] = getattr(self, attr)
+        except AttributeError:
+            pass
+    return state
+
+
+def _slots_state_set(self, state):
+    for attr, value in state.items():
+        setattr(self, attr, value)
+
+
+def _info_id(info):
+    # Other info is stored by identifier (resolved by 'snapshot_read'),
+    # pickle would otherwise recurse through all info referencing each other.
+    return None if info is None else info.identifier
+
+
 class InfoStructRNA:
     __slots__ = (
         "bl_rna",
@@ -123,6 +151,8 @@ class InfoStructRNA:
         "properties",
         "py_class",
         "module_name",
+        # Identifiers of 'children', when loaded from a snapshot.
+        "_children_ids",
     )
 
     global_lookup = {}
@@ -153,6 +183,39 @@ class InfoStructRNA:
         if self.module_name == "bpy_types":
             self.module_name = "bpy.types"
 
+    def __getstate__(self):
+        state = _slots_state(self, {"bl_rna", "py_class", "children", "_children_ids"})
+        state["_children_ids"] = [rna_struct.identifier for rna_struct in self.children]
+        state["base"] = _info_id(self.base)
+        state["nested"] = _info_id(self.nested)
+        state["functions"] = [func.identifier for func in self.functions]
+        state["properties"] = [prop.identifier for prop in self.properties]
+        return state
+
+    __setstate__ = _slots_state_set
+
+    def __getattr__(self, attr):
+        # Only called for data loaded from a snapshot,
+        # where Blender's data is looked up on first access.
+        if attr == "py_class":
+            value = getattr(bpy.types, self.identifier, None)
+            if value is None and self.base is not None:
+                for cls in _py_subclasses_recurse(self.base.py_class):
+                    if cls.bl_rna.identifier == self.identifier:
+                        value = cls
+                        break
+        elif attr == "bl_rna":
+            value = self.py_class.bl_rna
+        elif attr == "children":
+            value = [
+                InfoStructRNA.global_lookup["", identifier].bl_rna
+                for identifier in self._children_ids
+            ]
+        else:
+            raise AttributeError(attr)
+        setattr(self, attr, value)
+        return value
+
     def build(self):
         rna_type = self.bl_rna
         parent_id = self.identifier
@@ -257,6 +320,8 @@ class InfoPropertyRNA:
         "is_required",
         "is_readonly",
         "is_never_none",
+        # The struct, function or operator info, when loaded from a snapshot.
+        "_owner",
     )
     global_lookup = {}
 
@@ -267,6 +332,30 @@ class InfoPropertyRNA:
         self.description = rna_prop.description.strip()
         self.default_str = "<UNKNOWN>"
 
+    def __getstate__(self):
+        state = _slots_state(self, {"bl_prop", "_owner"})
+        for attr in ("srna", "fixed_type", "collection_type"):
+            if attr in state:
+                state[attr] = _info_id(state[attr])
+        return state
+
+    __setstate__ = _slots_state_set
+
+    def __getattr__(self, attr):
+        # Only called for data loaded from a snapshot, see 'InfoStructRNA'.
+        if attr == "bl_prop":
+            owner = self._owner
+            if type(owner) is InfoStructRNA:
+                value = owner.bl_rna.properties[self.identifier]
+            elif type(owner) is InfoFunctionRNA:
+                value = owner.bl_func.parameters[self.identifier]
+            else:
+                value = owner.bl_op.properties[self.identifier]
+        else:
+            raise AttributeError(attr)
+        self.bl_prop = value
+        return value
+
     def build(self):
         rna_prop = self.bl_prop
 
@@ -418,6 +507,8 @@ class InfoFunctionRNA:
         "args",
         "return_values",
         "is_classmethod",
+        # The struct info, when loaded from a snapshot.
+        "_owner",
     )
     global_lookup = {}
 
@@ -431,6 +522,23 @@ class InfoFunctionRNA:
         self.args = []
         self.return_values = ()
 
+    def __getstate__(self):
+        state = _slots_state(self, {"bl_func", "_owner"})
+        state["args"] = [prop.identifier for prop in self.args]
+        state["return_values"] = tuple(prop.identifier for prop in self.return_values)
+        return state
+
+    __setstate__ = _slots_state_set
+
+    def __getattr__(self, attr):
+        # Only called for data loaded from a snapshot, see 'InfoStructRNA'.
+        if attr == "bl_func":
+            value = self._owner.bl_rna.functions[self.identifier]
+        else:
+            raise AttributeError(attr)
+        self.bl_func = value
+        return value
+
     def build(self):
         rna_func = self.bl_func
         parent_id = rna_func
@@ -480,6 +588,22 @@ class InfoOperatorRNA:
 
         self.args = []
 
+    def __getstate__(self):
+        state = _slots_state(self, {"bl_op"})
+        state["args"] = [prop.identifier for prop in self.args]
+        return state
+
+    __setstate__ = _slots_state_set
+
+    def __getattr__(self, attr):
+        # Only called for data loaded from a snapshot, see 'InfoStructRNA'.
+        if attr == "bl_op":
+            value = getattr(getattr(bpy.ops, self.module_name), self.func_name).get_rna_type()
+        else:
+            raise AttributeError(attr)
+        self.bl_op = value
+        return value
+
     def build(self):
         rna_op = self.bl_op
         parent_id = self.identifier
@@ -801,6 +925,160 @@ def BuildRNAInfo():
     )
 
 
+# -----------------------------------------------------------------------------
+# Snapshots
+#
+# Building the info walks all of RNA which is slow,
+# snapshots store the result on disk to be loaded by other processes.
+# References to Blender's data ('bl_rna', 'py_class' ... etc)
+# aren't stored, these are looked up when they're first accessed.
+
+def snapshot_key():
+    """
+    :return: A key identifying the RNA the info is built from,
+       snapshots with a different key are outdated.
+    :rtype: tuple
+    """
+    import sys
+    return (
+        SNAPSHOT_VERSION,
+        sys.version_info[:2],
+        bpy.app.version,
+        bpy.app.build_hash,
+        # Add-ons register their own types.
+        tuple(sorted(bpy.context.preferences.addons.keys())),
+    )
+
+
+def snapshot_write(filepath, info):
+    """
+    Write the result of :func:`BuildRNAInfo` to a file.
+
+    :arg filepath: The snapshot file.
+    :type filepath: string
+    :arg info: The result of :func:`BuildRNAInfo`.
+    :type info: tuple
+    """
+    import os
+    import pickle
+
+    structs, funcs, ops, props = info
+
+    # Function arguments use the function as their parent,
+    # replace by the function key as RNA can't be written.
+    func_keys = {func.bl_func: key for key, func in funcs.items()}
+    props = {
+        (key[0] if type(key[0]) is str else func_keys[key[0]], key[1]): prop
+        for key, prop in props.items()
+    }
+
+    filepath_tmp = filepath + "@"
+    with open(filepath_tmp, "wb") as fh:
+        # Write the key separately, so outdated snapshots can be skipped
+        # without loading all data.
+        pickle.dump(snapshot_key(), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump((structs, funcs, ops, props), fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath_tmp, filepath)
+
+
+def snapshot_read(filepath):
+    """
+    Read info written by :func:`snapshot_write`,
+    also used for further lookups (:func:`GetInfoStructRNA` ... etc).
+
+    :arg filepath: The snapshot file.
+    :type filepath: string
+    :return: The same as :func:`BuildRNAInfo`
+       or None when the file doesn't exist or is outdated.
+    :rtype: tuple or None
+    """
+    import pickle
+    try:
+        fh = open(filepath, "rb")
+    except FileNotFoundError:
+        return None
+    with fh:
+        try:
+            if pickle.load(fh) != snapshot_key():
+                return None
+            info = pickle.load(fh)
+        except Exception as ex:
+            print("Error reading RNA info snapshot:", repr(filepath), ex)
+            return None
+
+    structs, funcs, ops, props = info
+
+    # Replace the identifiers stored for other info (see '_info_id'),
+    # owners are used to look up Blender's data.
+    def struct_get(struct_id):
+        return None if struct_id is None else structs["", struct_id]
+
+    for (_, struct_id), struct in structs.items():
+        struct.base = struct_get(struct.base)
+        struct.nested = struct_get(struct.nested)
+        struct.functions = [funcs[struct_id, func_id] for func_id in struct.functions]
+        struct.properties = [props[struct_id, prop_id] for prop_id in struct.properties]
+        for prop in struct.properties:
+            prop._owner = struct
+    for func_key, func in funcs.items():
+        func._owner = structs["", func_key[0]]
+        func.args = [props[func_key, prop_id] for prop_id in func.args]
+        func.return_values = tuple(props[func_key, prop_id] for prop_id in func.return_values)
+        for prop in func.args:
+            prop._owner = func
+        for prop in func.return_values:
+            prop._owner = func
+    for op in ops.values():
+        op.args = [props[op.identifier, prop_id] for prop_id in op.args]
+        for prop in op.args:
+            prop._owner = op
+    for prop in props.values():
+        for attr in ("srna", "fixed_type", "collection_type"):
+            struct_id = getattr(prop, attr, None)
+            if struct_id is not None:
+                setattr(prop, attr, struct_get(struct_id))
+
+    for cls, lookup in zip((InfoStructRNA, InfoFunctionRNA, InfoOperatorRNA, InfoPropertyRNA), info):
+        cls.global_lookup.clear()
+        cls.global_lookup.update(lookup)
+
+    return (
+        InfoStructRNA.global_lookup,
+        InfoFunctionRNA.global_lookup,
+        InfoOperatorRNA.global_lookup,
+        InfoPropertyRNA.global_lookup,
+    )
+
+
+def BuildRNAInfoCached(filepath=None):
+    """
+    The same as :func:`BuildRNAInfo`, loaded from a snapshot file when
+    it's up to date, otherwise the snapshot is written.
+
+    :arg filepath: The snapshot file,
+       when None a file in the users configuration directory is used.
+    :type filepath: string or None
+    """
+    import os
+    if filepath is None:
+        path = bpy.utils.user_resource('CONFIG')
+        if not path:
+            return BuildRNAInfo()
+        filepath = os.path.join(path, "rna_info.snapshot")
+
+    info = snapshot_read(filepath)
+    if info is not None:
+        return info
+
+    info = BuildRNAInfo()
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        snapshot_write(filepath, info)
+    except Exception as ex:
+        print("Error writing RNA info snapshot:", repr(filepath), ex)
+    return info
+
+
 def main():
     struct = BuildRNAInfo()[0]
     data = []
@@ -20,13 +20,22 @@
 
 import bpy
 
+# Memoized 'build_property_typemap' results, see '_property_typemap_cached'.
+_property_typemap_cache = {}
+_property_typemap_cache_max = 8
 
-def build_property_typemap(skip_classes, skip_typemap):
+# Number of strings written at once, see 'rna2xml'.
+_fw_chunk_size = 1024
+
+
+def build_property_typemap(skip_classes, skip_typemap, types=None):
 
     property_typemap = {}
 
-    for attr in dir(bpy.types):
-        cls = getattr(bpy.types, attr)
+    if types is None:
+        types = [(attr, getattr(bpy.types, attr)) for attr in dir(bpy.types)]
+
+    for attr, cls in types:
         if issubclass(cls, skip_classes):
             continue
 
@@ -55,6 +64,57 @@ def build_property_typemap(skip_classes, skip_typemap):
     return property_typemap
 
 
+def property_typemap_cache_clear():
+    """
+    Clear the property type-maps cached by :func:`rna2xml`.
+
+    Cached type-maps are only reused while the same classes are registered
+    with the same property identifiers, call this after changing the options
+    of existing properties (such as ``SKIP_SAVE``).
+    """
+    _property_typemap_cache.clear()
+
+
+def _property_typemap_cached(skip_classes, skip_typemap):
+    # Building the type-map reads the properties of all types, reuse it
+    # while the same classes are registered (registering or unregistering
+    # a class changes the members of 'bpy.types') and their properties
+    # keep the same identifiers (properties can be added to or removed
+    # from existing types, e.g. 'bpy.types.Scene.foo = ...').
+    # The type-map returned must not be modified.
+    types = [(attr, getattr(bpy.types, attr)) for attr in dir(bpy.types)]
+    key = (
+        tuple(skip_classes),
+        None if skip_typemap is None else tuple(sorted(
+            (cls_name, tuple(properties_blacklist))
+            for cls_name, properties_blacklist in skip_typemap.items()
+        )),
+    )
+    cache_item = _property_typemap_cache.get(key)
+    if cache_item is not None:
+        types_cached, properties_cached, property_typemap = cache_item
+        if len(types) == len(types_cached) and all(
+                attr == attr_cached and cls is cls_cached
+                for (attr, cls), (attr_cached, cls_cached) in zip(types, types_cached)
+        ) and all(
+                tuple(cls.bl_rna.properties.keys()) == properties
+                for cls, properties in properties_cached
+        ):
+            return property_typemap
+
+    property_typemap = build_property_typemap(skip_classes, skip_typemap, types=types)
+    # The identifiers of all properties (including skipped ones) of the types used.
+    properties_cached = [
+        (cls, tuple(cls.bl_rna.properties.keys()))
+        for attr, cls in types if attr in property_typemap
+    ]
+
+    if len(_property_typemap_cache) >= _property_typemap_cache_max:
+        _property_typemap_cache.clear()
+    _property_typemap_cache[key] = (types, properties_cached, property_typemap)
+    return property_typemap
+
+
 def print_ln(data):
     print(data, end="")
 
@@ -78,7 +138,7 @@ def rna2xml(
         method='DATA',
 ):
     from xml.sax.saxutils import quoteattr
-    property_typemap = build_property_typemap(skip_classes, skip_typemap)
+    property_typemap = _property_typemap_cached(skip_classes, skip_typemap)
 
     # don't follow properties of this type, just reference them by name
     # they MUST have a unique 'name' property.
@@ -102,7 +162,26 @@ def rna2xml(
         else:
             raise NotImplementedError("this type is not a number %s" % val_type)
 
+    # Map '(type_name, prop)' to true for colors written as hexadecimal.
+    prop_is_color_cache = {}
+
+    def prop_is_color(value, value_type_name, prop):
+        key = (value_type_name, prop)
+        result = prop_is_color_cache.get(key)
+        if result is None:
+            # check if this is a 0-1 color (rgb, rgba)
+            prop_rna = value.bl_rna.properties[prop]
+            result = prop_is_color_cache[key] = (
+                prop_rna.subtype == 'COLOR_GAMMA' and
+                prop_rna.hard_min == 0.0 and
+                prop_rna.hard_max == 1.0 and
+                prop_rna.array_length in {3, 4}
+            )
+        return result
+
     def rna2xml_node(ident, value, parent):
+        # Generate the text of a node, child nodes are generated as
+        # '(ident, value, parent)' tuples, see 'rna2xml_iter'.
         ident_next = ident + ident_val
 
         # divide into attrs and nodes.
@@ -150,11 +229,7 @@ def rna2xml(
                     if type(subvalue_rna).__name__ == "bpy_prop_array":
                         # check if this is a 0-1 color (rgb, rgba)
                         # in that case write as a hexadecimal
-                        prop_rna = value.bl_rna.properties[prop]
-                        if (prop_rna.subtype == 'COLOR_GAMMA' and
-                                prop_rna.hard_min == 0.0 and
-                                prop_rna.hard_max == 1.0 and
-                                prop_rna.array_length in {3, 4}):
+                        if prop_is_color(value, value_type_name, prop):
                             # -----
                             # color
                             array_value = "#" + "".join(("%.2x" % int(v * 255) for v in subvalue_rna))
@@ -177,36 +252,65 @@ def rna2xml(
         # declare + attributes
         if pretty_format:
             if node_attrs:
-                fw("%s<%s\n" % (ident, value_type_name))
-                for node_attr in node_attrs:
-                    fw("%s%s\n" % (ident_next, node_attr))
-                fw("%s>\n" % (ident_next,))
+                yield "%s<%s\n%s\n%s>\n" % (
+                    ident,
+                    value_type_name,
+                    "\n".join(ident_next + node_attr for node_attr in node_attrs),
+                    ident_next,
+                )
             else:
-                fw("%s<%s>\n" % (ident, value_type_name))
+                yield "%s<%s>\n" % (ident, value_type_name)
         else:
-            fw("%s<%s %s>\n" % (ident, value_type_name, " ".join(node_attrs)))
+            yield "%s<%s %s>\n" % (ident, value_type_name, " ".join(node_attrs))
 
         # unique members
         for prop, subvalue, subvalue_type in nodes_items:
-            fw("%s<%s>\n" % (ident_next, prop))  # XXX, this is awkward, how best to solve?
-            rna2xml_node(ident_next + ident_val, subvalue, value)
-            fw("%s</%s>\n" % (ident_next, prop))  # XXX, need to check on this.
+            yield "%s<%s>\n" % (ident_next, prop)  # XXX, this is awkward, how best to solve?
+            yield (ident_next + ident_val, subvalue, value)
+            yield "%s</%s>\n" % (ident_next, prop)  # XXX, need to check on this.
 
         # list members
         for prop, subvalue, subvalue_type in nodes_lists:
-            fw("%s<%s>\n" % (ident_next, prop))
+            yield "%s<%s>\n" % (ident_next, prop)
             for subvalue_item in subvalue:
                 if subvalue_item is not None:
-                    rna2xml_node(ident_next + ident_val, subvalue_item, value)
-            fw("%s</%s>\n" % (ident_next, prop))
+                    yield (ident_next + ident_val, subvalue_item, value)
+            yield "%s</%s>\n" % (ident_next, prop)
+
+        yield "%s</%s>\n" % (ident, value_type_name)
+
+    def rna2xml_iter(ident, value, parent):
+        # Generate the text of a node and all its child nodes,
+        # using a stack instead of recursion.
+        stack = [rna2xml_node(ident, value, parent)]
+        while stack:
+            for item in stack[-1]:
+                if type(item) is str:
+                    yield item
+                else:
+                    stack.append(rna2xml_node(*item))
+                    break
+            else:
+                stack.pop()
+
+    # Write strings in chunks, instead of calling 'fw' for each line.
+    fw_chunk = []
 
-        fw("%s</%s>\n" % (ident, value_type_name))
+    def fw_buf(data):
+        fw_chunk.append(data)
+        if len(fw_chunk) >= _fw_chunk_size:
+            fw("".join(fw_chunk))
+            fw_chunk.clear()
+
+    def fw_buf_iter(data_iter):
+        for data in data_iter:
+            fw_buf(data)
 
     # -------------------------------------------------------------------------
     # needs re-working to be generic
 
     if root_node:
-        fw("%s<%s>\n" % (root_ident, root_node))
+        fw_buf("%s<%s>\n" % (root_ident, root_node))
 
     # bpy.data
     if method == 'DATA':
@@ -226,124 +330,137 @@ def rna2xml(
                 ls = None
 
             if type(ls) == list:
-                fw("%s<%s>\n" % (ident, attr))
+                fw_buf("%s<%s>\n" % (ident, attr))
                 for blend_id in ls:
-                    rna2xml_node(ident + ident_val, blend_id, None)
-                fw("%s</%s>\n" % (ident_val, attr))
+                    fw_buf_iter(rna2xml_iter(ident + ident_val, blend_id, None))
+                fw_buf("%s</%s>\n" % (ident_val, attr))
     # any attribute
     elif method == 'ATTR':
-        rna2xml_node(root_ident, root_rna, None)
+        fw_buf_iter(rna2xml_iter(root_ident, root_rna, None))
 
     if root_node:
-        fw("%s</%s>\n" % (root_ident, root_node))
+        fw_buf("%s</%s>\n" % (root_ident, root_node))
 
+    if fw_chunk:
+        fw("".join(fw_chunk))
 
-def xml2rna(root_xml,
-            root_rna=None,  # must be set
-            ):
 
-    def rna2xml_node(xml_node, value):
-        # print("evaluating:", xml_node.nodeName)
+def _xml2rna_attrs(xml_attrs, value):
+    # Set the simple attributes of a value from the attributes of its node.
+    for attr, value_xml in xml_attrs.items():
+        # print("  ", attr)
+        subvalue = getattr(value, attr, Ellipsis)
 
-        # ---------------------------------------------------------------------
-        # Simple attributes
+        if subvalue is Ellipsis:
+            print("%s.%s not found" % (type(value).__name__, attr))
+        else:
+            subvalue_type = type(subvalue)
+            tp_name = 'UNKNOWN'
+            if subvalue_type == float:
+                value_xml_coerce = float(value_xml)
+                tp_name = 'FLOAT'
+            elif subvalue_type == int:
+                value_xml_coerce = int(value_xml)
+                tp_name = 'INT'
+            elif subvalue_type == bool:
+                value_xml_coerce = {'TRUE': True, 'FALSE': False}[value_xml]
+                tp_name = 'BOOL'
+            elif subvalue_type == str:
+                value_xml_coerce = value_xml
+                tp_name = 'STR'
+            elif hasattr(subvalue, "__len__"):
+                if value_xml.startswith("#"):
+                    # read hexadecimal value as float array
+                    value_xml_split = value_xml[1:]
+                    value_xml_coerce = [int(value_xml_split[i:i + 2], 16) /
+                                        255 for i in range(0, len(value_xml_split), 2)]
+                    del value_xml_split
+                else:
+                    value_xml_split = value_xml.split()
+                    try:
+                        value_xml_coerce = [int(v) for v in value_xml_split]
+                    except ValueError:
+                        try:
+                            value_xml_coerce = [float(v) for v in value_xml_split]
+                        except ValueError:  # bool vector property
+                            value_xml_coerce = [{'TRUE': True, 'FALSE': False}[v] for v in value_xml_split]
+                    del value_xml_split
+                tp_name = 'ARRAY'
 
-        for attr in xml_node.attributes.keys():
-            # print("  ", attr)
-            subvalue = getattr(value, attr, Ellipsis)
+#            print("  %s.%s (%s) --- %s" % (type(value).__name__, attr, tp_name, subvalue_type))
+            try:
+                setattr(value, attr, value_xml_coerce)
+            except ValueError:
+                # size mismatch
+                val = getattr(value, attr)
+                if len(val) < len(value_xml_coerce):
+                    setattr(value, attr, value_xml_coerce[:len(val)])
+                else:
+                    setattr(value, attr, list(value_xml_coerce) + list(val)[len(value_xml_coerce):])
 
-            if subvalue is Ellipsis:
-                print("%s.%s not found" % (type(value).__name__, attr))
-            else:
-                value_xml = xml_node.attributes[attr].value
-
-                subvalue_type = type(subvalue)
-                tp_name = 'UNKNOWN'
-                if subvalue_type == float:
-                    value_xml_coerce = float(value_xml)
-                    tp_name = 'FLOAT'
-                elif subvalue_type == int:
-                    value_xml_coerce = int(value_xml)
-                    tp_name = 'INT'
-                elif subvalue_type == bool:
-                    value_xml_coerce = {'TRUE': True, 'FALSE': False}[value_xml]
-                    tp_name = 'BOOL'
-                elif subvalue_type == str:
-                    value_xml_coerce = value_xml
-                    tp_name = 'STR'
-                elif hasattr(subvalue, "__len__"):
-                    if value_xml.startswith("#"):
-                        # read hexadecimal value as float array
-                        value_xml_split = value_xml[1:]
-                        value_xml_coerce = [int(value_xml_split[i:i + 2], 16) /
-                                            255 for i in range(0, len(value_xml_split), 2)]
-                        del value_xml_split
-                    else:
-                        value_xml_split = value_xml.split()
-                        try:
-                            value_xml_coerce = [int(v) for v in value_xml_split]
-                        except ValueError:
-                            try:
-                                value_xml_coerce = [float(v) for v in value_xml_split]
-                            except ValueError:  # bool vector property
-                                value_xml_coerce = [{'TRUE': True, 'FALSE': False}[v] for v in value_xml_split]
-                        del value_xml_split
-                    tp_name = 'ARRAY'
-
-#                print("  %s.%s (%s) --- %s" % (type(value).__name__, attr, tp_name, subvalue_type))
-                try:
-                    setattr(value, attr, value_xml_coerce)
-                except ValueError:
-                    # size mismatch
-                    val = getattr(value, attr)
-                    if len(val) < len(value_xml_coerce):
-                        setattr(value, attr, value_xml_coerce[:len(val)])
-                    else:
-                        setattr(value, attr, list(value_xml_coerce) + list(val)[len(value_xml_coerce):])
 
-        # ---------------------------------------------------------------------
-        # Complex attributes
-        for child_xml in xml_node.childNodes:
-            if child_xml.nodeType == child_xml.ELEMENT_NODE:
-                # print()
-                # print(child_xml.nodeName)
-                subvalue = getattr(value, child_xml.nodeName, None)
-                if subvalue is not None:
+def _xml2rna_collection(child_xml, subvalue):
+    # Load the items of a collection from the nodes of a complete element,
+    # nothing is loaded when their number doesn't match.
+    elems = list(child_xml)
+    if len(elems) != len(subvalue):
+        print("Size Mismatch! collection:", child_xml.tag)
+        return
 
-                    elems = []
-                    for child_xml_real in child_xml.childNodes:
-                        if child_xml_real.nodeType == child_xml_real.ELEMENT_NODE:
-                            elems.append(child_xml_real)
-                    del child_xml_real
+    for i, child_xml_real in enumerate(elems):
+        subsubvalue = subvalue[i]
+        if subsubvalue is None:
+            print("None found %s - %d collection:", (child_xml.tag, i))
+        else:
+            xml2rna(child_xml_real, root_rna=subsubvalue)
 
-                    if hasattr(subvalue, "__len__"):
-                        # Collection
-                        if len(elems) != len(subvalue):
-                            print("Size Mismatch! collection:", child_xml.nodeName)
-                        else:
-                            for i in range(len(elems)):
-                                child_xml_real = elems[i]
-                                subsubvalue = subvalue[i]
 
-                                if child_xml_real is None or subsubvalue is None:
-                                    print("None found %s - %d collection:", (child_xml.nodeName, i))
-                                else:
-                                    rna2xml_node(child_xml_real, subsubvalue)
+def xml2rna(root_xml,
+            root_rna=None,  # must be set
+            ):
+    """
+    Load a value from an element written by ``rna2xml``.
 
-                    else:
-                        # print(elems)
+    :arg root_xml: The element, a ``xml.dom.minidom`` node is also supported.
+    :type root_xml: :class:`xml.etree.ElementTree.Element`
+    """
 
-                        if len(elems) == 1:
-                            # sub node named by its type
-                            child_xml_real, = elems
+    if hasattr(root_xml, "nodeType"):
+        import xml.etree.ElementTree as ET
+        root_xml = ET.fromstring(root_xml.toxml())
 
-                            # print(child_xml_real, subvalue)
-                            rna2xml_node(child_xml_real, subvalue)
-                        else:
-                            # empty is valid too
-                            pass
+    # Nodes to load '(xml_node, value)', using a stack instead of recursion.
+    stack = [(root_xml, root_rna)]
+    while stack:
+        xml_node, value = stack.pop()
+        # print("evaluating:", xml_node.tag)
+
+        # ---------------------------------------------------------------------
+        # Simple attributes
+        _xml2rna_attrs(xml_node.attrib, value)
 
-    rna2xml_node(root_xml, root_rna)
+        # ---------------------------------------------------------------------
+        # Complex attributes
+        nodes_next = []
+        for child_xml in xml_node:
+            subvalue = getattr(value, child_xml.tag, None)
+            if subvalue is None:
+                continue
+
+            if hasattr(subvalue, "__len__"):
+                # Collection
+                _xml2rna_collection(child_xml, subvalue)
+            else:
+                elems = list(child_xml)
+                if len(elems) == 1:
+                    # sub node named by its type
+                    nodes_next.append((elems[0], subvalue))
+                else:
+                    # empty is valid too
+                    pass
+
+        # Load in the order of the document.
+        stack.extend(reversed(nodes_next))
 
 
 # -----------------------------------------------------------------------------
@@ -368,42 +485,85 @@ def _get_context_val(context, path):
 
 
 def xml_file_run(context, filepath, rna_map):
+    """
+    Load the values of ``rna_map`` from the first element of their tag,
+    applying the elements while the file is read.
 
-    import xml.dom.minidom
-
-    xml_nodes = xml.dom.minidom.parse(filepath)
-    bpy_xml = xml_nodes.getElementsByTagName("bpy")[0]
+    :raises ValueError: when the file has no element for a tag of ``rna_map``.
+    """
+    import xml.etree.ElementTree as ET
 
+    tag_rna_paths = {}
     for rna_path, xml_tag in rna_map:
+        tag_rna_paths.setdefault(xml_tag, rna_path)
+
+    # Open elements, as '(kind, value)':
+    # - 'STRUCT': a node read into 'value', its children are properties.
+    # - 'POINTER': a property, 'value' is read from its child node
+    #   (None once read).
+    # - 'COLLECTION': a property, read once the element is complete
+    #   since the number of items must match.
+    # - 'ITEM': nodes within a collection.
+    # - 'SKIP': nodes which aren't read.
+    stack = []
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            kind, value = stack[-1] if stack else ('SKIP', None)
+            frame = ('SKIP', None)
+            if kind in {'COLLECTION', 'ITEM'}:
+                frame = ('ITEM', None)
+            elif kind == 'STRUCT':
+                subvalue = getattr(value, elem.tag, None)
+                if subvalue is not None:
+                    if hasattr(subvalue, "__len__"):
+                        frame = ('COLLECTION', subvalue)
+                    else:
+                        frame = ('POINTER', subvalue)
+            elif kind == 'POINTER':
+                # sub node named by its type
+                if value is not None:
+                    stack[-1] = ('POINTER', None)
+                    _xml2rna_attrs(elem.attrib, value)
+                    frame = ('STRUCT', value)
+            elif elem.tag in tag_rna_paths:
+                rna_path = tag_rna_paths.pop(elem.tag)
+                value = _get_context_val(context, rna_path)
+                if value is not Ellipsis and value is not None:
+                    print("  loading XML: %r -> %r" % (filepath, rna_path))
+                    _xml2rna_attrs(elem.attrib, value)
+                    frame = ('STRUCT', value)
+            stack.append(frame)
+        else:
+            kind, value = stack.pop()
+            if kind == 'COLLECTION':
+                _xml2rna_collection(elem, value)
+            # Keep memory use flat, items are read with their collection.
+            if kind != 'ITEM':
+                elem.clear()
 
-        # first get xml
-        # TODO, error check
-        xml_node = bpy_xml.getElementsByTagName(xml_tag)[0]
-
-        value = _get_context_val(context, rna_path)
-
-        if value is not Ellipsis and value is not None:
-            print("  loading XML: %r -> %r" % (filepath, rna_path))
-            xml2rna(xml_node, root_rna=value)
+    if tag_rna_paths:
+        raise ValueError("XML file %r has no element for: %s" % (
+            filepath,
+            ", ".join("%s (%s)" % (xml_tag, rna_path) for xml_tag, rna_path in tag_rna_paths.items()),
+        ))
 
 
 def xml_file_write(context, filepath, rna_map, skip_typemap=None):
 
-    file = open(filepath, "w", encoding="utf-8")
-    fw = file.write
+    with open(filepath, "w", encoding="utf-8") as file:
+        fw = file.write
 
-    fw("<bpy>\n")
+        fw("<bpy>\n")
 
-    for rna_path, _xml_tag in rna_map:
-        # xml_tag is ignored, we get this from the rna
-        value = _get_context_val(context, rna_path)
-        rna2xml(fw,
-                root_rna=value,
-                method='ATTR',
-                root_ident="  ",
-                ident_val="  ",
-                skip_typemap=skip_typemap,
-                )
+        for rna_path, _xml_tag in rna_map:
+            # xml_tag is ignored, we get this from the rna
+            value = _get_context_val(context, rna_path)
+            rna2xml(fw,
+                    root_rna=value,
+                    method='ATTR',
+                    root_ident="  ",
+                    ident_val="  ",
+                    skip_typemap=skip_typemap,
+                    )
 
-    fw("</bpy>\n")
-    file.close()
+        fw("</bpy>\n")
@@ -202,44 +202,61 @@ class Prefs(bpy.types.KeyConfigPreferences):
         sub.prop(self, "use_v3d_shade_ex_pie")
 
 
-blender_default = bpy.utils.execfile(os.path.join(DIRNAME, "keymap_data", "blender_default.py"))
-
-
 def load():
     from sys import platform
     from bpy import context
     from bl_keymap_utils.io import keyconfig_init_from_data
+    from bl_keymap_utils.keyconfig_cache import keyconfig_data_cached
 
     prefs = context.preferences
     kc = context.window_manager.keyconfigs.new(IDNAME)
     kc_prefs = kc.preferences
 
-    keyconfig_data = blender_default.generate_keymaps(
-        blender_default.Params(
-            select_mouse=kc_prefs.select_mouse,
-            use_mouse_emulate_3_button=(
-                prefs.inputs.use_mouse_emulate_3_button and
-                prefs.inputs.mouse_emulate_3_button_modifier == 'ALT'
-            ),
-            spacebar_action=kc_prefs.spacebar_action,
-            v3d_tilde_action=kc_prefs.v3d_tilde_action,
-            use_v3d_mmb_pan=(kc_prefs.v3d_mmb_action == 'PAN'),
-            v3d_alt_mmb_drag_action=kc_prefs.v3d_alt_mmb_drag_action,
-            use_select_all_toggle=kc_prefs.use_select_all_toggle,
-            use_v3d_tab_menu=kc_prefs.use_v3d_tab_menu,
-            use_v3d_shade_ex_pie=kc_prefs.use_v3d_shade_ex_pie,
-            use_gizmo_drag=(
-                kc_prefs.select_mouse == 'LEFT' and
-                kc_prefs.gizmo_action == 'DRAG'
-            ),
-            use_alt_click_leader=kc_prefs.use_alt_click_leader,
-            use_pie_click_drag=kc_prefs.use_pie_click_drag,
+    params_kw = dict(
+        select_mouse=kc_prefs.select_mouse,
+        use_mouse_emulate_3_button=(
+            prefs.inputs.use_mouse_emulate_3_button and
+            prefs.inputs.mouse_emulate_3_button_modifier == 'ALT'
+        ),
+        spacebar_action=kc_prefs.spacebar_action,
+        v3d_tilde_action=kc_prefs.v3d_tilde_action,
+        use_v3d_mmb_pan=(kc_prefs.v3d_mmb_action == 'PAN'),
+        v3d_alt_mmb_drag_action=kc_prefs.v3d_alt_mmb_drag_action,
+        use_select_all_toggle=kc_prefs.use_select_all_toggle,
+        use_v3d_tab_menu=kc_prefs.use_v3d_tab_menu,
+        use_v3d_shade_ex_pie=kc_prefs.use_v3d_shade_ex_pie,
+        use_gizmo_drag=(
+            kc_prefs.select_mouse == 'LEFT' and
+            kc_prefs.gizmo_action == 'DRAG'
         ),
+        use_alt_click_leader=kc_prefs.use_alt_click_leader,
+        use_pie_click_drag=kc_prefs.use_pie_click_drag,
     )
 
+    blender_default_filepath = os.path.join(DIRNAME, "keymap_data", "blender_default.py")
+
+    def keyconfig_data_generate():
+        # Only executed when the data isn't cached, this module is large.
+        blender_default = bpy.utils.execfile(blender_default_filepath)
+        keyconfig_data = blender_default.generate_keymaps(blender_default.Params(**params_kw))
+
+        if platform == 'darwin':
+            from bl_keymap_utils.platform_helpers import keyconfig_data_oskey_from_ctrl_for_macos
+            keyconfig_data = keyconfig_data_oskey_from_ctrl_for_macos(keyconfig_data)
+
+        return keyconfig_data
+
+    source_filepaths = [blender_default_filepath]
     if platform == 'darwin':
-        from bl_keymap_utils.platform_helpers import keyconfig_data_oskey_from_ctrl_for_macos
-        keyconfig_data = keyconfig_data_oskey_from_ctrl_for_macos(keyconfig_data)
+        import bl_keymap_utils.platform_helpers
+        source_filepaths.append(bl_keymap_utils.platform_helpers.__file__)
+
+    keyconfig_data = keyconfig_data_cached(
+        IDNAME,
+        source_filepaths,
+        (platform, tuple(sorted(params_kw.items()))),
+        keyconfig_data_generate,
+    )
 
     keyconfig_init_from_data(kc, keyconfig_data)
 
@@ -53,18 +53,27 @@ _modules = [
 ]
 
 import bpy
+import bl_lazy_register_utils
 
 if bpy.app.build_options.freestyle:
     _modules.append("freestyle")
 
-__import__(name=__name__, fromlist=_modules)
-_namespace = globals()
-_modules_loaded = [_namespace[name] for name in _modules]
-del _namespace
+# In background mode modules may be loaded on first use instead.
+_use_lazy_register = bl_lazy_register_utils.is_enabled()
+
+if _use_lazy_register:
+    _modules_loaded = bl_lazy_register_utils.package_modules_imported(__name__, _modules)
+else:
+    __import__(name=__name__, fromlist=_modules)
+    _namespace = globals()
+    _modules_loaded = [_namespace[name] for name in _modules]
+    del _namespace
 
 
 def register():
     from bpy.utils import register_class
+    if _use_lazy_register:
+        bl_lazy_register_utils.package_register(__name__, _modules, _modules_loaded)
     for mod in _modules_loaded:
         for cls in mod.classes:
             register_class(cls)
@@ -72,6 +81,8 @@ def register():
 
 def unregister():
     from bpy.utils import unregister_class
+    if _use_lazy_register:
+        bl_lazy_register_utils.package_unregister(__name__)
     for mod in reversed(_modules_loaded):
         for cls in reversed(mod.classes):
             if cls.is_registered:
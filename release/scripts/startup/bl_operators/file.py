@@ -23,6 +23,7 @@ from bpy.types import Operator
 from bpy.props import (
     BoolProperty,
     CollectionProperty,
+    IntProperty,
     StringProperty,
 )
 
@@ -91,6 +92,18 @@ class WM_OT_previews_batch_generate(Operator):
         name="Save Backups",
         description="Keep a backup (.blend1) version of the files when saving with generated previews",
     )
+    use_skip_unchanged: BoolProperty(
+        default=False,
+        name="Skip Unchanged Files",
+        description="Skip files which were not modified since their previews were generated with the same options",
+    )
+    processes: IntProperty(
+        default=1,
+        min=1,
+        max=64,
+        name="Processes",
+        description="Number of Blender processes generating previews at once",
+    )
 
     def invoke(self, context, _event):
         context.window_manager.fileselect_add(self)
@@ -98,43 +111,35 @@ class WM_OT_previews_batch_generate(Operator):
 
     def execute(self, context):
         import os
-        import subprocess
-        from bl_previews_utils import bl_previews_render as preview_render
-
-        context.window_manager.progress_begin(0, len(self.files))
-        context.window_manager.progress_update(0)
-        for i, fn in enumerate(self.files):
-            blen_path = os.path.join(self.directory, fn.name)
-            cmd = [
-                bpy.app.binary_path,
-                "--background",
-                "--factory-startup",
-                "-noaudio",
-            ]
-            if self.use_trusted:
-                cmd.append("--enable-autoexec")
-            cmd.extend([
-                blen_path,
-                "--python",
-                os.path.join(os.path.dirname(preview_render.__file__), "bl_previews_render.py"),
-                "--",
-            ])
-            if not self.use_scenes:
-                cmd.append('--no_scenes')
-            if not self.use_collections:
-                cmd.append('--no_collections')
-            if not self.use_objects:
-                cmd.append('--no_objects')
-            if not self.use_intern_data:
-                cmd.append('--no_data_intern')
-            if not self.use_backups:
-                cmd.append("--no_backups")
-            if subprocess.call(cmd):
-                self.report({'ERROR'}, "Previews generation process failed for file '%s'!" % blen_path)
-                context.window_manager.progress_end()
-                return {'CANCELLED'}
-            context.window_manager.progress_update(i + 1)
-        context.window_manager.progress_end()
+        from bl_previews_utils import bl_previews_batch
+
+        args = []
+        if not self.use_scenes:
+            args.append('--no_scenes')
+        if not self.use_collections:
+            args.append('--no_collections')
+        if not self.use_objects:
+            args.append('--no_objects')
+        if not self.use_intern_data:
+            args.append('--no_data_intern')
+        if not self.use_backups:
+            args.append("--no_backups")
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self.files))
+        blen_path_failed = bl_previews_batch.process(
+            [os.path.join(self.directory, fn.name) for fn in self.files],
+            args,
+            use_trusted=self.use_trusted,
+            use_skip_unchanged=self.use_skip_unchanged,
+            processes=self.processes,
+            progress_update=wm.progress_update,
+        )
+        wm.progress_end()
+
+        if blen_path_failed is not None:
+            self.report({'ERROR'}, "Previews generation process failed for file '%s'!" % blen_path_failed)
+            return {'CANCELLED'}
 
         return {'FINISHED'}
 
@@ -201,6 +206,13 @@ class WM_OT_previews_batch_clear(Operator):
         name="Save Backups",
         description="Keep a backup (.blend1) version of the files when saving with cleared previews",
     )
+    processes: IntProperty(
+        default=1,
+        min=1,
+        max=64,
+        name="Processes",
+        description="Number of Blender processes clearing previews at once",
+    )
 
     def invoke(self, context, _event):
         context.window_manager.fileselect_add(self)
@@ -208,44 +220,34 @@ class WM_OT_previews_batch_clear(Operator):
 
     def execute(self, context):
         import os
-        import subprocess
-        from bl_previews_utils import bl_previews_render as preview_render
-
-        context.window_manager.progress_begin(0, len(self.files))
-        context.window_manager.progress_update(0)
-        for i, fn in enumerate(self.files):
-            blen_path = os.path.join(self.directory, fn.name)
-            cmd = [
-                bpy.app.binary_path,
-                "--background",
-                "--factory-startup",
-                "-noaudio",
-            ]
-            if self.use_trusted:
-                cmd.append("--enable-autoexec")
-            cmd.extend([
-                blen_path,
-                "--python",
-                os.path.join(os.path.dirname(preview_render.__file__), "bl_previews_render.py"),
-                "--",
-                "--clear",
-            ])
-            if not self.use_scenes:
-                cmd.append('--no_scenes')
-            if not self.use_collections:
-                cmd.append('--no_collections')
-            if not self.use_objects:
-                cmd.append('--no_objects')
-            if not self.use_intern_data:
-                cmd.append('--no_data_intern')
-            if not self.use_backups:
-                cmd.append("--no_backups")
-            if subprocess.call(cmd):
-                self.report({'ERROR'}, "Previews clear process failed for file '%s'!" % blen_path)
-                context.window_manager.progress_end()
-                return {'CANCELLED'}
-            context.window_manager.progress_update(i + 1)
-        context.window_manager.progress_end()
+        from bl_previews_utils import bl_previews_batch
+
+        args = ["--clear"]
+        if not self.use_scenes:
+            args.append('--no_scenes')
+        if not self.use_collections:
+            args.append('--no_collections')
+        if not self.use_objects:
+            args.append('--no_objects')
+        if not self.use_intern_data:
+            args.append('--no_data_intern')
+        if not self.use_backups:
+            args.append("--no_backups")
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self.files))
+        blen_path_failed = bl_previews_batch.process(
+            [os.path.join(self.directory, fn.name) for fn in self.files],
+            args,
+            use_trusted=self.use_trusted,
+            processes=self.processes,
+            progress_update=wm.progress_update,
+        )
+        wm.progress_end()
+
+        if blen_path_failed is not None:
+            self.report({'ERROR'}, "Previews clear process failed for file '%s'!" % blen_path_failed)
+            return {'CANCELLED'}
 
         return {'FINISHED'}
 
@@ -27,6 +27,67 @@ from bpy.props import (
 )
 
 
+def _spatial_hash_pairs(co_query, co, tolerance):
+    """
+    Find pairs of query and point indices within tolerance on all axes,
+    using points hashed by the cells of a grid.
+    """
+    import numpy as np
+    from itertools import product
+
+    # Cells are at least twice as large as the tolerance so pairs are always
+    # in the same cell or the one on the nearest side on each axis,
+    # while keeping cell indices in 64 bit integers.
+    cell_size = max(
+        tolerance * 2.0,
+        np.abs(co).max(initial=0.0) * 2.0 ** -20,
+    )
+
+    def cell_hash(cells):
+        return (
+            (cells[:, 0] * 73856093) ^
+            (cells[:, 1] * 19349663) ^
+            (cells[:, 2] * 83492791)
+        )
+
+    point_hash = cell_hash(np.floor(co / cell_size).astype(np.int64))
+    point_order = np.argsort(point_hash)
+    point_hash = point_hash[point_order]
+
+    query_cells = co_query / cell_size
+    query_side = np.where(query_cells % 1.0 < 0.5, -1, 1)
+    query_cells = np.floor(query_cells).astype(np.int64)
+
+    # Pairs stored as 'query * len(co) + point'.
+    pairs = [np.empty(0, dtype=np.int64)]
+    for use_side in product((False, True), repeat=3):
+        query_hash = cell_hash(query_cells + query_side * use_side)
+        # Sorted queries are much faster to search.
+        query = np.argsort(query_hash)
+        query_hash = query_hash[query]
+        hash_start = np.searchsorted(point_hash, query_hash, side='left')
+        hash_end = np.searchsorted(point_hash, query_hash, side='right')
+        found = hash_end > hash_start
+        query = query[found]
+        hash_start = hash_start[found]
+        hash_end = hash_end[found]
+        # One point of each cell at a time, cells rarely have many points.
+        while len(query):
+            point = point_order[hash_start]
+            near = (
+                np.abs(co[point] - co_query[query]) <= tolerance
+            ).all(axis=1)
+            pairs.append(query[near] * len(co) + point[near])
+            hash_start += 1
+            more = hash_start < hash_end
+            query = query[more]
+            hash_start = hash_start[more]
+            hash_end = hash_end[more]
+
+    # Hash collisions may find the same pair in different cells.
+    return np.divmod(np.unique(np.concatenate(pairs)), len(co))
+
+
 class MeshMirrorUV(Operator):
     """Copy mirror UV coordinates on the X axis based on a mirrored mesh"""
     bl_idname = "mesh.faces_mirror_uv"
@@ -51,90 +112,102 @@ class MeshMirrorUV(Operator):
 
     # Returns has_active_UV_layer, double_warn.
     def do_mesh_mirror_UV(self, mesh, DIR):
-        precision = self.precision
-        double_warn = 0
+        import numpy as np
 
         if not mesh.uv_layers.active:
             # has_active_UV_layer, double_warn
             return False, 0
 
-        # mirror lookups
-        mirror_gt = {}
-        mirror_lt = {}
-
-        vcos = (v.co.to_tuple(precision) for v in mesh.vertices)
-
-        for i, co in enumerate(vcos):
-            if co[0] >= 0.0:
-                double_warn += co in mirror_gt
-                mirror_gt[co] = i
-            if co[0] <= 0.0:
-                double_warn += co in mirror_lt
-                mirror_lt[co] = i
-
-        vmap = {}
-        for mirror_a, mirror_b in ((mirror_gt, mirror_lt),
-                                   (mirror_lt, mirror_gt)):
-            for co, i in mirror_a.items():
-                nco = (-co[0], co[1], co[2])
-                j = mirror_b.get(nco)
-                if j is not None:
-                    vmap[i] = j
+        tolerance = 10.0 ** -self.precision
+
+        vert_len = len(mesh.vertices)
+        vcos = np.empty(vert_len * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", vcos)
+        vcos = vcos.reshape(vert_len, 3).astype(np.float64)
+
+        # Vertices with a lower index one within tolerance.
+        vi, vj = _spatial_hash_pairs(vcos, vcos, tolerance)
+        double_warn = len(np.unique(vi[vj < vi]))
+
+        # Mirror lookups, the nearest vertex to the mirrored location,
+        # the highest index one of vertices at the same distance.
+        vi, vj = _spatial_hash_pairs(vcos * (-1.0, 1.0, 1.0), vcos, tolerance)
+        vdist = np.abs(vcos[vj] * (-1.0, 1.0, 1.0) - vcos[vi]).max(axis=1)
+        order = np.lexsort((-vj, vdist, vi))
+        vi = vi[order]
+        vj = vj[order]
+        first = np.ones(len(vi), dtype=bool)
+        first[1:] = vi[1:] != vi[:-1]
+        vmap = np.full(vert_len, -1, dtype=np.int64)
+        vmap[vi[first]] = vj[first]
+        del vi, vj, vdist, order, first
 
         polys = mesh.polygons
-        loops = mesh.loops
-        uv_loops = mesh.uv_layers.active.data
         nbr_polys = len(polys)
+        poly_loop_starts = np.empty(nbr_polys, dtype=np.int32)
+        polys.foreach_get("loop_start", poly_loop_starts)
+        poly_loop_totals = np.empty(nbr_polys, dtype=np.int32)
+        polys.foreach_get("loop_total", poly_loop_totals)
 
-        mirror_pm = {}
-        pmap = {}
-        puvs = [None] * nbr_polys
-        puvs_cpy = [None] * nbr_polys
-        puvsel = [None] * nbr_polys
-        pcents = [None] * nbr_polys
-        vidxs = [None] * nbr_polys
-        for i, p in enumerate(polys):
-            lstart = lend = p.loop_start
-            lend += p.loop_total
-            puvs[i] = tuple(uv.uv for uv in uv_loops[lstart:lend])
-            puvs_cpy[i] = tuple(uv.copy() for uv in puvs[i])
-            puvsel[i] = (False not in
-                         (uv.select for uv in uv_loops[lstart:lend]))
-            # Vert idx of the poly.
-            vidxs[i] = tuple(l.vertex_index for l in loops[lstart:lend])
-            pcents[i] = p.center
-            # Preparing next step finding matching polys.
-            mirror_pm[tuple(sorted(vidxs[i]))] = i
-
-        for i in range(nbr_polys):
-            # Find matching mirror poly.
-            tvidxs = [vmap.get(j) for j in vidxs[i]]
-            if None not in tvidxs:
-                tvidxs.sort()
-                j = mirror_pm.get(tuple(tvidxs))
-                if j is not None:
-                    pmap[i] = j
-
-        for i, j in pmap.items():
-            if not puvsel[i] or not puvsel[j]:
-                continue
-            elif DIR == 0 and pcents[i][0] < 0.0:
-                continue
-            elif DIR == 1 and pcents[i][0] > 0.0:
-                continue
+        nbr_loops = len(mesh.loops)
+        loop_verts = np.empty(nbr_loops, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
 
-            # copy UVs
-            uv1 = puvs[i]
-            uv2 = puvs_cpy[j]
+        uv_loops = mesh.uv_layers.active.data
+        uvs = np.empty(nbr_loops * 2, dtype=np.float32)
+        uv_loops.foreach_get("uv", uvs)
+        uvs = uvs.reshape(nbr_loops, 2)
+        uvsel = np.empty(nbr_loops, dtype=bool)
+        uv_loops.foreach_get("select", uvsel)
+        uvs_mirror = uvs.copy()
+
+        # Only polygons with the same number of vertices can match.
+        for loop_total in np.unique(poly_loop_totals):
+            group = np.flatnonzero(poly_loop_totals == loop_total)
+            ploops = (
+                poly_loop_starts[group, np.newaxis] + np.arange(loop_total)
+            )
+            vidxs = loop_verts[ploops]
+            tvidxs = vmap[vidxs]
+
+            # Find matching mirror polys, using sorted vertex indices keys.
+            has_mirror = np.flatnonzero((tvidxs != -1).all(axis=1))
+            keys = np.concatenate((
+                np.sort(vidxs, axis=1),
+                np.sort(tvidxs[has_mirror], axis=1),
+            ))
+            _, key_ids = np.unique(keys, axis=0, return_inverse=True)
+            key_ids = key_ids.ravel()
+            key_polys = np.full(key_ids.max() + 1, -1, dtype=np.int64)
+            # Last polygon of each key, as when stored in a dictionary.
+            np.maximum.at(
+                key_polys, key_ids[:len(group)], np.arange(len(group)),
+            )
+            pmap = key_polys[key_ids[len(group):]]
+            i = has_mirror[pmap != -1]
+            j = pmap[pmap != -1]
+
+            puvsel = uvsel[ploops].all(axis=1)
+            pcents_x = vcos[vidxs, 0].mean(axis=1)
+            use = puvsel[i] & puvsel[j]
+            if DIR == 0:
+                use &= ~(pcents_x[i] < 0.0)
+            else:
+                use &= ~(pcents_x[i] > 0.0)
+            i = i[use]
+            j = j[use]
 
             # get the correct rotation
-            v1 = vidxs[j]
-            v2 = tuple(vmap[k] for k in vidxs[i])
-
-            if len(v1) == len(v2):
-                for k in range(len(v1)):
-                    k_map = v1.index(v2[k])
-                    uv1[k].xy = - (uv2[k_map].x - 0.5) + 0.5, uv2[k_map].y
+            k_map = (
+                vidxs[j][:, np.newaxis, :] == tvidxs[i][:, :, np.newaxis]
+            ).argmax(axis=2)
+            uv2 = uvs[np.take_along_axis(ploops[j], k_map, axis=1)]
+            uv1 = uvs_mirror[ploops[i]]
+            uv1[..., 0] = -(uv2[..., 0] - 0.5) + 0.5
+            uv1[..., 1] = uv2[..., 1]
+            uvs_mirror[ploops[i]] = uv1
+
+        uv_loops.foreach_set("uv", uvs_mirror.ravel())
 
         # has_active_UV_layer, double_warn
         return True, double_warn
@@ -332,6 +332,11 @@ class ShapeTransfer(Operator):
              "Relative Edge",
              "Calculate relative position (using edges)",
              ),
+            ('NEAREST_SURFACE',
+             "Nearest Surface",
+             "Apply the offset of the nearest point on the other surface "
+             "(vertex count may differ)",
+             ),
         ),
         name="Transformation Mode",
         description="Relative shape positions to the new shape method",
@@ -345,12 +350,19 @@ class ShapeTransfer(Operator):
     )
 
     def _main(self, ob_act, objects, mode='OFFSET', use_clamp=False):
+        import numpy as np
 
+        # Vertex data as (len, 3) arrays,
+        # calculations are done for all vertices, edges or corners at once.
         def me_nos(verts):
-            return [v.normal.copy() for v in verts]
+            nos = np.empty(len(verts) * 3, dtype=np.float32)
+            verts.foreach_get("normal", nos)
+            return nos.reshape(-1, 3).astype(np.float64)
 
         def me_cos(verts):
-            return [v.co.copy() for v in verts]
+            cos = np.empty(len(verts) * 3, dtype=np.float32)
+            verts.foreach_get("co", cos)
+            return cos.reshape(-1, 3).astype(np.float64)
 
         def ob_add_shape(ob, name):
             me = ob.data
@@ -362,10 +374,92 @@ class ShapeTransfer(Operator):
             ob.active_shape_key_index = len(me.shape_keys.key_blocks) - 1
             ob.show_only_shape_key = True
 
-        from mathutils.geometry import barycentric_transform
-        from mathutils import Vector
-
-        if use_clamp and mode == 'OFFSET':
+        def vecs_dot(a, b):
+            return np.einsum("ij,ij->i", a, b)
+
+        def vecs_length(a):
+            return np.sqrt(vecs_dot(a, a))
+
+        def tris_cross(v1, v2, v3):
+            # Same as 'normal_tri_v3' before normalizing.
+            return np.cross(v1 - v2, v2 - v3)
+
+        def barycentric_weights(pt, v1, v2, v3, no):
+            # Weights of points projected on the plane of their triangle.
+            w = np.stack((
+                vecs_dot(np.cross(v2 - pt, v3 - pt), no),
+                vecs_dot(np.cross(v3 - pt, v1 - pt), no),
+                vecs_dot(np.cross(v1 - pt, v2 - pt), no),
+            ), axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                w /= w.sum(axis=1)[:, np.newaxis]
+            # Dummy values for zero area face.
+            w[~np.isfinite(w).all(axis=1)] = 1.0 / 3.0
+            return w
+
+        def barycentric_transform(pt, a1, a2, a3, b1, b2, b3):
+            # Same as 'mathutils.geometry.barycentric_transform'
+            # for arrays of points and triangles.
+            cross_a = tris_cross(a1, a2, a3)
+            cross_b = tris_cross(b1, b2, b3)
+            area_a = vecs_length(cross_a)
+            area_b = vecs_length(cross_b)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                no_a = np.nan_to_num(cross_a / area_a[:, np.newaxis])
+                no_b = np.nan_to_num(cross_b / area_b[:, np.newaxis])
+                w = barycentric_weights(pt, a1, a2, a3, no_a)
+                z_ofs = vecs_dot(pt - a1, no_a)
+                # Zero area source triangles give non-finite results,
+                # as with the single point version.
+                z_scale = np.sqrt(area_b * 0.5) / np.sqrt(area_a * 0.5)
+                return (
+                    w[:, 0:1] * b1 + w[:, 1:2] * b2 + w[:, 2:3] * b3 +
+                    no_b * (z_ofs * z_scale)[:, np.newaxis]
+                )
+
+        def nearest_surface_map(ob_other, target_coords):
+            # Vertices and weights of the nearest point on the original
+            # basis surface for each target vertex, calculated once
+            # so offsets of any shape can be applied with few operations.
+            from mathutils.bvhtree import BVHTree
+
+            me.calc_loop_triangles()
+            tris = np.empty(len(me.loop_triangles) * 3, dtype=np.int32)
+            me.loop_triangles.foreach_get("vertices", tris)
+            tris = tris.reshape(-1, 3)
+            bvh = BVHTree.FromPolygons(
+                orig_coords.tolist(), tris.tolist(), all_triangles=True,
+            )
+
+            # Search in the original object space.
+            matrix = np.array(
+                ob_act.matrix_world.inverted_safe() @ ob_other.matrix_world
+            )
+            cos = target_coords @ matrix[:3, :3].T + matrix[:3, 3]
+            locs = np.empty_like(cos)
+            tri_idxs = np.empty(len(cos), dtype=np.int64)
+            for i, co in enumerate(cos.tolist()):
+                locs[i], _no, tri_idxs[i], _dist = bvh.find_nearest(co)
+            del bvh, cos
+
+            tri_verts = tris[tri_idxs]
+            v1, v2, v3 = (orig_coords[tri_verts[:, k]] for k in range(3))
+            cross = tris_cross(v1, v2, v3)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                no = np.nan_to_num(cross / vecs_length(cross)[:, np.newaxis])
+            w = barycentric_weights(locs, v1, v2, v3, no)
+            # Offsets are transformed back into the target object space.
+            return tri_verts, w, np.linalg.pinv(matrix[:3, :3]).T
+
+        def nearest_surface_apply(surface_map, shape_coords, target_coords):
+            tri_verts, w, matrix = surface_map
+            offsets = shape_coords - orig_coords
+            ofs = sum(
+                w[:, k:k + 1] * offsets[tri_verts[:, k]] for k in range(3)
+            )
+            return target_coords + ofs @ matrix
+
+        if use_clamp and mode in {'OFFSET', 'NEAREST_SURFACE'}:
             use_clamp = False
 
         me = ob_act.data
@@ -378,6 +472,40 @@ class ShapeTransfer(Operator):
         # orig_coords = me_cos(me.vertices)
         orig_coords = me_cos(me.shape_keys.key_blocks[0].data)
 
+        if mode == 'RELATIVE_FACE':
+            # Vertices before and after each polygon corner.
+            poly_loop_starts = np.empty(len(me.polygons), dtype=np.int32)
+            me.polygons.foreach_get("loop_start", poly_loop_starts)
+            poly_loop_totals = np.empty(len(me.polygons), dtype=np.int32)
+            me.polygons.foreach_get("loop_total", poly_loop_totals)
+            loop_verts = np.empty(len(me.loops), dtype=np.int32)
+            me.loops.foreach_get("vertex_index", loop_verts)
+
+            corner_starts = np.repeat(poly_loop_starts, poly_loop_totals)
+            corner_totals = np.repeat(poly_loop_totals, poly_loop_totals)
+            corner_index = np.arange(len(corner_starts)) - np.repeat(
+                np.cumsum(poly_loop_totals) - poly_loop_totals,
+                poly_loop_totals,
+            )
+            corner_verts = [
+                loop_verts[
+                    corner_starts +
+                    (corner_index + offset) % corner_totals
+                ]
+                for offset in (-1, 0, 1)
+            ]
+            del corner_starts, corner_totals, corner_index, loop_verts
+
+        elif mode == 'RELATIVE_EDGE':
+            edge_verts = np.empty(len(me.edges) * 2, dtype=np.int32)
+            me.edges.foreach_get("vertices", edge_verts)
+            edge_verts = edge_verts.reshape(-1, 2)
+
+        elif mode == 'NEAREST_SURFACE':
+            if not me.polygons:
+                self.report({'ERROR'}, "Other object has no faces")
+                return {'CANCELLED'}
+
         for ob_other in objects:
             if ob_other.type != 'MESH':
                 self.report({'WARNING'},
@@ -385,7 +513,10 @@ class ShapeTransfer(Operator):
                              "not a mesh") % ob_other.name)
                 continue
             me_other = ob_other.data
-            if len(me_other.vertices) != len(me.vertices):
+            if (
+                    mode != 'NEAREST_SURFACE' and
+                    len(me_other.vertices) != len(me.vertices)
+            ):
                 self.report({'WARNING'},
                             ("Skipping '%s', "
                              "vertex count differs") % ob_other.name)
@@ -399,78 +530,99 @@ class ShapeTransfer(Operator):
 
             ob_add_shape(ob_other, orig_key_name)
 
-            # editing the final coords, only list that stores wrapped coords
-            target_shape_coords = [v.co for v in
-                                   ob_other.active_shape_key.data]
+            # editing the final coords, written back at once
+            target_shape_key = ob_other.active_shape_key.data
+            target_shape_coords = me_cos(target_shape_key)
+
+            # Sum and number of the coordinates to average for each vertex.
+            median_coords = np.zeros_like(target_coords)
+            median_totals = np.zeros(len(target_coords), dtype=np.int64)
 
-            median_coords = [[] for i in range(len(me.vertices))]
+            def median_coords_add(verts, pts):
+                for axis in range(3):
+                    median_coords[:, axis] += np.bincount(
+                        verts, weights=pts[:, axis],
+                        minlength=len(median_coords),
+                    )
+                median_totals[:] += np.bincount(
+                    verts, minlength=len(median_totals),
+                )
 
             # Method 1, edge
             if mode == 'OFFSET':
-                for i, vert_cos in enumerate(median_coords):
-                    vert_cos.append(target_coords[i] +
-                                    (orig_shape_coords[i] - orig_coords[i]))
+                median_coords[:] = target_coords + (
+                    orig_shape_coords - orig_coords
+                )
+                median_totals[:] = 1
 
             elif mode == 'RELATIVE_FACE':
-                for poly in me.polygons:
-                    idxs = poly.vertices[:]
-                    v_before = idxs[-2]
-                    v = idxs[-1]
-                    for v_after in idxs:
-                        pt = barycentric_transform(orig_shape_coords[v],
-                                                   orig_coords[v_before],
-                                                   orig_coords[v],
-                                                   orig_coords[v_after],
-                                                   target_coords[v_before],
-                                                   target_coords[v],
-                                                   target_coords[v_after],
-                                                   )
-                        median_coords[v].append(pt)
-                        v_before = v
-                        v = v_after
+                v_before, v, v_after = corner_verts
+                pt = barycentric_transform(orig_shape_coords[v],
+                                           orig_coords[v_before],
+                                           orig_coords[v],
+                                           orig_coords[v_after],
+                                           target_coords[v_before],
+                                           target_coords[v],
+                                           target_coords[v_after],
+                                           )
+                median_coords_add(v, pt)
 
             elif mode == 'RELATIVE_EDGE':
-                for ed in me.edges:
-                    i1, i2 = ed.vertices
-                    v1, v2 = orig_coords[i1], orig_coords[i2]
-                    edge_length = (v1 - v2).length
-                    n1loc = v1 + orig_normals[i1] * edge_length
-                    n2loc = v2 + orig_normals[i2] * edge_length
-
-                    # now get the target nloc's
-                    v1_to, v2_to = target_coords[i1], target_coords[i2]
-                    edlen_to = (v1_to - v2_to).length
-                    n1loc_to = v1_to + target_normals[i1] * edlen_to
-                    n2loc_to = v2_to + target_normals[i2] * edlen_to
-
-                    pt = barycentric_transform(orig_shape_coords[i1],
-                                               v2, v1, n1loc,
-                                               v2_to, v1_to, n1loc_to)
-                    median_coords[i1].append(pt)
-
-                    pt = barycentric_transform(orig_shape_coords[i2],
-                                               v1, v2, n2loc,
-                                               v1_to, v2_to, n2loc_to)
-                    median_coords[i2].append(pt)
+                i1, i2 = edge_verts[:, 0], edge_verts[:, 1]
+                v1, v2 = orig_coords[i1], orig_coords[i2]
+                edge_length = vecs_length(v1 - v2)[:, np.newaxis]
+                n1loc = v1 + orig_normals[i1] * edge_length
+                n2loc = v2 + orig_normals[i2] * edge_length
+
+                # now get the target nloc's
+                v1_to, v2_to = target_coords[i1], target_coords[i2]
+                edlen_to = vecs_length(v1_to - v2_to)[:, np.newaxis]
+                n1loc_to = v1_to + target_normals[i1] * edlen_to
+                n2loc_to = v2_to + target_normals[i2] * edlen_to
+
+                pt = barycentric_transform(orig_shape_coords[i1],
+                                           v2, v1, n1loc,
+                                           v2_to, v1_to, n1loc_to)
+                median_coords_add(i1, pt)
+
+                pt = barycentric_transform(orig_shape_coords[i2],
+                                           v1, v2, n2loc,
+                                           v1_to, v2_to, n2loc_to)
+                median_coords_add(i2, pt)
+
+            elif mode == 'NEAREST_SURFACE':
+                median_coords[:] = nearest_surface_apply(
+                    nearest_surface_map(ob_other, target_coords),
+                    orig_shape_coords,
+                    target_coords,
+                )
+                median_totals[:] = 1
 
             # apply the offsets to the new shape
-            from functools import reduce
-            VectorAdd = Vector.__add__
-
-            for i, vert_cos in enumerate(median_coords):
-                if vert_cos:
-                    co = reduce(VectorAdd, vert_cos) / len(vert_cos)
-
-                    if use_clamp:
-                        # clamp to the same movement as the original
-                        # breaks copy between different scaled meshes.
-                        len_from = (orig_shape_coords[i] -
-                                    orig_coords[i]).length
-                        ofs = co - target_coords[i]
-                        ofs.length = len_from
-                        co = target_coords[i] + ofs
-
-                    target_shape_coords[i][:] = co
+            has_coords = median_totals != 0
+            co = (
+                median_coords[has_coords] /
+                median_totals[has_coords, np.newaxis]
+            )
+
+            if use_clamp:
+                # clamp to the same movement as the original
+                # breaks copy between different scaled meshes.
+                len_from = vecs_length(
+                    orig_shape_coords[has_coords] - orig_coords[has_coords]
+                )
+                ofs = co - target_coords[has_coords]
+                ofs_len = vecs_length(ofs)
+                ofs_nonzero = ofs_len != 0.0
+                ofs[ofs_nonzero] *= (
+                    len_from[ofs_nonzero] / ofs_len[ofs_nonzero]
+                )[:, np.newaxis]
+                co = target_coords[has_coords] + ofs
+
+            target_shape_coords[has_coords] = co
+            target_shape_key.foreach_set(
+                "co", target_shape_coords.astype(np.float32).ravel(),
+            )
 
         return {'FINISHED'}
 
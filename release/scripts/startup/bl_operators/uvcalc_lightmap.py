@@ -21,6 +21,59 @@
 import bpy
 from bpy.types import Operator
 import mathutils
+from array import array
+
+
+class prettymesh:
+    """
+    Flat arrays of a mesh, read once, UV's are written back at once by ``update``.
+    """
+    __slots__ = (
+        "mesh",
+        "cos",
+        "loop_verts",
+        "loop_edges",
+        "loop_starts",
+        "loop_totals",
+        "uv_layer",
+        "uvs",
+    )
+
+    def __init__(self, me):
+        def data_array(data, attr, typecode, size=1):
+            values = array(typecode, (0,)) * (len(data) * size)
+            data.foreach_get(attr, values)
+            return values
+
+        self.mesh = me
+        self.cos = data_array(me.vertices, "co", 'f', 3)
+        self.loop_verts = data_array(me.loops, "vertex_index", 'i')
+        self.loop_edges = data_array(me.loops, "edge_index", 'i')
+        self.loop_starts = data_array(me.polygons, "loop_start", 'i')
+        self.loop_totals = data_array(me.polygons, "loop_total", 'i')
+        self.uv_layer = me.uv_layers.active.data
+        self.uvs = data_array(self.uv_layer, "uv", 'f', 2)
+
+    def face_loops(self, f):
+        loop_start = self.loop_starts[f]
+        return range(loop_start, loop_start + self.loop_totals[f])
+
+    def face_cos(self, f):
+        cos = self.cos
+        loop_start = self.loop_starts[f]
+        return [
+            mathutils.Vector(cos[v * 3:v * 3 + 3])
+            for v in self.loop_verts[loop_start:loop_start + self.loop_totals[f]]
+        ]
+
+    def uv_get(self, l):
+        return self.uvs[l * 2:l * 2 + 2]
+
+    def uv_set(self, l, uv):
+        self.uvs[l * 2:l * 2 + 2] = array('f', uv)
+
+    def update(self):
+        self.uv_layer.foreach_set("uv", self.uvs)
 
 
 class prettyface:
@@ -33,6 +86,7 @@ class prettyface:
         "yoff",
         "has_parent",
         "rot",
+        "mesh",
     )
 
     def __init__(self, data):
@@ -40,6 +94,7 @@ class prettyface:
         self.rot = False  # only used for triangles
         self.xoff = 0
         self.yoff = 0
+        self.mesh = None  # only used for quads and ngons
 
         if type(data) == list:  # list of data
             self.uv = None
@@ -72,7 +127,7 @@ class prettyface:
 
             self.children = data
 
-        elif type(data) == tuple:
+        elif len(data) == 2:
             # 2 blender faces
             # f, (len_min, len_mid, len_max)
             self.uv = data
@@ -88,14 +143,15 @@ class prettyface:
 
             self.children = []
 
-        else:  # blender face
-            uv_layer = data.id_data.uv_layers.active.data
-            self.uv = [uv_layer[i].uv for i in data.loop_indices]
+        else:  # blender face: (mesh arrays, face index, normal)
+            pm, f, no = data
+            # Loop indices of the face.
+            self.uv = tuple(pm.face_loops(f))
+            self.mesh = pm
 
-            # cos = [v.co for v in data]
-            cos = [data.id_data.vertices[v].co for v in data.vertices]  # XXX25
+            cos = pm.face_cos(f)
 
-            if len(self.uv) == 4:
+            if len(cos) == 4:
                 self.width = ((cos[0] - cos[1]).length + (cos[2] - cos[3]).length) / 2.0
                 self.height = ((cos[1] - cos[2]).length + (cos[0] - cos[3]).length) / 2.0
             else:
@@ -105,7 +161,6 @@ class prettyface:
                 # we store normalized UV's in the faces coords to avoid
                 # calculating the projection and rotating it twice.
 
-                no = data.normal
                 r = no.rotation_difference(mathutils.Vector((0.0, 0.0, 1.0)))
                 cos_2d = [(r @ co).xy for co in cos]
                 # print(cos_2d)
@@ -129,9 +184,9 @@ class prettyface:
 
                 # ngons work different, we store projected result
                 # in UV's to avoid having to re-project later.
-                for i, co in enumerate(cos_2d):
-                    self.uv[i][:] = ((co.x - xmin) / xspan,
-                                     (co.y - ymin) / yspan)
+                for l, co in zip(self.uv, cos_2d):
+                    pm.uv_set(l, ((co.x - xmin) / xspan,
+                                  (co.y - ymin) / yspan))
 
             self.children = []
 
@@ -187,23 +242,22 @@ class prettyface:
                 #v2 = cos[1]-cos[2]
                 #v3 = cos[2]-cos[0]
 
-                # angles_co = get_tri_angles(*[v.co for v in f])
-                angles_co = get_tri_angles(*[f.id_data.vertices[v].co for v in f.vertices])  # XXX25
+                pm, f = f
+                angles_co = get_tri_angles(*pm.face_cos(f))
 
                 angles_co.sort()
                 I = [i for a, i in angles_co]
 
-                uv_layer = f.id_data.uv_layers.active.data
-                fuv = [uv_layer[i].uv for i in f.loop_indices]
+                fuv = pm.face_loops(f)
 
                 if self.rot:
-                    fuv[I[2]][:] = p1
-                    fuv[I[1]][:] = p2
-                    fuv[I[0]][:] = p3
+                    pm.uv_set(fuv[I[2]], p1)
+                    pm.uv_set(fuv[I[1]], p2)
+                    pm.uv_set(fuv[I[0]], p3)
                 else:
-                    fuv[I[2]][:] = p1
-                    fuv[I[0]][:] = p2
-                    fuv[I[1]][:] = p3
+                    pm.uv_set(fuv[I[2]], p1)
+                    pm.uv_set(fuv[I[0]], p2)
+                    pm.uv_set(fuv[I[1]], p3)
 
             f = uv[0][0]
 
@@ -214,19 +268,20 @@ class prettyface:
                 set_uv(f, (x2, y2), (x2, y1 + margin_h), (x1 + margin_w, y2))
 
         else:  # 1 QUAD
+            pm = self.mesh
             if len(uv) == 4:
-                uv[1][:] = x1, y1
-                uv[2][:] = x1, y2
-                uv[3][:] = x2, y2
-                uv[0][:] = x2, y1
+                pm.uv_set(uv[1], (x1, y1))
+                pm.uv_set(uv[2], (x1, y2))
+                pm.uv_set(uv[3], (x2, y2))
+                pm.uv_set(uv[0], (x2, y1))
             else:
                 # NGon
                 xspan = x2 - x1
                 yspan = y2 - y1
-                for uvco in uv:
-                    x, y = uvco
-                    uvco[:] = ((x1 + (x * xspan)),
-                               (y1 + (y * yspan)))
+                for l in uv:
+                    x, y = pm.uv_get(l)
+                    pm.uv_set(l, ((x1 + (x * xspan)),
+                                  (y1 + (y * yspan))))
 
     def __hash__(self):
         # None unique hash
@@ -251,6 +306,7 @@ def lightmap_uvpack(
     """
     import time
     from math import sqrt
+    from heapq import heapify, heappop, heappush
 
     if not meshes:
         return
@@ -264,17 +320,9 @@ def lightmap_uvpack(
     else:
         face_groups = []
 
+    pretty_meshes = []
+    face_areas = {}
     for me in meshes:
-        if PREF_SEL_ONLY:
-            faces = [f for f in me.polygons if f.select]
-        else:
-            faces = me.polygons[:]
-
-        if PREF_PACK_IN_ONE:
-            face_groups[0].extend(faces)
-        else:
-            face_groups.append(faces)
-
         if PREF_NEW_UVLAYER:
             me.uv_layers.new()
 
@@ -283,13 +331,39 @@ def lightmap_uvpack(
         if not me.uv_layers:
             me.uv_layers.new()
 
+        pm = prettymesh(me)
+        pretty_meshes.append(pm)
+
+        polys = me.polygons
+        areas = array('f', (0.0,)) * len(polys)
+        polys.foreach_get("area", areas)
+        face_areas[pm] = areas
+
+        if PREF_SEL_ONLY:
+            face_select = [False] * len(polys)
+            polys.foreach_get("select", face_select)
+            faces = [(pm, f) for f, select in enumerate(face_select) if select]
+        else:
+            faces = [(pm, f) for f in range(len(polys))]
+
+        if PREF_PACK_IN_ONE:
+            face_groups[0].extend(faces)
+        else:
+            face_groups.append(faces)
+
     for face_sel in face_groups:
         print("\nStarting unwrap")
 
         if not face_sel:
             continue
 
-        pretty_faces = [prettyface(f) for f in face_sel if f.loop_total >= 4]
+        t_stage = time.time()
+        print("\tGenerating faces...", end="")
+
+        pretty_faces = [
+            prettyface((pm, f, pm.mesh.polygons[f].normal if pm.loop_totals[f] > 4 else None))
+            for pm, f in face_sel if pm.loop_totals[f] >= 4
+        ]
 
         # Do we have any triangles?
         if len(pretty_faces) != len(face_sel):
@@ -297,9 +371,7 @@ def lightmap_uvpack(
             # Now add triangles, not so simple because we need to pair them up.
             def trylens(f):
                 # f must be a tri
-
-                # cos = [v.co for v in f]
-                cos = [f.id_data.vertices[v].co for v in f.vertices]  # XXX25
+                cos = f[0].face_cos(f[1])
 
                 lens = [(cos[0] - cos[1]).length, (cos[1] - cos[2]).length, (cos[2] - cos[0]).length]
 
@@ -313,38 +385,101 @@ def lightmap_uvpack(
 
                 return f, lens, lens_order
 
-            tri_lengths = [trylens(f) for f in face_sel if f.loop_total == 3]
+            tri_lengths = [trylens(f) for f in face_sel if f[0].loop_totals[f[1]] == 3]
             del trylens
 
-            def trilensdiff(t1, t2):
-                return (abs(t1[1][t1[2][0]] - t2[1][t2[2][0]]) +
-                        abs(t1[1][t1[2][1]] - t2[1][t2[2][1]]) +
-                        abs(t1[1][t1[2][2]] - t2[1][t2[2][2]]))
-
-            while tri_lengths:
-                tri1 = tri_lengths.pop()
-
-                if not tri_lengths:
-                    pretty_faces.append(prettyface((tri1, None)))
-                    break
+            # (len_min, len_mid, len_max) of each triangle.
+            tri_lens_sorted = [(lens[lens_order[0]], lens[lens_order[1]], lens[lens_order[2]])
+                               for _f, lens, lens_order in tri_lengths]
+
+            def trilensdiff(lens1, lens2):
+                return (abs(lens1[0] - lens2[0]) +
+                        abs(lens1[1] - lens2[1]) +
+                        abs(lens1[2] - lens2[2]))
+
+            tri_paired = [False] * len(tri_lengths)
+
+            # First pair triangles sharing an edge which fit each other,
+            # such as triangulated quads.
+            tri_edges = {}
+            for i, ((pm, f), _lens, _lens_order) in enumerate(tri_lengths):
+                for l in pm.face_loops(f):
+                    tri_edges.setdefault((pm, pm.loop_edges[l]), []).append(i)
+            tri_pairs = []
+            for tris in tri_edges.values():
+                if len(tris) == 2:
+                    i1, i2 = tris
+                    lens1 = tri_lens_sorted[i1]
+                    diff = trilensdiff(lens1, tri_lens_sorted[i2])
+                    if diff <= lens1[2] * 0.0001:
+                        tri_pairs.append((diff, i1, i2))
+            del tri_edges
+            tri_pairs.sort()
+            for _diff, i1, i2 in tri_pairs:
+                if not (tri_paired[i1] or tri_paired[i2]):
+                    tri_paired[i1] = tri_paired[i2] = True
+                    pretty_faces.append(prettyface((tri_lengths[i1], tri_lengths[i2])))
+            del tri_pairs
+
+            # Pair the remaining triangles with the best fitting ones,
+            # searching them by their longest edge, which can't differ more than the best fit.
+            # Unpaired triangles are linked in this order, so paired ones can be skipped at once.
+            tri_order = [i for i in range(len(tri_lengths)) if not tri_paired[i]]
+            tri_order.sort(key=lambda i: tri_lens_sorted[i][2])
+            tri_prev = [-1] * len(tri_lengths)
+            tri_next = [-1] * len(tri_lengths)
+            for i_prev, i_next in zip(tri_order, tri_order[1:]):
+                tri_next[i_prev] = i_next
+                tri_prev[i_next] = i_prev
+
+            def tri_unlink(i):
+                i_prev = tri_prev[i]
+                i_next = tri_next[i]
+                if i_prev != -1:
+                    tri_next[i_prev] = i_next
+                if i_next != -1:
+                    tri_prev[i_next] = i_prev
+                tri_paired[i] = True
+
+            for i1 in reversed(range(len(tri_lengths))):
+                if tri_paired[i1]:
+                    continue
+                tri_unlink(i1)
+                len_min, len_mid, len_max = tri_lens_sorted[i1]
 
                 best_tri_index = -1
-                best_tri_diff = 100000000.0
+                best_tri_diff = float("inf")
+
+                for tri_link in (tri_next, tri_prev):
+                    i2 = tri_link[i1]
+                    while i2 != -1:
+                        lens2 = tri_lens_sorted[i2]
+                        diff = abs(lens2[2] - len_max)
+                        if diff >= best_tri_diff:
+                            break
+                        # Inline 'trilensdiff', this is the inner loop.
+                        diff += abs(lens2[0] - len_min) + abs(lens2[1] - len_mid)
+                        if diff < best_tri_diff:
+                            best_tri_index = i2
+                            best_tri_diff = diff
+                        i2 = tri_link[i2]
+
+                if best_tri_index == -1:
+                    pretty_faces.append(prettyface((tri_lengths[i1], None)))
+                else:
+                    tri_unlink(best_tri_index)
+                    pretty_faces.append(prettyface((tri_lengths[i1], tri_lengths[best_tri_index])))
 
-                for i, tri2 in enumerate(tri_lengths):
-                    diff = trilensdiff(tri1, tri2)
-                    if diff < best_tri_diff:
-                        best_tri_index = i
-                        best_tri_diff = diff
+            del tri_lengths, tri_lens_sorted, tri_paired, tri_order, tri_prev, tri_next
 
-                pretty_faces.append(prettyface((tri1, tri_lengths.pop(best_tri_index))))
+        print("done %.2f" % (time.time() - t_stage))
 
         # Get the min, max and total areas
         max_area = 0.0
         min_area = 100000000.0
         tot_area = 0
-        for f in face_sel:
-            area = f.area
+        for pm, f in face_sel:
+            area = face_areas[pm][f]
             if area > max_area:
                 max_area = area
             if area < min_area:
@@ -359,6 +494,7 @@ def lightmap_uvpack(
 
         curr_len = max_len
 
+        t_stage = time.time()
         print("\tGenerating lengths...", end="")
 
         lengths = []
@@ -413,27 +549,35 @@ def lightmap_uvpack(
             if new_w > new_h:
                 pf.spin()
 
-        print("...done")
+        print("...done %.2f" % (time.time() - t_stage))
 
         # Since the boxes are sized in powers of 2, we can neatly group them into bigger squares
         # this is done hierarchically, so that we may avoid running the pack function
         # on many thousands of boxes, (under 1k is best) because it would get slow.
-        # Using an off and even dict us useful because they are packed differently
-        # where w/h are the same, their packed in groups of 4
-        # where they are different they are packed in pairs
+        # Boxes where w/h are the same are packed in groups of 4,
+        # where they are different they are packed in pairs.
+        # Grouped boxes are always larger, so each size is only consolidated once,
+        # from the smallest to the largest.
         #
         # After this is done an external pack func is done that packs the whole group.
 
+        t_stage = time.time()
         print("\tConsolidating Boxes...", end="")
-        even_dict = {}  # w/h are the same, the key is an int (w)
-        odd_dict = {}  # w/h are different, the key is the (w,h)
+        boxes_by_size = {}  # the key is (w, h)
 
         for pf in pretty_faces:
+            boxes_by_size.setdefault((pf.width, pf.height), []).append(pf)
+
+        sizes_heap = [(w * h, w, h) for w, h in boxes_by_size]
+        heapify(sizes_heap)
+
+        def boxes_add(pf):
             w, h = pf.width, pf.height
-            if w == h:
-                even_dict.setdefault(w, []).append(pf)
-            else:
-                odd_dict.setdefault((w, h), []).append(pf)
+            boxes = boxes_by_size.get((w, h))
+            if boxes is None:
+                boxes = boxes_by_size[w, h] = []
+                heappush(sizes_heap, (w * h, w, h))
+            boxes.append(pf)
 
         # Count the number of boxes consolidated, only used for stats.
         c = 0
@@ -449,51 +593,35 @@ def lightmap_uvpack(
         float_to_int_factor = lengths_to_ints[0][0]
         if float_to_int_factor > 0:
             max_int_dimension = int(((side_len / float_to_int_factor)) / PREF_BOX_DIV)
-            ok = True
         else:
             max_int_dimension = 0.0  # won't be used
-            ok = False
+            sizes_heap.clear()
 
         # RECURSIVE pretty face grouping
-        while ok:
-            ok = False
+        while sizes_heap:
+            _area, w, h = heappop(sizes_heap)
+            boxes = boxes_by_size[w, h]
 
-            # Tall boxes in groups of 2
-            for d, boxes in list(odd_dict.items()):
-                if d[1] < max_int_dimension:
+            if w != h:
+                # Tall boxes in groups of 2
+                if h < max_int_dimension:
                     # boxes.sort(key=lambda a: len(a.children))
                     while len(boxes) >= 2:
-                        # print("foo", len(boxes))
-                        ok = True
                         c += 1
                         pf_parent = prettyface([boxes.pop(), boxes.pop()])
                         pretty_faces.append(pf_parent)
-
-                        w, h = pf_parent.width, pf_parent.height
-                        assert(w <= h)
-
-                        if w == h:
-                            even_dict.setdefault(w, []).append(pf_parent)
-                        else:
-                            odd_dict.setdefault((w, h), []).append(pf_parent)
-
-            # Even boxes in groups of 4
-            for d, boxes in list(even_dict.items()):
-                if d < max_int_dimension:
+                        assert(pf_parent.width <= pf_parent.height)
+                        boxes_add(pf_parent)
+            else:
+                # Even boxes in groups of 4
+                if w < max_int_dimension:
                     boxes.sort(key=lambda a: len(a.children))
 
                     while len(boxes) >= 4:
-                        # print("bar", len(boxes))
-                        ok = True
                         c += 1
-
                         pf_parent = prettyface([boxes.pop(), boxes.pop(), boxes.pop(), boxes.pop()])
                         pretty_faces.append(pf_parent)
-                        w = pf_parent.width  # width and weight are the same
-                        even_dict.setdefault(w, []).append(pf_parent)
-
-        del even_dict
-        del odd_dict
+                        boxes_add(pf_parent)
 
         # orig = len(pretty_faces)
 
@@ -512,10 +640,11 @@ def lightmap_uvpack(
                     pf.spin()
                     # pass
 
-        print("Consolidated", c, "boxes, done")
+        print("Consolidated", c, "boxes, done %.2f" % (time.time() - t_stage))
         # print("done", orig, len(pretty_faces))
 
         # boxes2Pack.append([islandIdx, w,h])
+        t_stage = time.time()
         print("\tPacking Boxes", len(pretty_faces), end="...")
         boxes2Pack = [[0.0, 0.0, pf.width, pf.height, i] for i, pf in enumerate(pretty_faces)]
         packWidth, packHeight = mathutils.geometry.box_pack_2d(boxes2Pack)
@@ -529,14 +658,15 @@ def lightmap_uvpack(
         margin_h = ((packHeight) / PREF_MARGIN_DIV) / packHeight
 
         # print(margin_w, margin_h)
-        print("done")
+        print("done %.2f" % (time.time() - t_stage))
 
         # Apply the boxes back to the UV coords.
+        t_stage = time.time()
         print("\twriting back UVs", end="")
         for i, box in enumerate(boxes2Pack):
             pretty_faces[i].place(box[0], box[1], packWidth, packHeight, margin_w, margin_h)
             # pf.place(box[1][1], box[1][2], packWidth, packHeight, margin_w, margin_h)
-        print("done")
+        print("done %.2f" % (time.time() - t_stage))
 
         if PREF_APPLY_IMAGE:
             pass
@@ -552,8 +682,9 @@ def lightmap_uvpack(
                 f.image = image
             '''
 
-    for me in meshes:
-        me.update()
+    for pm in pretty_meshes:
+        pm.update()
+        pm.mesh.update()
 
     print("finished all %.2f " % (time.time() - t))
 
@@ -33,9 +33,7 @@ def get_vcolor_layer_data(me):
 
 
 def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean, dirt_only, normalize):
-    from mathutils import Vector
-    from math import acos
-    import array
+    import numpy as np
 
     # We simulate the accumulation of dirt in the creases of geometric surfaces
     # by comparing the vertex normal to the average direction of all vertices
@@ -51,62 +49,63 @@ def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean,
     #
     # Original code and method by Keith "Wahooney" Boshoff.
 
-    vert_tone = array.array("f", [0.0]) * len(me.vertices)
-
-    # create lookup table for each vertex's connected vertices (via edges)
-    con = [[] for i in range(len(me.vertices))]
-
-    # add connected verts
-    for e in me.edges:
-        con[e.vertices[0]].append(e.vertices[1])
-        con[e.vertices[1]].append(e.vertices[0])
-
-    for i, v in enumerate(me.vertices):
-        vec = Vector()
-        no = v.normal
-        co = v.co
-
-        # get the direction of the vectors between the vertex and it's connected vertices
-        for c in con[i]:
-            vec += (me.vertices[c].co - co).normalized()
-
-        # average the vector by dividing by the number of connected verts
-        tot_con = len(con[i])
-
-        if tot_con == 0:
-            ang = pi / 2.0  # assume 90°, i. e. flat
-        else:
-            vec /= tot_con
-
-            # angle is the acos() of the dot product between normal and connected verts.
-            # > 90 degrees: convex
-            # < 90 degrees: concave
-            ang = acos(no.dot(vec))
-
-        # enforce min/max
-        ang = max(clamp_dirt, ang)
-
-        if not dirt_only:
-            ang = min(clamp_clean, ang)
-
-        vert_tone[i] = ang
-
-    # blur tones
+    vert_len = len(me.vertices)
+
+    co = np.empty(vert_len * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", co)
+    co = co.reshape(vert_len, 3).astype(np.float64)
+
+    no = np.empty(vert_len * 3, dtype=np.float32)
+    me.vertices.foreach_get("normal", no)
+    no = no.reshape(vert_len, 3).astype(np.float64)
+
+    edge_verts = np.empty(len(me.edges) * 2, dtype=np.int32)
+    me.edges.foreach_get("vertices", edge_verts)
+
+    # Lookup table for each vertex's connected vertices (via edges),
+    # as a compressed sparse rows adjacency: 'con_verts[con_offsets[i]:con_offsets[i + 1]]' for vertex 'i'.
+    con_rows = np.concatenate((edge_verts[0::2], edge_verts[1::2]))
+    con_cols = np.concatenate((edge_verts[1::2], edge_verts[0::2]))
+    order = np.argsort(con_rows, kind='stable')
+    con_rows = con_rows[order]
+    con_verts = con_cols[order]
+    del con_cols, order, edge_verts
+    tot_con = np.bincount(con_rows, minlength=vert_len)
+
+    # get the direction of the vectors between the vertex and it's connected vertices
+    vec = co[con_verts] - co[con_rows]
+    length = np.sqrt(np.einsum("ij,ij->i", vec, vec))
+    vec[length != 0.0] /= length[length != 0.0, np.newaxis]
+    vec = np.stack([np.bincount(con_rows, weights=vec[:, axis], minlength=vert_len) for axis in range(3)], axis=1)
+    del length
+
+    # average the vector by dividing by the number of connected verts,
+    # angle is the acos() of the dot product between normal and connected verts.
+    # > 90 degrees: convex
+    # < 90 degrees: concave
+    has_con = tot_con != 0
+    vec[has_con] /= tot_con[has_con, np.newaxis]
+    vert_tone = np.arccos(np.clip(np.einsum("ij,ij->i", no, vec), -1.0, 1.0))
+    # assume 90°, i. e. flat
+    vert_tone[~has_con] = pi / 2.0
+    del co, no, vec
+
+    # enforce min/max
+    vert_tone = np.maximum(vert_tone, clamp_dirt)
+
+    if not dirt_only:
+        vert_tone = np.minimum(vert_tone, clamp_clean)
+
+    # blur tones, use connected verts look up for blurring
+    blur_div = tot_con * blur_strength + 1.0
     for i in range(blur_iterations):
-        # backup the original tones
-        orig_vert_tone = vert_tone[:]
-
-        # use connected verts look up for blurring
-        for j, c in enumerate(con):
-            for v in c:
-                vert_tone[j] += blur_strength * orig_vert_tone[v]
-
-            vert_tone[j] /= len(c) * blur_strength + 1
-        del orig_vert_tone
+        tone_con = np.bincount(con_rows, weights=vert_tone[con_verts], minlength=vert_len)
+        vert_tone = (vert_tone + blur_strength * tone_con) / blur_div
+    del con_rows, con_verts
 
     if normalize:
-        min_tone = min(vert_tone)
-        max_tone = max(vert_tone)
+        min_tone = vert_tone.min(initial=np.inf)
+        max_tone = vert_tone.max(initial=-np.inf)
     else:
         min_tone = clamp_dirt
         max_tone = clamp_clean
@@ -123,22 +122,41 @@ def applyVertexDirt(me, blur_iterations, blur_strength, clamp_dirt, clamp_clean,
     if not active_col_layer:
         return {'CANCELLED'}
 
-    use_paint_mask = me.use_paint_mask
-    for i, p in enumerate(me.polygons):
-        if not use_paint_mask or p.select:
-            for loop_index in p.loop_indices:
-                loop = me.loops[loop_index]
-                v = loop.vertex_index
-                col = active_col_layer[loop_index].color
-                tone = vert_tone[v]
-                tone = (tone - min_tone) * tone_range
-
-                if dirt_only:
-                    tone = min(tone, 0.5) * 2.0
-
-                col[0] = tone * col[0]
-                col[1] = tone * col[1]
-                col[2] = tone * col[2]
+    loop_len = len(me.loops)
+    loop_verts = np.empty(loop_len, dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_verts)
+
+    # Only write the colors of selected faces or vertices, when painting is masked.
+    loop_mask = np.ones(loop_len, dtype=bool)
+    if me.use_paint_mask:
+        poly_len = len(me.polygons)
+        poly_select = np.empty(poly_len, dtype=bool)
+        me.polygons.foreach_get("select", poly_select)
+        poly_loop_starts = np.empty(poly_len, dtype=np.int32)
+        me.polygons.foreach_get("loop_start", poly_loop_starts)
+        poly_loop_totals = np.empty(poly_len, dtype=np.int32)
+        me.polygons.foreach_get("loop_total", poly_loop_totals)
+        loop_starts = poly_loop_starts[poly_select]
+        loop_totals = poly_loop_totals[poly_select]
+        loop_offsets = np.cumsum(loop_totals) - loop_totals
+        loop_mask[:] = False
+        loop_mask[np.repeat(loop_starts - loop_offsets, loop_totals) + np.arange(loop_totals.sum())] = True
+    elif me.use_paint_mask_vertex:
+        vert_select = np.empty(vert_len, dtype=bool)
+        me.vertices.foreach_get("select", vert_select)
+        loop_mask = vert_select[loop_verts]
+
+    tone = (vert_tone[loop_verts[loop_mask]] - min_tone) * tone_range
+
+    if dirt_only:
+        tone = np.minimum(tone, 0.5) * 2.0
+
+    col = np.empty(loop_len * 4, dtype=np.float32)
+    active_col_layer.foreach_get("color", col)
+    col = col.reshape(loop_len, 4)
+    col[loop_mask, :3] *= tone[:, np.newaxis]
+    active_col_layer.foreach_set("color", col.ravel())
+
     me.update()
     return {'FINISHED'}
 
@@ -977,8 +977,13 @@ class WM_OT_path_open(Operator):
 def _wm_doc_get_id(doc_id, do_url=True, url_prefix="", report=None):
 
     def operator_exists_pair(a, b):
-        # Not fast, this is only for docs.
-        return b in dir(getattr(bpy.ops, a))
+        # Look up the operator type directly,
+        # instead of listing all operators on each call.
+        try:
+            getattr(getattr(bpy.ops, a), b).get_rna_type()
+        except (AttributeError, KeyError):
+            return False
+        return True
 
     def operator_exists_single(a):
         a, b = a.partition("_OT_")[::2]
@@ -1056,6 +1061,67 @@ def _wm_doc_get_id(doc_id, do_url=True, url_prefix="", report=None):
     return url if do_url else rna
 
 
+# Map 'id(url_mapping)' to '(url_mapping, lookup_fn)',
+# see '_wm_doc_manual_lookup_fn'.
+_wm_doc_manual_lookup_cache = {}
+
+
+def _wm_doc_manual_lookup_fn(url_mapping):
+    # Return a function returning the first '(pattern, url_suffix)' of
+    # 'url_mapping' with a pattern matching an RNA ID, or None.
+    #
+    # Nearly all patterns are text followed by a single '*',
+    # these are stored by their prefix, so they can be found with a dictionary
+    # lookup for each prefix length, instead of matching every pattern.
+    # The remaining patterns are matched in order as regular expressions.
+    item = _wm_doc_manual_lookup_cache.get(id(url_mapping))
+    if item is not None and item[0] is url_mapping:
+        return item[1]
+
+    import re
+    from fnmatch import translate
+
+    def is_literal(text):
+        return not ("*" in text or "?" in text or "[" in text)
+
+    # Map text & prefixes to the index of their first pattern.
+    literal_map = {}
+    prefix_map = {}
+    # Other patterns: '(index, match_fn)'.
+    other = []
+    for i, (pattern, _url_suffix) in enumerate(url_mapping):
+        if is_literal(pattern):
+            literal_map.setdefault(pattern, i)
+        elif pattern.endswith("*") and is_literal(pattern[:-1]):
+            prefix_map.setdefault(pattern[:-1], i)
+        else:
+            other.append((i, re.compile(translate(pattern)).match))
+    prefix_lengths = sorted({len(prefix) for prefix in prefix_map})
+    index_none = len(url_mapping)
+
+    def lookup_fn(rna_id):
+        index = literal_map.get(rna_id, index_none)
+        for prefix_len in prefix_lengths:
+            if prefix_len > len(rna_id):
+                break
+            index_test = prefix_map.get(rna_id[:prefix_len], index_none)
+            if index_test < index:
+                index = index_test
+        for index_test, match_fn in other:
+            if index_test > index:
+                break
+            if match_fn(rna_id):
+                index = index_test
+                break
+        return None if index == index_none else url_mapping[index]
+
+    # Mappings are replaced when add-ons are reloaded, don't keep old ones.
+    if len(_wm_doc_manual_lookup_cache) > 16:
+        _wm_doc_manual_lookup_cache.clear()
+    _wm_doc_manual_lookup_cache[id(url_mapping)] = url_mapping, lookup_fn
+    return lookup_fn
+
+
 class WM_OT_doc_view_manual(Operator):
     """Load online manual"""
     bl_idname = "wm.doc_view_manual"
@@ -1067,15 +1133,15 @@ class WM_OT_doc_view_manual(Operator):
     def _find_reference(rna_id, url_mapping, verbose=True):
         if verbose:
             print("online manual check for: '%s'... " % rna_id)
-        from fnmatch import fnmatchcase
         # XXX, for some reason all RNA ID's are stored lowercase
         # Adding case into all ID's isn't worth the hassle so force lowercase.
         rna_id = rna_id.lower()
-        for pattern, url_suffix in url_mapping:
-            if fnmatchcase(rna_id, pattern):
-                if verbose:
-                    print("            match found: '%s' --> '%s'" % (pattern, url_suffix))
-                return url_suffix
+        item = _wm_doc_manual_lookup_fn(url_mapping)(rna_id)
+        if item is not None:
+            pattern, url_suffix = item
+            if verbose:
+                print("            match found: '%s' --> '%s'" % (pattern, url_suffix))
+            return url_suffix
         if verbose:
             print("match not found")
         return None
@@ -2123,6 +2189,7 @@ class WM_OT_batch_rename(Operator):
                     context.scene.sequence_editor.sequences_all,
                     "name",
                     "Strip(s)",
+                    lambda strip: (strip.id_data.sequence_editor, "sequences_all"),
                 )
         elif space_type == 'NODE_EDITOR':
             data_type_test = 'NODE'
@@ -2135,6 +2202,7 @@ class WM_OT_batch_rename(Operator):
                     list(space.node_tree.nodes),
                     "name",
                     "Node(s)",
+                    lambda node: (node.id_data, "nodes"),
                 )
         else:
             if mode == 'POSE' or (mode == 'WEIGHT_PAINT' and context.pose_object):
@@ -2148,6 +2216,7 @@ class WM_OT_batch_rename(Operator):
                         [pbone.bone for ob in context.objects_in_mode_unique_data for pbone in ob.pose.bones],
                         "name",
                         "Bone(s)",
+                        lambda bone: (bone.id_data, "bones"),
                     )
             elif mode == 'EDIT_ARMATURE':
                 data_type_test = 'BONE'
@@ -2160,6 +2229,7 @@ class WM_OT_batch_rename(Operator):
                         [ebone for ob in context.objects_in_mode_unique_data for ebone in ob.data.edit_bones],
                         "name",
                         "Edit Bone(s)",
+                        lambda ebone: (ebone.id_data, "edit_bones"),
                     )
 
         if check_context:
@@ -2187,6 +2257,7 @@ class WM_OT_batch_rename(Operator):
                     [id for id in bpy.data.objects if id.library is None],
                     "name",
                     "Object(s)",
+                    lambda _id: (bpy.data, "objects"),
                 )
             elif data_type == 'MATERIAL':
                 data = (
@@ -2200,6 +2271,7 @@ class WM_OT_batch_rename(Operator):
                     [id for id in bpy.data.materials if id.library is None],
                     "name",
                     "Material(s)",
+                    lambda _id: (bpy.data, "materials"),
                 )
             elif data_type in object_data_type_attrs_map.keys():
                 attr, descr = object_data_type_attrs_map[data_type]
@@ -2215,26 +2287,33 @@ class WM_OT_batch_rename(Operator):
                     [id for id in getattr(bpy.data, attr) if id.library is None],
                     "name",
                     descr,
+                    lambda _id, attr=attr: (bpy.data, attr),
                 )
 
         return data
 
     @staticmethod
-    def _apply_actions(actions, name):
+    def _actions_compile(actions):
+        # Return a function applying all actions to a name,
+        # so the settings of each action are read
+        # and regular expressions compiled once for all names.
+        # Raise 're.error' for invalid regular expressions.
         import string
         import re
+        from functools import partial
 
+        funcs = []
         for action in actions:
             ty = action.type
             if ty == 'SET':
                 text = action.set_name
                 method = action.set_method
                 if method == 'NEW':
-                    name = text
+                    funcs.append(lambda _name, text=text: text)
                 elif method == 'PREFIX':
-                    name = text + name
+                    funcs.append(lambda name, text=text: text + name)
                 elif method == 'SUFFIX':
-                    name = name + text
+                    funcs.append(lambda name, text=text: name + text)
                 else:
                     assert(0)
 
@@ -2249,9 +2328,9 @@ class WM_OT_batch_rename(Operator):
                 )
                 part = action.strip_part
                 if 'START' in part:
-                    name = name.lstrip(chars_strip)
+                    funcs.append(lambda name, chars=chars_strip: name.lstrip(chars))
                 if 'END' in part:
-                    name = name.rstrip(chars_strip)
+                    funcs.append(lambda name, chars=chars_strip: name.rstrip(chars))
 
             elif ty == 'REPLACE':
                 if action.use_replace_regex_src:
@@ -2263,28 +2342,98 @@ class WM_OT_batch_rename(Operator):
                 else:
                     replace_src = re.escape(action.replace_src)
                     replace_dst = action.replace_dst.replace("\\", "\\\\")
-                name = re.sub(
+                pattern = re.compile(
                     replace_src,
-                    replace_dst,
-                    name,
                     flags=(
                         0 if action.replace_match_case else
                         re.IGNORECASE
                     ),
                 )
+                funcs.append(partial(pattern.sub, replace_dst))
             elif ty == 'CASE':
                 method = action.case_method
                 if method == 'UPPER':
-                    name = name.upper()
+                    funcs.append(str.upper)
                 elif method == 'LOWER':
-                    name = name.lower()
+                    funcs.append(str.lower)
                 elif method == 'TITLE':
-                    name = name.title()
+                    funcs.append(str.title)
                 else:
                     assert(0)
             else:
                 assert(0)
-        return name
+
+        def name_apply(name):
+            for func in funcs:
+                name = func(name)
+            return name
+
+        return name_apply
+
+    @staticmethod
+    def _rename_unique(items_rename, attr, namespace):
+        # Rename items, using an index of the names in use to make names unique.
+        # Otherwise the unique names made on each assignment depend on the
+        # order items are renamed in (swapped names get a number suffix).
+        #
+        # 'items_rename' is a list of '(item, name_dst)' pairs,
+        # 'namespace' returns the '(owner, collection_attr)' of the collection
+        # an items name must be unique in.
+        # Return the number of items which were given a numbered name.
+        groups = {}
+        for item, name_dst in items_rename:
+            groups.setdefault(namespace(item), []).append((item, name_dst))
+
+        collision_len = 0
+        for (owner, collection_attr), group in groups.items():
+            names = {
+                getattr(item, attr)
+                for item in getattr(owner, collection_attr)
+                # Linked data-blocks don't share names with local ones.
+                if getattr(item, "library", None) is None
+            }
+            names_dst = {name_dst for _item, name_dst in group}
+
+            # Items named as the new name of another item are given
+            # a temporary name first, so they don't take each others names.
+            temp_index = 0
+            for item, _name_dst in group:
+                name_src = getattr(item, attr)
+                if name_src not in names_dst:
+                    continue
+                while True:
+                    temp_index += 1
+                    name_temp = "_rename_%d" % temp_index
+                    if not (name_temp in names or name_temp in names_dst):
+                        break
+                names.discard(name_src)
+                setattr(item, attr, name_temp)
+                names.add(getattr(item, attr))
+
+            # Next number to try for each name, so many items given the same
+            # name don't search the numbers used by previous items again.
+            numbers_next = {}
+            for item, name_dst in group:
+                names.discard(getattr(item, attr))
+                name = name_dst
+                if name in names:
+                    base, sep, number = name.rpartition(".")
+                    if not (sep and number.isdigit()):
+                        base = name
+                    number = numbers_next.get(base, 1)
+                    while True:
+                        name = "%s.%03d" % (base, number)
+                        number += 1
+                        # Don't take the new name of another item.
+                        if not (name in names or name in names_dst):
+                            break
+                    numbers_next[base] = number
+                    collision_len += 1
+                setattr(item, attr, name)
+                # Read back, names may be clamped to their maximum length.
+                names.add(getattr(item, attr))
+
+        return collision_len
 
     def _data_update(self, context):
         only_selected = self.data_source == 'SELECT'
@@ -2299,6 +2448,7 @@ class WM_OT_batch_rename(Operator):
 
     def draw(self, context):
         import re
+        import itertools
 
         layout = self.layout
 
@@ -2419,7 +2569,33 @@ class WM_OT_batch_rename(Operator):
             row.prop(action, "op_remove", text="", icon='REMOVE')
             row.prop(action, "op_add", text="", icon='ADD')
 
-        layout.label(text="Rename %d %s" % (len(self._data[0]), self._data[2]))
+        seq, attr, descr, _namespace = self._data
+
+        # Preview the first names only, the rest may be many thousands.
+        preview_len = 5
+        try:
+            name_apply = self._actions_compile(self.actions)
+            preview = [
+                (name_src, name_apply(name_src))
+                for name_src in (
+                    getattr(item, attr)
+                    for item in itertools.islice(seq, preview_len)
+                )
+            ]
+        except Exception:
+            # Errors are shown for each action.
+            preview = []
+
+        if preview:
+            col = layout.box().column(align=True)
+            for name_src, name_dst in preview:
+                row = col.split(factor=0.5)
+                row.label(text=name_src, translate=False)
+                row.label(text=name_dst, icon='FORWARD', translate=False)
+            if len(seq) > preview_len:
+                col.label(text="...")
+
+        layout.label(text="Rename %d %s" % (len(seq), descr))
 
     def check(self, context):
         changed = False
@@ -2450,7 +2626,7 @@ class WM_OT_batch_rename(Operator):
     def execute(self, context):
         import re
 
-        seq, attr, descr = self._data
+        seq, attr, descr, namespace = self._data
 
         actions = self.actions
 
@@ -2470,17 +2646,28 @@ class WM_OT_batch_rename(Operator):
                         self.report({'ERROR'}, "Invalid regular expression (replace): " + str(ex))
                         return {'CANCELLED'}
 
+        name_apply = self._actions_compile(actions)
+
         total_len = 0
-        change_len = 0
+        items_rename = []
         for item in seq:
             name_src = getattr(item, attr)
-            name_dst = self._apply_actions(actions, name_src)
+            name_dst = name_apply(name_src)
             if name_src != name_dst:
-                setattr(item, attr, name_dst)
-                change_len += 1
+                items_rename.append((item, name_dst))
             total_len += 1
+        change_len = len(items_rename)
+
+        collision_len = self._rename_unique(items_rename, attr, namespace)
 
-        self.report({'INFO'}, "Renamed %d of %d %s" % (change_len, total_len, descr))
+        if collision_len:
+            self.report(
+                {'INFO'},
+                "Renamed %d of %d %s (%d already in use, numbered)" %
+                (change_len, total_len, descr, collision_len)
+            )
+        else:
+            self.report({'INFO'}, "Renamed %d of %d %s" % (change_len, total_len, descr))
 
         return {'FINISHED'}
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Apache License, Version 2.0
+
+"""
+Tests for the PO files reading & writing of bl_i18n_utils.
+
+This test suite runs outside of Blender.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "release", "scripts", "modules",
+))
+
+from bl_i18n_utils import utils  # noqa: E402
+
+from modules.test_utils import with_tempdir  # noqa: E402
+
+
+# As written by bl_i18n_utils, the last line of the header has no new line.
+PO_CONTENT = r'''# Blender's translation file (po format).
+# Copyright (C) 2021 The Blender Foundation.
+# This file is distributed under the same license as the Blender package.
+#
+#, fuzzy
+msgid ""
+msgstr ""
+"Project-Id-Version: Blender 3.0.0 (b'000000000000')\n"
+"Report-Msgid-Bugs-To: \n"
+"Language: fr\n"
+"MIME-Version: 1.0\n"
+"Content-Type: text/plain; charset=UTF-8\n"
+"Content-Transfer-Encoding: 8bit"
+
+#. :src: bpy.types.Object
+#: source/blender/makesrna/intern/rna_object.c:42
+msgid "Object"
+msgstr "Objet"
+
+#. :src: bpy.types.Operator.bl_label
+msgctxt "Operator"
+msgid "Add"
+msgstr "Ajouter"
+
+#. :src: bpy.types.Material
+msgctxt "ID"
+msgid "Material"
+msgstr "Matériau"
+
+#. :src: bpy.types.Scene.frame_start
+msgid ""
+"First frame of the playback/rendering range\n"
+"with a \"quoted\" word"
+msgstr ""
+"Première image de la plage de lecture/rendu\n"
+"avec un mot \"entre guillemets\""
+
+#. :src: bpy.types.Mesh
+#, fuzzy
+msgid "Mesh"
+msgstr "Maillage"
+
+#. :src: bpy.types.Curve
+#~ msgid "Curve"
+#~ msgstr "Courbe"
+
+#. :src: bpy.types.Curve.bevel_depth
+#~ msgctxt "Unit"
+#~ msgid ""
+#~ "Bevel depth\n"
+#~ "of the curve"
+#~ msgstr ""
+#~ "Profondeur du biseau\n"
+#~ "de la courbe"
+
+'''
+
+
+class POReadWriteTest(unittest.TestCase):
+
+    def parse(self, filepath, use_mmap):
+        msgs = utils.I18nMessages(kind='PO', key=filepath)
+        msgs.parse_messages_from_po(filepath, use_mmap=use_mmap)
+        self.assertEqual(msgs.parsing_errors, [])
+        return msgs
+
+    @with_tempdir
+    def test_round_trip(self, tempdir):
+        filepath_src = str(tempdir / "src.po")
+        with open(filepath_src, 'w', encoding="utf-8") as fh:
+            fh.write(PO_CONTENT)
+        with open(filepath_src, 'rb') as fh:
+            data_src = fh.read()
+
+        for use_mmap in (False, True):
+            msgs = self.parse(filepath_src, use_mmap)
+            filepath_dst = str(tempdir / ("dst_%d.po" % use_mmap))
+            msgs.write_messages_to_po(filepath_dst)
+            with open(filepath_dst, 'rb') as fh:
+                self.assertEqual(fh.read(), data_src, "use_mmap=%r" % use_mmap)
+
+    @with_tempdir
+    def test_messages(self, tempdir):
+        filepath = str(tempdir / "src.po")
+        with open(filepath, 'w', encoding="utf-8") as fh:
+            fh.write(PO_CONTENT)
+        msgs = self.parse(filepath, False)
+        default_context = msgs.settings.DEFAULT_CONTEXT
+
+        msg = msgs.msgs[("Operator", "Add")]
+        self.assertEqual(msg.msgstr, "Ajouter")
+        self.assertFalse(msg.is_fuzzy)
+
+        msg = msgs.msgs[(default_context, "First frame of the playback/rendering range\nwith a \"quoted\" word")]
+        self.assertEqual(msg.msgstr, "Première image de la plage de lecture/rendu\navec un mot \"entre guillemets\"")
+
+        self.assertTrue(msgs.msgs[(default_context, "Mesh")].is_fuzzy)
+        msg = msgs.msgs[("Unit", "Bevel depth\nof the curve")]
+        self.assertTrue(msg.is_commented)
+        self.assertEqual(msg.msgstr, "Profondeur du biseau\nde la courbe")
+
+        msgs.update_info()
+        self.assertEqual(msgs.comm_msgs, {(default_context, "Curve"), ("Unit", "Bevel depth\nof the curve")})
+        self.assertEqual(msgs.fuzzy_msgs, {(default_context, "Mesh")})
+
+    @with_tempdir
+    def test_compact(self, tempdir):
+        filepath_src = str(tempdir / "src.po")
+        with open(filepath_src, 'w', encoding="utf-8") as fh:
+            fh.write(PO_CONTENT)
+        msgs = self.parse(filepath_src, False)
+        filepath_dst = str(tempdir / "dst.po")
+        msgs.write_messages_to_po(filepath_dst, compact=True)
+
+        msgs = self.parse(filepath_dst, False)
+        default_context = msgs.settings.DEFAULT_CONTEXT
+        # Only the translated, non-fuzzy and non-commented messages are kept.
+        self.assertEqual(set(msgs.msgs), {
+            (default_context, "Object"),
+            ("Operator", "Add"),
+            ("ID", "Material"),
+            (default_context, "First frame of the playback/rendering range\nwith a \"quoted\" word"),
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
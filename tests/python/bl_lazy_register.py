@@ -0,0 +1,64 @@
+# Apache License, Version 2.0
+
+# BLENDER_LAZY_REGISTER=1 ./blender.bin --background -noaudio --factory-startup --python tests/python/bl_lazy_register.py -- --verbose
+#
+# Each test uses a different deferred module, as they're registered once used.
+import sys
+import unittest
+
+import bpy
+import bl_lazy_register_utils
+
+
+class TestLazyRegister(unittest.TestCase):
+
+    def test_enabled(self):
+        self.assertTrue(bl_lazy_register_utils.is_enabled())
+
+    def test_panel_parent(self):
+        # Blender looks up the parent panel by name, not through 'bpy.types'.
+        self.assertNotIn("bl_ui.properties_data_camera", sys.modules)
+
+        class DATA_PT_camera_dof_lazy_test(bpy.types.Panel):
+            bl_label = "Lazy Test"
+            bl_space_type = 'PROPERTIES'
+            bl_region_type = 'WINDOW'
+            bl_context = "data"
+            bl_parent_id = "DATA_PT_camera_dof"
+
+            def draw(self, _context):
+                pass
+
+        bpy.utils.register_class(DATA_PT_camera_dof_lazy_test)
+        try:
+            self.assertIn("bl_ui.properties_data_camera", sys.modules)
+            self.assertTrue(DATA_PT_camera_dof_lazy_test.is_registered)
+            self.assertTrue(bpy.types.DATA_PT_camera_dof.is_registered)
+        finally:
+            bpy.utils.unregister_class(DATA_PT_camera_dof_lazy_test)
+
+    def test_operator_call(self):
+        self.assertNotIn("bl_operators.object", sys.modules)
+
+        for ob in bpy.context.view_layer.objects:
+            ob.select_set(False)
+        self.assertEqual(bpy.ops.object.select_pattern(pattern="Cube"), {'FINISHED'})
+        self.assertTrue(bpy.data.objects["Cube"].select_get())
+        self.assertIn("bl_operators.object", sys.modules)
+
+    def test_operator_dir(self):
+        self.assertNotIn("bl_operators.uvcalc_lightmap", sys.modules)
+
+        self.assertIn("uv", dir(bpy.ops))
+        self.assertIn("lightmap_pack", dir(bpy.ops.uv))
+        self.assertIn("UV_OT_lightmap_pack", dir(bpy.types))
+        # Listing operators doesn't register them.
+        self.assertNotIn("bl_operators.uvcalc_lightmap", sys.modules)
+
+        self.assertTrue(bpy.types.UV_OT_lightmap_pack.is_registered)
+        self.assertIn("bl_operators.uvcalc_lightmap", sys.modules)
+
+
+if __name__ == '__main__':
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
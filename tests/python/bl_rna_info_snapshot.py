@@ -0,0 +1,151 @@
+# Apache License, Version 2.0
+
+# ./blender.bin --background -noaudio --python tests/python/bl_rna_info_snapshot.py -- --verbose
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+import bpy
+import rna_info
+
+
+def info_id(info):
+    return None if info is None else info.identifier
+
+
+def prop_dump(prop):
+    return (
+        prop.identifier,
+        prop.name,
+        prop.description,
+        prop.type,
+        prop.default_str,
+        prop.get_type_description(),
+        prop.get_type_description(as_arg=True),
+        info_id(prop.fixed_type),
+        info_id(prop.srna),
+        info_id(prop.collection_type),
+    )
+
+
+def func_dump(func):
+    return (
+        func.identifier,
+        func.description,
+        func.is_classmethod,
+        [prop_dump(prop) for prop in func.args],
+        [prop_dump(prop) for prop in func.return_values],
+    )
+
+
+def info_dump(info):
+    # The info as plain data, only using identifiers to reference other info.
+    structs, funcs, ops, props = info
+    return (
+        {
+            key: (
+                struct.identifier,
+                struct.name,
+                struct.description,
+                struct.full_path,
+                struct.module_name,
+                info_id(struct.base),
+                info_id(struct.nested),
+                [info_id(base) for base in struct.get_bases()],
+                [rna_struct.identifier for rna_struct in struct.children],
+                struct.references[:],
+                [prop_dump(prop) for prop in struct.properties],
+                [func_dump(func) for func in struct.functions],
+            )
+            for key, struct in structs.items()
+        },
+        {
+            key: (
+                op.identifier,
+                op.module_name,
+                op.func_name,
+                op.description,
+                [prop_dump(prop) for prop in op.args],
+            )
+            for key, op in ops.items()
+        },
+        len(funcs),
+        len(props),
+    )
+
+
+class TestRNAInfoSnapshot(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.TemporaryDirectory()
+        cls.filepath = os.path.join(cls.tempdir.name, "rna_info.snapshot")
+
+        info = rna_info.BuildRNAInfo()
+        # Reading a snapshot replaces the lookups, dump them first.
+        cls.info_dump = info_dump(info)
+
+        # Pickle must not recurse through the info referencing each other,
+        # RNA has long chains of pointers.
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            rna_info.snapshot_write(cls.filepath, info)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        cls.info_read = rna_info.snapshot_read(cls.filepath)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempdir.cleanup()
+
+    def test_read(self):
+        self.assertIsNotNone(self.info_read)
+        self.assertEqual(info_dump(self.info_read), self.info_dump)
+
+    def test_lookups(self):
+        structs, funcs, ops, props = self.info_read
+        self.assertIs(rna_info.InfoStructRNA.global_lookup, structs)
+        self.assertIs(rna_info.GetInfoStructRNA(bpy.types.Object.bl_rna), structs["", "Object"])
+
+        struct = structs["", "Object"]
+        self.assertIs(struct.base, structs["", "ID"])
+        prop = struct.properties[[prop.identifier for prop in struct.properties].index("data")]
+        self.assertIs(prop, props["Object", "data"])
+        self.assertIs(prop.fixed_type, structs["", "ID"])
+
+    def test_blender_data(self):
+        # Blender's data isn't stored, it's looked up using the owners.
+        structs, funcs, ops, props = self.info_read
+        for (_, struct_id), struct in structs.items():
+            if getattr(bpy.types, struct_id, None) is None:
+                continue
+            self.assertEqual(struct.bl_rna.identifier, struct_id)
+            for prop in struct.properties:
+                self.assertEqual(prop.bl_prop.identifier, prop.identifier)
+            for func in struct.functions:
+                self.assertEqual(func.bl_func.identifier, func.identifier)
+                for prop in func.args:
+                    self.assertEqual(prop.bl_prop.identifier, prop.identifier)
+
+        op = ops["", "OBJECT_OT_select_all"]
+        self.assertEqual(op.bl_op.identifier, "OBJECT_OT_select_all")
+        for prop in op.args:
+            self.assertEqual(prop.bl_prop.identifier, prop.identifier)
+
+    def test_outdated(self):
+        filepath = os.path.join(self.tempdir.name, "rna_info_outdated.snapshot")
+        with open(self.filepath, "rb") as fh_src, open(filepath, "wb") as fh_dst:
+            pickle.load(fh_src)
+            pickle.dump(("outdated",), fh_dst)
+            fh_dst.write(fh_src.read())
+        self.assertIsNone(rna_info.snapshot_read(filepath))
+        self.assertIsNone(rna_info.snapshot_read(os.path.join(self.tempdir.name, "missing.snapshot")))
+
+
+if __name__ == '__main__':
+    sys.argv = [__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    unittest.main()
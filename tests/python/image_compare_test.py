@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Apache License, Version 2.0
+
+"""
+Tests for the PNG reading & writing and image comparison used by the render tests.
+
+This test suite runs outside of Blender, it only requires NumPy.
+"""
+
+import struct
+import unittest
+import zlib
+
+import numpy as np
+
+from modules import image_compare
+from modules.test_utils import with_tempdir
+
+
+def pixels_random(height, width, channels, seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = rng.random((height, width, channels)).astype(np.float32)
+    # Gradients and flat areas, so predictions are used as well as differences.
+    pixels[:, :width // 2] = np.linspace(0.0, 1.0, width // 2)[None, :, None]
+    pixels[:height // 4] = 0.5
+    return pixels
+
+
+def quantize(pixels, bit_depth):
+    value_max = (1 << bit_depth) - 1
+    return np.rint(np.clip(pixels, 0.0, 1.0) * value_max)
+
+
+class PNGReadWriteTest(unittest.TestCase):
+
+    @with_tempdir
+    def test_filters(self, tempdir):
+        for bit_depth in (8, 16):
+            for channels in (1, 2, 3, 4):
+                pixels = pixels_random(31, 17, channels)
+                for filter_type in range(5):
+                    filepath = str(tempdir / ("image_%d_%d_%d.png" % (bit_depth, channels, filter_type)))
+                    image_compare.png_write(filepath, pixels, bit_depth=bit_depth, filter_type=filter_type)
+                    pixels_read = image_compare.png_read(filepath)
+                    self.assertEqual(pixels_read.shape, pixels.shape)
+                    np.testing.assert_array_equal(
+                        quantize(pixels_read, bit_depth),
+                        quantize(pixels, bit_depth),
+                        err_msg="bit_depth=%d, channels=%d, filter=%d" % (bit_depth, channels, filter_type),
+                    )
+
+    @with_tempdir
+    def test_filters_mixed(self, tempdir):
+        # A different filter on each row, as written by libpng.
+        height, width, channels = 23, 13, 4
+        pixels = pixels_random(height, width, channels, seed=1)
+        data = quantize(pixels, 8).astype(np.uint8).reshape(height, width * channels)
+
+        filters = np.arange(height, dtype=np.uint8) % 5
+        rows = np.empty((height, width * channels + 1), dtype=np.uint8)
+        for filter_type in range(5):
+            rows_filtered = image_compare._png_filter(filter_type, data, channels)
+            rows[filters == filter_type, 1:] = rows_filtered[filters == filter_type]
+        rows[:, 0] = filters
+
+        def chunk(chunk_type, chunk_data):
+            return (
+                struct.pack('>I', len(chunk_data)) +
+                chunk_type +
+                chunk_data +
+                struct.pack('>I', zlib.crc32(chunk_type + chunk_data) & 0xffffffff)
+            )
+
+        filepath = str(tempdir / "image_mixed.png")
+        with open(filepath, 'wb') as fh:
+            fh.write(image_compare.PNG_SIGNATURE)
+            fh.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+            fh.write(chunk(b'IDAT', zlib.compress(rows.tobytes())))
+            fh.write(chunk(b'IEND', b''))
+
+        pixels_read = image_compare.png_read(filepath)
+        np.testing.assert_array_equal(quantize(pixels_read, 8), quantize(pixels, 8))
+
+    @with_tempdir
+    def test_invalid(self, tempdir):
+        filepath = str(tempdir / "invalid.png")
+        with open(filepath, 'wb') as fh:
+            fh.write(b'not a png')
+        with self.assertRaises(ValueError):
+            image_compare.png_read(filepath)
+
+
+class CompareTest(unittest.TestCase):
+    # Differences which are exact in single precision floats.
+    threshold = 2.0 ** -6
+
+    def images(self, diffs):
+        # 10x10 RGB images, with the given differences on the first pixels.
+        ref = np.full((10, 10, 3), 0.5, dtype=np.float32)
+        new = ref.copy()
+        for i, diff in enumerate(diffs):
+            new[i // 10, i % 10, 1] += diff
+        return ref, new
+
+    def test_threshold(self):
+        ref, new = self.images([self.threshold] * 100)
+        self.assertTrue(image_compare.compare(ref, new, self.threshold, 0))
+
+        # The smallest larger difference from 0.5.
+        ref, new = self.images([self.threshold + np.spacing(np.float32(0.5))])
+        self.assertFalse(image_compare.compare(ref, new, self.threshold, 0))
+
+    def test_percent(self):
+        # One pixel of a hundred is one percent.
+        diff_fail = self.threshold * 2
+        ref, new = self.images([diff_fail])
+        self.assertTrue(image_compare.compare(ref, new, self.threshold, 1))
+        ref, new = self.images([diff_fail] * 2)
+        self.assertFalse(image_compare.compare(ref, new, self.threshold, 1))
+        self.assertTrue(image_compare.compare(ref, new, self.threshold, 2))
+        ref, new = self.images([-diff_fail] * 2)
+        self.assertFalse(image_compare.compare(ref, new, self.threshold, 1.99))
+
+    def test_size_mismatch(self):
+        ref = np.zeros((10, 10, 3), dtype=np.float32)
+        new = np.zeros((10, 11, 3), dtype=np.float32)
+        self.assertFalse(image_compare.compare(ref, new, self.threshold, 100))
+        self.assertIsNone(image_compare.diff_image(ref, new))
+
+    def test_diff_image(self):
+        ref, new = self.images([self.threshold])
+        diff = image_compare.diff_image(ref, new)
+        self.assertEqual(diff[0, 0, 1], self.threshold * 16.0)
+        self.assertEqual(np.count_nonzero(diff), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+# Apache License, Version 2.0
+#
+# Compare PNG images in-process with NumPy, matching the results of
+# OpenImageIO's idiff as used by the render tests, without starting a process
+# for every comparison.
+
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Number of channels for each PNG color type.
+PNG_COLOR_TYPE_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+
+def _png_paeth(a, b, c):
+    # Paeth predictor of arrays of the left, above and upper left bytes.
+    b_c = b - c
+    a_c = a - c
+    pa = np.abs(b_c)
+    pb = np.abs(a_c)
+    pc = np.abs(a_c + b_c)
+    return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+
+def _png_unfilter(filters, rows, bpp):
+    # Undo the filters of all rows, a (height, width * bpp) byte array.
+    #
+    # Each pixel depends on the pixels to its left, above and upper left,
+    # pixels on the same anti-diagonal don't depend on each other,
+    # so the image is processed one anti-diagonal at a time.
+    # Pixels are stored skewed, so each anti-diagonal is a row:
+    # pixel (y, x) is 'skewed[x + y + 2, y + 1]', where the first two rows
+    # and the first column are the zeros before the first row and column.
+    height, stride = rows.shape
+    width = stride // bpp
+    diagonals = width + height - 1
+
+    y_all = np.arange(height)[:, None]
+    x_all = np.arange(width)[None, :]
+    skewed_rows = np.zeros((diagonals, height, bpp), dtype=np.int16)
+    skewed_rows[x_all + y_all, y_all] = rows.reshape(height, width, bpp)
+
+    # Only compute the predictions of filters which are used,
+    # masks are None when all rows use the filter.
+    filter_masks = []
+    for filter_type in (1, 2, 3, 4):
+        mask = (filters == filter_type)
+        if mask.all():
+            filter_masks.append((filter_type, None))
+        elif mask.any():
+            filter_masks.append((filter_type, mask[:, None]))
+
+    skewed = np.zeros((diagonals + 2, height + 1, bpp), dtype=np.int16)
+    for k in range(diagonals):
+        a = skewed[k + 1, 1:]
+        b = skewed[k + 1, :-1]
+        c = skewed[k, :-1]
+        prediction = 0
+        for filter_type, mask in filter_masks:
+            if filter_type == 1:
+                value = a
+            elif filter_type == 2:
+                value = b
+            elif filter_type == 3:
+                value = (a + b) >> 1
+            else:
+                value = _png_paeth(a, b, c)
+            prediction = value if mask is None else np.where(mask, value, prediction)
+        skewed[k + 2, 1:] = (skewed_rows[k] + prediction) & 0xff
+
+    pixels = skewed[x_all + y_all + 2, y_all + 1]
+    return pixels.astype(np.uint8).reshape(height, stride)
+
+
+def _png_filter(filter_type, pixels, bpp):
+    # Apply a filter to all rows, a (height, width * bpp) byte array.
+    pixels = pixels.astype(np.int16)
+    a = np.zeros_like(pixels)
+    a[:, bpp:] = pixels[:, :-bpp]
+    b = np.zeros_like(pixels)
+    b[1:] = pixels[:-1]
+    c = np.zeros_like(pixels)
+    c[1:, bpp:] = pixels[:-1, :-bpp]
+    prediction = (0, a, b, (a + b) >> 1, _png_paeth(a, b, c))[filter_type]
+    return ((pixels - prediction) & 0xff).astype(np.uint8)
+
+
+def png_read(filepath):
+    # Read a non-interlaced 8 or 16 bit gray-scale or RGB(A) PNG,
+    # as a (height, width, channels) float array in the [0, 1] range.
+    # Raises ValueError for files that can't be read.
+    with open(filepath, 'rb') as fh:
+        data = fh.read()
+
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file: " + filepath)
+
+    header = None
+    idat = []
+    pos = 8
+    while pos < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += length + 12
+        if chunk_type == b'IHDR':
+            header = struct.unpack('>IIBBBBB', chunk)
+        elif chunk_type == b'IDAT':
+            idat.append(chunk)
+        elif chunk_type == b'IEND':
+            break
+
+    if header is None:
+        raise ValueError("Missing PNG header: " + filepath)
+    width, height, bit_depth, color_type, _compression, _filter, interlace = header
+    channels = PNG_COLOR_TYPE_CHANNELS.get(color_type)
+    if channels is None or bit_depth not in {8, 16} or interlace:
+        raise ValueError("Unsupported PNG format: " + filepath)
+
+    bpp = channels * bit_depth // 8
+    stride = width * bpp
+    try:
+        rows = np.frombuffer(zlib.decompress(b''.join(idat)), dtype=np.uint8)
+        rows = rows[:height * (stride + 1)].reshape(height, stride + 1)
+    except (zlib.error, ValueError) as ex:
+        raise ValueError("Invalid PNG data: " + filepath) from ex
+
+    filters = rows[:, 0]
+    if filters.max(initial=0) > 4:
+        raise ValueError("Invalid PNG filter: " + filepath)
+
+    if filters.max(initial=0) <= 2:
+        # No filter depends on the row being undone, undo them row by row.
+        pixels = np.empty((height, stride), dtype=np.uint8)
+        prev = np.zeros(stride, dtype=np.uint8)
+        for y in range(height):
+            filter_type = filters[y]
+            row = rows[y, 1:]
+            if filter_type == 0:
+                pixels[y] = row
+            elif filter_type == 1:
+                pixels[y] = np.cumsum(row.reshape(width, bpp), axis=0, dtype=np.uint8).reshape(stride)
+            else:
+                pixels[y] = row + prev
+            prev = pixels[y]
+    else:
+        pixels = _png_unfilter(filters, rows[:, 1:], bpp)
+
+    if bit_depth == 16:
+        values = pixels.view('>u2').astype(np.float32) / 65535.0
+    else:
+        values = pixels.astype(np.float32) / 255.0
+    return values.reshape(height, width, channels)
+
+
+def png_write(filepath, pixels, bit_depth=8, filter_type=0):
+    # Write a (height, width, channels) float array as an 8 or 16 bit PNG, clamping values to [0, 1],
+    # all rows use the same filter.
+    height, width, channels = pixels.shape
+    color_type = {value: key for key, value in PNG_COLOR_TYPE_CHANNELS.items()}[channels]
+    value_max = (1 << bit_depth) - 1
+    data = np.clip(np.rint(pixels * value_max), 0, value_max)
+    data = data.astype('>u2' if bit_depth == 16 else np.uint8).reshape(height, width * channels)
+    data = _png_filter(filter_type, data.view(np.uint8), channels * bit_depth // 8)
+    raw = np.concatenate((np.full((height, 1), filter_type, dtype=np.uint8), data), axis=1).tobytes()
+
+    def chunk(chunk_type, chunk_data):
+        return (
+            struct.pack('>I', len(chunk_data)) +
+            chunk_type +
+            chunk_data +
+            struct.pack('>I', zlib.crc32(chunk_type + chunk_data) & 0xffffffff)
+        )
+
+    with open(filepath, 'wb') as fh:
+        fh.write(PNG_SIGNATURE)
+        fh.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)))
+        fh.write(chunk(b'IDAT', zlib.compress(raw, 6)))
+        fh.write(chunk(b'IEND', b''))
+
+
+def compare(ref, new, fail_threshold, fail_percent):
+    # Same as 'idiff -fail fail_threshold -failpercent fail_percent':
+    # a pixel fails when any channel differs by more than the threshold,
+    # the comparison fails when more than the given percentage of pixels do.
+    if ref.shape != new.shape:
+        return False
+    diff = np.abs(ref - new).max(axis=2)
+    failed_pixels = np.count_nonzero(diff > fail_threshold)
+    return failed_pixels * 100.0 <= fail_percent * diff.size
+
+
+def diff_image(ref, new, scale=16.0):
+    # Same as 'idiff -abs -scale 16', None when images can't be compared.
+    if ref.shape != new.shape:
+        return None
+    return np.abs(ref - new) * scale
@@ -13,6 +13,12 @@ import time
 
 from . import global_report
 
+# Compare images in-process when NumPy is available.
+try:
+    from . import image_compare
+except ImportError:
+    image_compare = None
+
 
 class COLORS_ANSI:
     RED = '\033[00;31m'
@@ -107,6 +113,7 @@ class Report:
         'global_dir',
         'reference_dir',
         'idiff',
+        'compare_backend',
         'pixelated',
         'fail_threshold',
         'fail_percent',
@@ -126,6 +133,8 @@ class Report:
         self.global_dir = os.path.dirname(output_dir)
         self.reference_dir = 'reference_renders'
         self.idiff = idiff
+        # Defaults to NUMPY when available, BLENDER_TEST_COMPARE=IDIFF selects idiff.
+        self.set_compare_backend((os.getenv('BLENDER_TEST_COMPARE') or 'NUMPY').upper())
         self.compare_engine = None
         self.fail_threshold = 0.016
         self.fail_percent = 1
@@ -159,13 +168,25 @@ class Report:
     def set_reference_dir(self, reference_dir):
         self.reference_dir = reference_dir
 
+    def set_compare_backend(self, backend):
+        # Tool used for comparing images, in ['NUMPY', 'IDIFF'].
+        if backend not in {'NUMPY', 'IDIFF'}:
+            raise ValueError("Unknown compare backend %r, expected NUMPY or IDIFF" % backend)
+        if backend == 'NUMPY' and image_compare is None:
+            backend = 'IDIFF'
+        self.compare_backend = backend
+
     def set_compare_engine(self, other_engine, other_device=None):
         self.compare_engine = (other_engine, other_device)
 
-    def run(self, dirpath, blender, arguments_cb, batch=False):
+    def run(self, dirpath, blender, arguments_cb, batch=False, jobs=None):
         # Run tests and output report.
+        # With multiple jobs, tests are split over that many Blender processes
+        # running at the same time. Defaults to BLENDER_TEST_JOBS or 1.
+        if jobs is None:
+            jobs = int(os.getenv('BLENDER_TEST_JOBS', 1))
         dirname = os.path.basename(dirpath)
-        ok = self._run_all_tests(dirname, dirpath, blender, arguments_cb, batch)
+        ok = self._run_all_tests(dirname, dirpath, blender, arguments_cb, batch, jobs)
         self._write_data(dirname)
         self._write_html()
         if self.compare_engine:
@@ -333,13 +354,15 @@ class Report:
         relpath = os.path.relpath(filepath, self.output_dir)
         return pathlib.Path(relpath).as_posix()
 
-    def _write_test_html(self, testname, filepath, error):
+    def _write_test_html(self, testname, filepath, error, elapsed=None):
         name = test_get_name(filepath)
         name = name.replace('_', ' ')
 
         old_img, ref_img, new_img, diff_img = test_get_images(self.output_dir, filepath, self.reference_dir)
 
         status = error if error else ""
+        if elapsed is not None:
+            status = "<br/>".join(text for text in (status, "%.2f s" % elapsed) if text)
         tr_style = """ class="table-danger" """ if error else ""
 
         new_url = self._relative_url(new_img)
@@ -396,6 +419,14 @@ class Report:
         if os.path.exists(tmp_filepath):
             shutil.copy(tmp_filepath, new_img)
 
+        if self.compare_backend == 'NUMPY':
+            try:
+                return self._diff_output_numpy(old_img, ref_img, new_img, diff_img, tmp_filepath)
+            except (OSError, ValueError) as e:
+                # Fall back to idiff for images that can't be read.
+                if self.verbose:
+                    print_message(str(e))
+
         if os.path.exists(ref_img):
             # Diff images test with threshold.
             command = (
@@ -441,13 +472,70 @@ class Report:
 
         return not failed
 
-    def _run_tests(self, filepaths, blender, arguments_cb, batch):
+    def _diff_output_numpy(self, old_img, ref_img, new_img, diff_img, tmp_filepath):
+        # Same as the idiff comparison, decoding each image only once.
+        new_pixels = image_compare.png_read(tmp_filepath)
+
+        if os.path.exists(ref_img):
+            ref_pixels = image_compare.png_read(ref_img)
+            failed = not image_compare.compare(ref_pixels, new_pixels, self.fail_threshold, self.fail_percent)
+        else:
+            if not self.update:
+                return False
+
+            ref_pixels = None
+            failed = True
+
+        if failed and self.update:
+            # Update reference image if requested.
+            shutil.copy(new_img, ref_img)
+            shutil.copy(new_img, old_img)
+            ref_pixels = new_pixels
+            failed = False
+
+        # Generate diff image.
+        diff_pixels = image_compare.diff_image(ref_pixels, new_pixels)
+        if diff_pixels is not None:
+            image_compare.png_write(diff_img, diff_pixels)
+        elif self.verbose:
+            print_message("Image sizes differ, no diff image written")
+
+        return not failed
+
+    def _verify_output(self, filepath, output_filepath):
+        # Compare a render result with its reference, returns the error or None.
+        testname = test_get_name(filepath)
+
+        if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
+            error = "NO OUTPUT"
+            print_message("No render result file found")
+            print_message(testname, 'FAILURE', 'FAILED')
+        elif not self._diff_output(filepath, output_filepath):
+            error = "VERIFY"
+            print_message("Render result is different from reference image")
+            print_message(testname, 'FAILURE', 'FAILED')
+        else:
+            error = None
+            print_message(testname, 'SUCCESS', 'OK')
+
+        if os.path.exists(output_filepath):
+            os.remove(output_filepath)
+
+        return error
+
+    def _run_tests(self, filepaths, blender, arguments_cb, batch, diff_executor=None):
         # Run multiple tests in a single Blender process since startup can be
-        # a significant factor. In case of crashes, re-run the remaining tests.
+        # a significant factor. In case of crashes, re-run the remaining tests,
+        # running the test that crashed on its own first to rule out earlier tests causing it.
+        #
+        # Returns the error and render time in seconds for every test.
+        # When an executor is passed in, images are compared in it while rendering continues.
         verbose = os.environ.get("BLENDER_VERBOSE") is not None
 
         remaining_filepaths = filepaths[:]
         errors = []
+        times = []
+        isolate = False
 
         while len(remaining_filepaths) > 0:
             command = [blender]
@@ -468,7 +556,7 @@ class Report:
                 command.extend(arguments_cb(filepath, base_output_filepath))
 
                 # Only chain multiple commands for batch
-                if not batch:
+                if not batch or isolate:
                     break
 
             if self.device:
@@ -477,6 +565,7 @@ class Report:
             # Run process
             crash = False
             output = None
+            time_start = time.time()
             try:
                 completed_process = subprocess.run(command, stdout=subprocess.PIPE)
                 if completed_process.returncode != 0:
@@ -484,6 +573,7 @@ class Report:
                 output = completed_process.stdout
             except BaseException as e:
                 crash = True
+            time_end = time.time()
 
             if verbose:
                 print(" ".join(command))
@@ -491,37 +581,47 @@ class Report:
                 print(output.decode("utf-8"))
 
             # Detect missing filepaths and consider those errors
+            time_prev = time_start
             for filepath, output_filepath in zip(remaining_filepaths[:], output_filepaths):
-                remaining_filepaths.pop(0)
+                testname = test_get_name(filepath)
 
-                if crash:
-                    # In case of crash, stop after missing files and re-render remaining
-                    if not os.path.exists(output_filepath):
-                        errors.append("CRASH")
-                        print_message("Crash running Blender")
-                        print_message(testname, 'FAILURE', 'FAILED')
+                if crash and not os.path.exists(output_filepath):
+                    if len(output_filepaths) > 1:
+                        # Retry the test on its own, starting a new process.
+                        isolate = True
                         break
 
-                testname = test_get_name(filepath)
-
-                if not os.path.exists(output_filepath) or os.path.getsize(output_filepath) == 0:
-                    errors.append("NO OUTPUT")
-                    print_message("No render result file found")
-                    print_message(testname, 'FAILURE', 'FAILED')
-                elif not self._diff_output(filepath, output_filepath):
-                    errors.append("VERIFY")
-                    print_message("Render result is different from reference image")
+                    # In case of crash, stop after missing files and re-render remaining
+                    remaining_filepaths.pop(0)
+                    errors.append("CRASH")
+                    times.append(time_end - time_prev)
+                    print_message("Crash running Blender")
                     print_message(testname, 'FAILURE', 'FAILED')
+                    isolate = False
+                    break
+
+                remaining_filepaths.pop(0)
+                isolate = False
+
+                # Each result is written when its render finishes,
+                # use that to time the tests of a batch individually.
+                if os.path.exists(output_filepath) and len(output_filepaths) > 1:
+                    time_output = min(max(os.path.getmtime(output_filepath), time_prev), time_end)
                 else:
-                    errors.append(None)
-                    print_message(testname, 'SUCCESS', 'OK')
+                    time_output = time_end
+                times.append(time_output - time_prev)
+                time_prev = time_output
 
-                if os.path.exists(output_filepath):
-                    os.remove(output_filepath)
+                if diff_executor is not None:
+                    errors.append(diff_executor.submit(self._verify_output, filepath, output_filepath))
+                else:
+                    errors.append(self._verify_output(filepath, output_filepath))
 
-        return errors
+        if diff_executor is not None:
+            errors = [error if isinstance(error, str) else error.result() for error in errors]
+        return errors, times
 
-    def _run_all_tests(self, dirname, dirpath, blender, arguments_cb, batch):
+    def _run_all_tests(self, dirname, dirpath, blender, arguments_cb, batch, jobs=1):
         passed_tests = []
         failed_tests = []
         all_files = list(blend_list(dirpath, self.device, self.blacklist))
@@ -530,8 +630,25 @@ class Report:
                       format(len(all_files)),
                       'SUCCESS', "==========")
         time_start = time.time()
-        errors = self._run_tests(all_files, blender, arguments_cb, batch)
-        for filepath, error in zip(all_files, errors):
+        jobs = max(1, min(jobs, len(all_files)))
+        if jobs > 1:
+            # Split tests over multiple Blender processes, comparing images
+            # in a thread pool while the remaining tests render.
+            from concurrent.futures import ThreadPoolExecutor
+            shards = [all_files[i::jobs] for i in range(jobs)]
+            with ThreadPoolExecutor(max_workers=jobs) as diff_executor:
+                with ThreadPoolExecutor(max_workers=jobs) as render_executor:
+                    shard_results = list(render_executor.map(
+                        lambda shard: self._run_tests(shard, blender, arguments_cb, batch, diff_executor),
+                        shards))
+            results = {}
+            for shard, (shard_errors, shard_times) in zip(shards, shard_results):
+                results.update(zip(shard, zip(shard_errors, shard_times)))
+            errors = [results[filepath][0] for filepath in all_files]
+            times = [results[filepath][1] for filepath in all_files]
+        else:
+            errors, times = self._run_tests(all_files, blender, arguments_cb, batch)
+        for filepath, error, elapsed in zip(all_files, errors, times):
             testname = test_get_name(filepath)
             if error:
                 if error == "NO_ENGINE":
@@ -541,7 +658,7 @@ class Report:
                 failed_tests.append(testname)
             else:
                 passed_tests.append(testname)
-            self._write_test_html(dirname, filepath, error)
+            self._write_test_html(dirname, filepath, error, elapsed)
         time_end = time.time()
         elapsed_ms = int((time_end - time_start) * 1000)
         print_message("")